@@ -0,0 +1,161 @@
+import codecs
+import json
+from typing import Iterable, Iterator, List, Optional
+
+_WHITESPACE = " \t\n\r"
+
+# the pending text is trimmed once this much of it has been consumed
+_COMPACT_AT = 1 << 16
+
+
+class EntryStreamError(ValueError):
+    """Raised when a streamed payload is not valid JSON or has no entries array."""
+
+
+class EntryStreamParser:
+    """Push parser for provider payloads: a JSON array, or an object with an ``entries`` array.
+
+    Bytes go in through :meth:`feed` in chunks of any size. Each array element is
+    decoded as soon as it is complete, so memory stays around one chunk plus one
+    entry however large the payload is. Elements that are not objects are
+    skipped. Object keys before ``entries`` are skipped the same way, so each of
+    them must also fit within ``max_entry_bytes``.
+    """
+
+    def __init__(self, max_entry_bytes: int = 1 << 20) -> None:
+        self.max_entry_bytes = max_entry_bytes
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._state = "start"
+
+    def feed(self, chunk: bytes) -> List[dict]:
+        """Entries completed by ``chunk``."""
+
+        try:
+            self._buffer += self._text.decode(chunk)
+        except UnicodeDecodeError as exc:
+            raise EntryStreamError("Invalid JSON from provider") from exc
+        return self._drain(final=False)
+
+    def close(self) -> List[dict]:
+        """Entries left at the end of the stream; raises if the payload was cut short."""
+
+        try:
+            self._buffer += self._text.decode(b"", final=True)
+        except UnicodeDecodeError as exc:
+            raise EntryStreamError("Invalid JSON from provider") from exc
+        entries = self._drain(final=True)
+        if self._state == "object":
+            raise EntryStreamError("Provider response is not a list of entries")
+        if self._state != "done":
+            raise EntryStreamError("Invalid JSON from provider")
+        return entries
+
+    def _skip_whitespace(self) -> Optional[str]:
+        buffer, pos = self._buffer, self._pos
+        while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+            pos += 1
+        self._pos = pos
+        return buffer[pos] if pos < len(buffer) else None
+
+    def _decode_at(self, pos: int, final: bool) -> Optional[tuple]:
+        """``(value, end)`` for the JSON value at ``pos``, or None until more text arrives."""
+
+        try:
+            value, end = self._json.raw_decode(self._buffer, pos)
+        except json.JSONDecodeError as exc:
+            if final:
+                raise EntryStreamError("Invalid JSON from provider") from exc
+            if len(self._buffer) - pos > self.max_entry_bytes:
+                raise EntryStreamError(f"Provider entry is not valid JSON within {self.max_entry_bytes} bytes") from exc
+            return None
+        # a number at the very end of the text may still have digits to come
+        if end == len(self._buffer) and not final:
+            return None
+        return value, end
+
+    def _drain(self, final: bool) -> List[dict]:
+        entries: List[dict] = []
+        while self._state != "done":
+            char = self._skip_whitespace()
+            if char is None:
+                break
+            if self._state == "start":
+                if char == "[":
+                    self._state = "array"
+                elif char == "{":
+                    self._state = "object"
+                else:
+                    raise EntryStreamError("Provider response is not a list of entries")
+                self._pos += 1
+            elif self._state == "array":
+                if char == "]":
+                    self._state = "done"
+                    self._pos += 1
+                elif char == ",":
+                    self._pos += 1
+                else:
+                    decoded = self._decode_at(self._pos, final)
+                    if decoded is None:
+                        break
+                    value, self._pos = decoded
+                    if isinstance(value, dict):
+                        entries.append(value)
+            elif not self._object_member(char, final):
+                break
+
+        if self._pos >= _COMPACT_AT:
+            self._buffer = self._buffer[self._pos :]
+            self._pos = 0
+        return entries
+
+    def _object_member(self, char: str, final: bool) -> bool:
+        """Step over one ``"key": value`` pair, entering the array if the key is ``entries``."""
+
+        if char == ",":
+            self._pos += 1
+            return True
+        if char == "}":
+            raise EntryStreamError("Provider response is not a list of entries")
+        if char != '"':
+            raise EntryStreamError("Invalid JSON from provider")
+        start = self._pos
+        key = self._decode_at(start, final)
+        if key is None:
+            return False
+        name, self._pos = key
+        if self._skip_whitespace() != ":":
+            if self._pos < len(self._buffer) or final:
+                raise EntryStreamError("Invalid JSON from provider")
+            self._pos = start
+            return False
+        self._pos += 1
+        char = self._skip_whitespace()
+        if char is None:
+            if final:
+                raise EntryStreamError("Invalid JSON from provider")
+            self._pos = start
+            return False
+        if name == "entries":
+            if char != "[":
+                raise EntryStreamError("Provider response is not a list of entries")
+            self._state = "array"
+            self._pos += 1
+            return True
+        skipped = self._decode_at(self._pos, final)
+        if skipped is None:
+            self._pos = start
+            return False
+        self._pos = skipped[1]
+        return True
+
+
+def iter_entries(chunks: Iterable[bytes], max_entry_bytes: int = 1 << 20) -> Iterator[dict]:
+    """Yield the entries of a provider payload read as ``chunks``."""
+
+    parser = EntryStreamParser(max_entry_bytes)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
@@ -1,15 +1,39 @@
 from __future__ import annotations
 
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
 from enum import Enum
 from hashlib import sha1
-from typing import Dict, List, Optional, Sequence, Tuple
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
-
-from .storage import load_storage, save_storage
-from .provider_clients import ProviderFetchError, fetch_provider_payload
+from pydantic import BaseModel, Field, ValidationError, field_validator
+
+from .cache import LRUCache
+from .meal_index import MealIndex
+from .meal_library import load_meal_library
+from .meal_solver import day_cost, fit_score, solve_day
+from .storage import (
+    WELLNESS_CAP,
+    LazyStorage,
+    StorageBackend,
+    get_storage_backend,
+    wellness_archive,
+    wellness_seq,
+)
+from .wellness_store import WellnessPartitions, WellnessStore, parse_timestamp, rollup_window_start
+from .provider_cache import ProviderCache
+from .provider_clients import ProviderClient, ProviderFetchError
 
 
 class ExerciseBase(BaseModel):
@@ -66,6 +90,11 @@ class DietPreference(str, Enum):
     gluten_free = "gluten_free"
 
 
+class MealPlanSolver(str, Enum):
+    nearest = "nearest"
+    macro = "macro"
+
+
 class MealIdea(BaseModel):
     name: str
     mealType: str
@@ -102,6 +131,7 @@ class MealPlanSummary(BaseModel):
     actualMacros: MacroTargets
     highlights: List[str]
     tips: List[str]
+    fitScore: Optional[float] = None
 
 
 class MealPlanRequest(BaseModel):
@@ -116,6 +146,8 @@ class MealPlanRequest(BaseModel):
     weightGoalShort: Optional[str] = None
     weightGoalLong: Optional[str] = None
     activityLevel: Optional[str] = None
+    solver: MealPlanSolver = MealPlanSolver.nearest
+    solverBudgetMs: int = Field(default=50, ge=1, le=2000)
 
 
 class MealPlanResponse(BaseModel):
@@ -171,12 +203,36 @@ class ScheduleResponse(BaseModel):
 class WellnessMetric(BaseModel):
     timestamp: str
     source: Optional[str] = None
+    profileHash: Optional[str] = None
+    # assigned when the metric is stored; the cursor for incremental reads
+    seq: Optional[int] = None
     steps: Optional[int] = Field(default=None, ge=0)
     sleepHours: Optional[float] = Field(default=None, ge=0)
     readiness: Optional[int] = Field(default=None, ge=0, le=100)
     energyLevel: Optional[str] = None
     comment: Optional[str] = None
 
+    @field_validator("timestamp")
+    @classmethod
+    def _check_timestamp(cls, value: str) -> str:
+        try:
+            parse_timestamp(value)
+        except ValueError as exc:
+            raise ValueError("timestamp must be ISO 8601") from exc
+        return value
+
+
+class WellnessSummary(BaseModel):
+    profileHash: Optional[str] = None
+    # exponentially weighted, oldest to newest reading
+    readiness: Optional[float] = None
+    readinessSamples: int = 0
+    # averages and totals over the 7 days ending with the newest reading
+    sleepHours: Optional[float] = None
+    sleepSamples: int = 0
+    steps: int = 0
+    windowEnd: Optional[str] = None
+
 
 class CoachAction(BaseModel):
     headline: str
@@ -189,6 +245,17 @@ class CoachRecommendationRequest(BaseModel):
     focusAreas: List[str] = Field(default_factory=list)
 
 
+class ScheduleBatchItem(BaseModel):
+    profileHash: Optional[str] = None
+    status: str
+    detail: Optional[str] = None
+
+
+class ScheduleBatchResponse(BaseModel):
+    items: List[ScheduleBatchItem]
+    persisted: int
+
+
 class CoachRecommendation(BaseModel):
     profileHash: str
     schedule: ScheduleResponse
@@ -404,6 +471,9 @@ GOAL_TIPS = {
     ],
 }
 
+# candidates per meal slot handed to the macro solver
+SOLVER_CANDIDATES = 24
+
 MEAL_COACH_TIPS = [
     "Double prep breakfast tonight so the morning starts on autopilot.",
     "Log meals in your tracker before lunch to reinforce targets.",
@@ -450,8 +520,43 @@ PROVIDER_SAMPLES: Dict[str, List[Dict[str, Optional[str]]]] = {
     ],
 }
 
+_provider_client = ProviderClient()
+
+
+def _parse_provider_entries(provider: str, entries: List[dict]) -> List[WellnessMetric]:
+    # rows are validated one by one and bad ones skipped, as /import and sync-all do
+    metrics: List[WellnessMetric] = []
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        try:
+            metrics.append(WellnessMetric.model_validate({**entry, "source": provider}))
+        except ValidationError:
+            continue
+    return metrics
+
+
+# validated provider payloads, served stale and refreshed in the background after the TTL
+_provider_cache: ProviderCache[List[WellnessMetric]] = ProviderCache(
+    _provider_client,
+    _parse_provider_entries,
+    ttl=float(os.getenv("DAWAR_POWER_PROVIDER_CACHE_TTL", "300")),
+)
 
-app = FastAPI(title="FitApp API", openapi_url="/fit/openapi.json")
+
+@asynccontextmanager
+async def _lifespan(_: FastAPI):
+    yield
+    try:
+        await _provider_cache.drain()
+        await _provider_client.aclose()
+        shutdown_coach_pool()
+    finally:
+        # drains any write-behind buffer before the process exits, even if the rest of shutdown failed
+        _storage.close()
+
+
+app = FastAPI(title="FitApp API", openapi_url="/fit/openapi.json", lifespan=_lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -459,6 +564,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 
@@ -466,28 +572,97 @@ _exercises: Dict[int, Exercise] = {}
 _users: Dict[int, User] = {}
 _exercise_id_seq = 0
 _user_id_seq = 0
-_wellness_log: List[WellnessMetric] = []
-_schedules: Dict[str, ScheduleResponse] = {}
+# opened on first use, so worker processes importing this module never load the store
+_storage: StorageBackend = LazyStorage(get_storage_backend)
+# schedules stay raw in the storage backend until a fetch hydrates them
+_schedules: LRUCache[str, ScheduleResponse] = LRUCache(
+    int(os.getenv("DAWAR_POWER_SCHEDULE_CACHE_SIZE", "1024")),
+    ttl=float(os.getenv("DAWAR_POWER_SCHEDULE_CACHE_TTL", "3600")) or None,
+)
+_meal_plan_cache: LRUCache[Tuple[object, ...], bytes] = LRUCache(
+    int(os.getenv("DAWAR_POWER_MEAL_PLAN_CACHE_SIZE", "256"))
+)
+# built plans keyed by a digest of the full request plus the wellness buckets that shaped them
+_plan_cache: LRUCache[Tuple[str, str, bool], ScheduleResponse] = LRUCache(
+    int(os.getenv("DAWAR_POWER_PLAN_CACHE_SIZE", "1024"))
+)
 
 
-def _load_persistent_state() -> None:
-    schedules_raw, wellness_raw = load_storage()
-    for key, payload in schedules_raw.items():
+def _parse_wellness(entries: Sequence[Dict[str, object]]) -> List[WellnessMetric]:
+    metrics: List[WellnessMetric] = []
+    for entry in entries:
         try:
-            _schedules[key] = ScheduleResponse(**payload)
+            metrics.append(WellnessMetric(**entry))
         except Exception:
             continue
-    for entry in wellness_raw:
+    return metrics
+
+
+WELLNESS_MAX_ENTRIES = int(os.getenv("DAWAR_POWER_WELLNESS_MAX_ENTRIES", str(WELLNESS_CAP)))
+
+
+def _load_wellness_partition(profile_key: str) -> List[WellnessMetric]:
+    """The newest stored metrics by timestamp, widened to the whole rollup window when that holds more.
+
+    The partition keeps only the newest ones, but its rollup folds in everything it is given.
+    """
+
+    entries = _storage.wellness_between(profile_key, None, None, WELLNESS_MAX_ENTRIES)
+    if entries and len(entries) >= WELLNESS_MAX_ENTRIES:
+        newest = parse_timestamp(str(entries[-1]["timestamp"]))
+        start = rollup_window_start(newest)
+        if parse_timestamp(str(entries[0]["timestamp"])) >= start:
+            entries = _storage.wellness_between(profile_key, start, None, None)
+    return _parse_wellness(entries)
+
+
+# recent metrics per profile ("" holds those tied to no profile), each ordered by its own timestamps;
+# partitions load lazily from the storage backend, which keeps the full history
+_wellness_partitions: WellnessPartitions[WellnessMetric] = WellnessPartitions(
+    WELLNESS_MAX_ENTRIES,
+    max_age=float(os.getenv("DAWAR_POWER_WELLNESS_MAX_AGE_DAYS", "0")) * 86400 or None,
+    max_partitions=int(os.getenv("DAWAR_POWER_WELLNESS_MAX_PARTITIONS", "10000")),
+    load=_load_wellness_partition,
+    known=lambda profile_key: _storage.wellness_keys(profile_key),
+    readiness_alpha=float(os.getenv("DAWAR_POWER_READINESS_EWMA_ALPHA", "0.3")),
+)
+
+
+def _stored_schedule(profile_key: str) -> ScheduleResponse:
+    cached = _schedules.get(profile_key)
+    if cached is not None:
+        return cached
+    payload = _storage.get_schedule(profile_key)
+    if payload is not None:
         try:
-            _wellness_log.append(WellnessMetric(**entry))
+            schedule = ScheduleResponse(**payload)
         except Exception:
-            continue
+            schedule = None
+        if schedule is not None:
+            _schedules.put(profile_key, schedule)
+            return schedule
+    raise HTTPException(status_code=404, detail="Schedule not found for profile")
+
 
+def _persist_schedule(profile_key: str, schedule: ScheduleResponse) -> None:
+    _schedules.put(profile_key, schedule)
+    _storage.put_schedule(profile_key, schedule.model_dump())
 
-def _persist_state() -> None:
-    schedule_payload = {key: schedule.model_dump() for key, schedule in _schedules.items()}
-    wellness_payload = [metric.model_dump() for metric in _wellness_log]
-    save_storage(schedule_payload, wellness_payload)
+
+_wellness_seq_lock = threading.Lock()
+_last_wellness_seq: Optional[int] = None
+
+
+def _persist_wellness(metrics: Sequence[WellnessMetric]) -> None:
+    global _last_wellness_seq
+    # numbering and appending under one lock keeps storage order equal to sequence order
+    with _wellness_seq_lock:
+        if _last_wellness_seq is None:
+            _last_wellness_seq = _storage.last_wellness_seq()
+        for metric in metrics:
+            _last_wellness_seq += 1
+            metric.seq = _last_wellness_seq
+        _storage.append_wellness(metric.model_dump() for metric in metrics)
 
 WINDOW_LABELS = {
     "early_morning": "early morning",
@@ -500,6 +675,15 @@ WINDOW_LABELS = {
 
 DEFAULT_WINDOWS = ["early_morning", "midday", "evening"]
 
+# the coach pool spawns fresh interpreters on every platform rather than forking a process
+# that already runs flush, compaction and request threads
+_pool_context = multiprocessing.get_context("spawn")
+
+# worker processes for coach recommendations; 0 plans on the request threadpool
+COACH_WORKERS = int(os.getenv("DAWAR_POWER_COACH_WORKERS", "0"))
+_coach_pool: Optional[ProcessPoolExecutor] = None
+_coach_pool_lock = threading.Lock()
+
 GOAL_FOCUS_MAP = {
     NutritionGoal.fat_loss: ["Metabolic circuit", "Strength maintenance", "Cardio interval"],
     NutritionGoal.maintain: ["Strength balance", "Mobility + core", "Conditioning mix"],
@@ -522,11 +706,11 @@ EQUIPMENT_PRIORITIES = {
 }
 
 READINESS_INSIGHTS = {
-    "low": "Latest readiness flagged under 60 — keep the first session lighter and extend cooldowns.",
-    "high": "Readiness is elevated — consider adding one bonus finisher if energy stays high.",
+    "low": "Readiness is trending under 60 — keep the first session lighter and extend cooldowns.",
+    "high": "Readiness is trending high — consider adding one bonus finisher if energy stays high.",
 }
 
-SLEEP_INSIGHT = "Sleep dipped below 6 hours. Keep today mobility-heavy and schedule an earlier cutoff tonight."
+SLEEP_INSIGHT = "Sleep has averaged under 6 hours this week. Keep today mobility-heavy and schedule an earlier cutoff tonight."
 
 STRESS_INSIGHTS = {
     "high": "Stress level high — layer in breath work and swap one session for restorative flow.",
@@ -595,16 +779,26 @@ def _seed_data() -> None:
 
 _seed_data()
 
-_load_persistent_state()
 
+if os.getenv("DAWAR_POWER_MEAL_LIBRARY"):
+    MEAL_LIBRARY[:] = load_meal_library(Path(os.environ["DAWAR_POWER_MEAL_LIBRARY"]))
 
-def _filter_meals_for_diet(meal_type: str, diet: DietPreference) -> List[Dict[str, object]]:
-    candidates = [meal for meal in MEAL_LIBRARY if meal["mealType"] == meal_type]
-    if diet == DietPreference.standard:
-        return candidates
+_meal_index = MealIndex(MEAL_LIBRARY, [diet.value for diet in DietPreference])
 
-    filtered = [meal for meal in candidates if diet.value in meal.get("diets", [])]
-    return filtered or candidates
+
+def rebuild_meal_index() -> None:
+    """Re-index ``MEAL_LIBRARY`` after it changes and drop plans built from the old one."""
+
+    global _meal_index
+    _meal_index = MealIndex(MEAL_LIBRARY, [diet.value for diet in DietPreference])
+    _meal_plan_cache.clear()
+    # coach workers were handed the old library; the next request starts ones seeded with this one
+    shutdown_coach_pool()
+
+
+def replace_meal_library(meals: List[Dict[str, object]]) -> None:
+    MEAL_LIBRARY[:] = meals
+    rebuild_meal_index()
 
 
 def _normalise_target_calories(request: MealPlanRequest) -> int:
@@ -660,9 +854,29 @@ def _build_meal_plan(request: MealPlanRequest) -> MealPlanResponse:
     preference_text = (request.preferences or "").lower()
     hydration_target = HYDRATION_GUIDE.get(request.goal, 9)
 
+    groups = {meal_type: _meal_index.group(meal_type, request.diet.value) for meal_type in MEAL_SPLITS.keys()}
+    excluded = _meal_index.exclusion_mask(restrictions)
+    # pool size and exclusions per meal type; restricted pools fall back to the whole group when empty
+    pools: Dict[str, Tuple[int, int]] = {}
+    for meal_type, group in groups.items():
+        if group is None:
+            continue
+        allowed_count = group.allowed_count(excluded) if excluded else 0
+        pools[meal_type] = (allowed_count, excluded) if allowed_count else (len(group), 0)
+
+    macro_targets = _compute_macro_targets(target_calories, request.goal)
+    day_targets = {"calories": target_calories, **macro_targets.model_dump()}
+    solver_slots = [
+        group.candidates(per_meal_targets[meal_type], SOLVER_CANDIDATES, pools[meal_type][1])
+        for meal_type, group in groups.items()
+        if group is not None and request.solver == MealPlanSolver.macro
+    ]
+    solver_started = time.perf_counter()
+
     rotation_indices = {meal_type: 0 for meal_type in MEAL_SPLITS.keys()}
     aggregate_macros = {"protein": 0, "carbs": 0, "fat": 0}
     rotation_tracker: List[str] = []
+    day_costs: List[float] = []
 
     for index in range(request.days):
         focus = DAY_FOCUS[index % len(DAY_FOCUS)]
@@ -671,39 +885,27 @@ def _build_meal_plan(request: MealPlanRequest) -> MealPlanResponse:
         raw_meals: List[Dict[str, object]] = []
         total_calories = 0
 
-        for meal_type in MEAL_SPLITS.keys():
-            candidates = _filter_meals_for_diet(meal_type, request.diet)
-            if not candidates:
-                continue
-
-            sorted_candidates = sorted(
-                candidates,
-                key=lambda meal: abs(meal["calories"] - per_meal_targets[meal_type]),
-            )
-            filtered_candidates = [
-                meal
-                for meal in sorted_candidates
-                if not restrictions
-                or not any(
-                    keyword
-                    in (
-                        " ".join(
-                            [
-                                meal["name"],
-                                meal.get("description", ""),
-                                " ".join(meal.get("tags", [])),
-                            ]
-                        ).lower()
+        if request.solver == MealPlanSolver.macro:
+            # unused budget from earlier days rolls over to later ones
+            deadline = solver_started + request.solverBudgetMs / 1000 * (index + 1) / request.days
+            chosen_meals = solve_day(solver_slots, day_targets, deadline, usage=Counter(rotation_tracker))
+        else:
+            chosen_meals = []
+            for meal_type in MEAL_SPLITS.keys():
+                group = groups[meal_type]
+                if group is None:
+                    continue
+
+                pool_size, pool_excluded = pools[meal_type]
+                rotation_offset = rotation_indices[meal_type]
+                chosen_meals.append(
+                    group.nth_nearest(
+                        per_meal_targets[meal_type], (index + rotation_offset) % pool_size, pool_excluded
                     )
-                    for keyword in restrictions
                 )
-            ]
-
-            candidates_pool = filtered_candidates or sorted_candidates
-            rotation_offset = rotation_indices[meal_type]
-            chosen = candidates_pool[(index + rotation_offset) % len(candidates_pool)]
-            rotation_indices[meal_type] = (rotation_offset + 1) % len(candidates_pool)
+                rotation_indices[meal_type] = (rotation_offset + 1) % pool_size
 
+        for chosen in chosen_meals:
             meal_payload = {
                 key: chosen[key]
                 for key in [
@@ -723,6 +925,7 @@ def _build_meal_plan(request: MealPlanRequest) -> MealPlanResponse:
             rotation_tracker.append(str(meal_payload["name"]))
             total_calories += int(chosen["calories"])
 
+        day_costs.append(day_cost(raw_meals, day_targets))
         day_macro = _macros_from_meals(raw_meals)
         aggregate_macros["protein"] += day_macro.protein
         aggregate_macros["carbs"] += day_macro.carbs
@@ -769,10 +972,11 @@ def _build_meal_plan(request: MealPlanRequest) -> MealPlanResponse:
         goal=request.goal,
         diet=request.diet,
         hydrationCups=hydration_target,
-        macroTargets=_compute_macro_targets(target_calories, request.goal),
+        macroTargets=macro_targets,
         actualMacros=average_macro,
         highlights=highlights,
         tips=tips,
+        fitScore=fit_score(day_costs),
     )
 
     rotation = _ordered_unique(rotation_tracker)
@@ -780,6 +984,54 @@ def _build_meal_plan(request: MealPlanRequest) -> MealPlanResponse:
     return MealPlanResponse(summary=summary, days=days, rotation=rotation)
 
 
+def _meal_plan_key(request: MealPlanRequest) -> Tuple[object, ...]:
+    """Collapse requests that :func:`_build_meal_plan` would answer identically."""
+
+    keywords = sorted({item.strip().lower() for item in request.restrictions + request.allergies if item.strip()})
+    return (
+        request.goal.value,
+        _normalise_target_calories(request),
+        request.diet.value,
+        request.days,
+        tuple(keywords),
+        (request.preferences or "").lower(),
+        request.supplements or "",
+        request.weightGoalShort or "",
+        request.weightGoalLong or "",
+        request.activityLevel or "",
+        request.solver.value,
+        request.solverBudgetMs if request.solver == MealPlanSolver.macro else 0,
+    )
+
+
+def _meal_plan_body(request: MealPlanRequest, key: Optional[Tuple[object, ...]] = None) -> bytes:
+    key = key or _meal_plan_key(request)
+    body = _meal_plan_cache.get(key)
+    if body is None:
+        body = _build_meal_plan(request).model_dump_json().encode("utf-8")
+        _meal_plan_cache.put(key, body)
+    return body
+
+
+def _meal_plan_response(request: MealPlanRequest) -> Response:
+    return Response(content=_meal_plan_body(request), media_type="application/json")
+
+
+def _stream_meal_plans(requests: Sequence[MealPlanRequest]) -> Iterator[bytes]:
+    # group positions by plan key so each distinct plan is built and held once
+    positions: Dict[Tuple[object, ...], List[int]] = {}
+    first_request: Dict[Tuple[object, ...], MealPlanRequest] = {}
+    for position, request in enumerate(requests):
+        key = _meal_plan_key(request)
+        positions.setdefault(key, []).append(position)
+        first_request.setdefault(key, request)
+
+    for key, indices in positions.items():
+        body = _meal_plan_body(first_request[key], key)
+        for position in indices:
+            yield b'{"index":%d,"plan":%s}\n' % (position, body)
+
+
 def _pick_windows(preferred: List[str]) -> List[str]:
     valid = [window for window in preferred if window in WINDOW_LABELS]
     return valid or DEFAULT_WINDOWS
@@ -835,13 +1087,103 @@ def _profile_hash(request: ScheduleRequest) -> str:
     return sha1(payload.encode("utf-8")).hexdigest()
 
 
-def _latest_wellness_metric() -> Optional[WellnessMetric]:
-    if not _wellness_log:
-        return None
-    return _wellness_log[-1]
+def _wellness_partition(profile_key: Optional[str]) -> WellnessStore[WellnessMetric]:
+    return _wellness_partitions.get(profile_key or "")
+
+
+def _latest_wellness_metric(profile_key: Optional[str] = None) -> Optional[WellnessMetric]:
+    """The profile's newest metric, else the newest one not tied to any profile."""
+
+    if profile_key:
+        metric = _wellness_partition(profile_key).latest()
+        if metric is not None:
+            return metric
+    return _wellness_partition(None).latest()
+
+
+def _summarize(profile_key: str, partition: WellnessStore[WellnessMetric]) -> WellnessSummary:
+    rollup = partition.summary()
+    return WellnessSummary(
+        profileHash=profile_key or None,
+        readiness=rollup.readiness,
+        readinessSamples=rollup.readiness_samples,
+        sleepHours=rollup.sleep_hours,
+        sleepSamples=rollup.sleep_samples,
+        steps=rollup.steps,
+        windowEnd=rollup.window_end,
+    )
+
+
+def _wellness_summary(profile_key: Optional[str] = None) -> WellnessSummary:
+    """Rollups the planners use: the profile's own, else those of metrics tied to no profile."""
+
+    if profile_key:
+        partition = _wellness_partition(profile_key)
+        if len(partition):
+            return _summarize(profile_key, partition)
+    return _summarize("", _wellness_partition(None))
+
+
+def _readiness_bucket(summary: Optional[WellnessSummary]) -> str:
+    if summary is None or summary.readiness is None:
+        return "steady"
+    if summary.readiness < 60:
+        return "low"
+    if summary.readiness > 85:
+        return "high"
+    return "steady"
+
+
+def _is_short_sleep(summary: Optional[WellnessSummary]) -> bool:
+    return summary is not None and summary.sleepHours is not None and summary.sleepHours < 6
 
 
-def _build_schedule_plan(request: ScheduleRequest) -> ScheduleResponse:
+def _wellness_buckets(summary: Optional[WellnessSummary]) -> Tuple[str, bool]:
+    return _readiness_bucket(summary), _is_short_sleep(summary)
+
+
+def _plan_key(request: ScheduleRequest, summary: Optional[WellnessSummary]) -> Tuple[str, str, bool]:
+    """Everything the plan builder reads: the whole request, list order included, and the wellness buckets.
+
+    The profile hash sorts ``preferredWindows``, but the builder cycles through them in order.
+    """
+
+    digest = sha1(request.model_dump_json().encode("utf-8")).hexdigest()
+    return (digest, *_wellness_buckets(summary))
+
+
+def _add_wellness(metrics: Sequence[WellnessMetric]) -> List[WellnessMetric]:
+    """File ``metrics`` under their profiles.
+
+    Returns the metrics that were new; ones whose (source, timestamp) the profile already holds are skipped.
+    Cached plans need no invalidation: a shift in readiness or sleep changes the plan key.
+    """
+
+    by_profile: Dict[str, List[WellnessMetric]] = {}
+    for metric in metrics:
+        by_profile.setdefault(metric.profileHash or "", []).append(metric)
+    accepted: List[WellnessMetric] = []
+    for profile_key, group in by_profile.items():
+        accepted.extend(_wellness_partition(profile_key).extend(group))
+    return accepted
+
+
+def _schedule_for(request: ScheduleRequest) -> Tuple[str, ScheduleResponse]:
+    """Return the profile hash and plan for ``request``, building and persisting only on a miss."""
+
+    profile_key = _profile_hash(request)
+    summary = _wellness_summary(profile_key)
+    plan_key = _plan_key(request, summary)
+    schedule = _plan_cache.get(plan_key)
+    if schedule is None:
+        schedule = _build_schedule_plan(request, summary)
+        _plan_cache.put(plan_key, schedule)
+    if _schedules.peek(profile_key) is not schedule:
+        _persist_schedule(profile_key, schedule)
+    return profile_key, schedule
+
+
+def _build_schedule_plan(request: ScheduleRequest, summary: Optional[WellnessSummary]) -> ScheduleResponse:
     windows = _pick_windows(request.preferredWindows)
     equipment = _preferred_equipment(request.equipmentAccess)
     target_days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
@@ -862,18 +1204,17 @@ def _build_schedule_plan(request: ScheduleRequest) -> ScheduleResponse:
     has_knee_issue = "knee" in injuries or "ankle" in injuries
     has_back_issue = "back" in injuries or "spine" in injuries
 
-    latest_metric = _latest_wellness_metric()
     readiness_adjustment = 0
-    if latest_metric and latest_metric.readiness is not None:
-        if latest_metric.readiness < 60:
-            readiness_adjustment = -5
-            insights.append(READINESS_INSIGHTS["low"])
-        elif latest_metric.readiness > 85:
-            readiness_adjustment = 5
-            insights.append(READINESS_INSIGHTS["high"])
+    readiness = _readiness_bucket(summary)
+    if readiness == "low":
+        readiness_adjustment = -5
+        insights.append(READINESS_INSIGHTS["low"])
+    elif readiness == "high":
+        readiness_adjustment = 5
+        insights.append(READINESS_INSIGHTS["high"])
 
     sleep_adjustment = 0
-    if latest_metric and latest_metric.sleepHours is not None and latest_metric.sleepHours < 6:
+    if _is_short_sleep(summary):
         sleep_adjustment = -5
         insights.append(SLEEP_INSIGHT)
 
@@ -973,7 +1314,10 @@ def _compile_takeaways(
 
 
 def _build_coach_actions(
-    schedule: ScheduleResponse, meal_plan: MealPlanResponse, focus_areas: Sequence[str]
+    schedule: ScheduleResponse,
+    meal_plan: MealPlanResponse,
+    focus_areas: Sequence[str],
+    summary: Optional[WellnessSummary],
 ) -> List[CoachAction]:
     actions: List[CoachAction] = []
     focus_lookup = {area.lower() for area in focus_areas}
@@ -1002,8 +1346,7 @@ def _build_coach_actions(
             )
         )
 
-    metric = _latest_wellness_metric()
-    if metric and metric.sleepHours and metric.sleepHours < 7:
+    if summary and summary.sleepHours and summary.sleepHours < 7:
         actions.append(
             CoachAction(
                 headline="Prioritise sleep hygiene tonight",
@@ -1121,45 +1464,111 @@ def delete_user(user_id: int) -> Dict[str, str]:
 
 
 @app.get("/fit/meal-plan", response_model=MealPlanResponse)
-def sample_meal_plan() -> MealPlanResponse:
-    return _build_meal_plan(MealPlanRequest())
+def sample_meal_plan() -> Response:
+    return _meal_plan_response(MealPlanRequest())
 
 
 @app.post("/fit/meal-plan", response_model=MealPlanResponse)
-def generate_meal_plan(request: MealPlanRequest) -> MealPlanResponse:
-    return _build_meal_plan(request)
+def generate_meal_plan(request: MealPlanRequest) -> Response:
+    return _meal_plan_response(request)
+
+
+@app.post("/fit/meal-plan/batch")
+def generate_meal_plan_batch(requests: List[MealPlanRequest]) -> StreamingResponse:
+    """Stream one ``{"index", "plan"}`` NDJSON line per request; identical requests share a build."""
+
+    return StreamingResponse(_stream_meal_plans(requests), media_type="application/x-ndjson")
+
+
+@app.get("/fit/meal-plan/stats", response_model=Dict[str, float])
+def meal_plan_stats() -> Dict[str, float]:
+    return _meal_plan_cache.stats()
 
 
 @app.post("/fit/schedule", response_model=ScheduleResponse)
 def generate_schedule(request: ScheduleRequest) -> ScheduleResponse:
-    profile_key = _profile_hash(request)
-    schedule = _build_schedule_plan(request)
-    _schedules[profile_key] = schedule
-    _persist_state()
+    _, schedule = _schedule_for(request)
     return schedule
 
 
+@app.post("/fit/schedule/batch", response_model=ScheduleBatchResponse)
+def generate_schedule_batch(payload: List[Dict[str, object]]) -> ScheduleBatchResponse:
+    """Build schedules for many profiles and persist every new plan in one write."""
+
+    items: List[ScheduleBatchItem] = []
+    # the plan each profile ends up with; a later entry for the same profile wins
+    chosen: Dict[str, Tuple[str, str, bool]] = {}
+    plans: Dict[Tuple[str, str, bool], ScheduleResponse] = {}
+    missing: Dict[Tuple[str, str, bool], Tuple[ScheduleRequest, WellnessSummary]] = {}
+    for entry in payload:
+        try:
+            request = ScheduleRequest.model_validate(entry)
+        except ValidationError as exc:
+            error = exc.errors()[0]
+            location = ".".join(str(part) for part in error["loc"])
+            items.append(ScheduleBatchItem(status="invalid", detail=f"{location}: {error['msg']}"))
+            continue
+        profile_key = _profile_hash(request)
+        items.append(ScheduleBatchItem(profileHash=profile_key, status="created"))
+        summary = _wellness_summary(profile_key)
+        plan_key = _plan_key(request, summary)
+        chosen[profile_key] = plan_key
+        if plan_key in plans or plan_key in missing:
+            continue
+        cached = _plan_cache.peek(plan_key)
+        if cached is not None:
+            plans[plan_key] = cached
+        else:
+            missing[plan_key] = (request, summary)
+
+    # built inline: a plan takes tens of microseconds, less than pickling it to a worker process
+    # (python tools/bench_schedule_batch.py)
+    built = [_build_schedule_plan(request, summary) for request, summary in missing.values()]
+    for plan_key, schedule in zip(missing, built):
+        plans[plan_key] = schedule
+        _plan_cache.put(plan_key, schedule)
+
+    writes = {
+        profile_key: plans[plan_key]
+        for profile_key, plan_key in chosen.items()
+        if _schedules.peek(profile_key) is not plans[plan_key]
+    }
+    for profile_key, schedule in writes.items():
+        _schedules.put(profile_key, schedule)
+    if writes:
+        _storage.write_batch({key: schedule.model_dump() for key, schedule in writes.items()}, [])
+
+    for item in items:
+        if item.profileHash is not None and item.profileHash not in writes:
+            item.status = "unchanged"
+    return ScheduleBatchResponse(items=items, persisted=len(writes))
+
+
 @app.get("/fit/schedule", response_model=ScheduleResponse)
 def fetch_schedule(profileHash: str) -> ScheduleResponse:
-    if profileHash not in _schedules:
-        raise HTTPException(status_code=404, detail="Schedule not found for profile")
-    return _schedules[profileHash]
+    return _stored_schedule(profileHash)
+
+
+@app.get("/fit/schedule/stats", response_model=Dict[str, Dict[str, float]])
+def schedule_stats() -> Dict[str, Dict[str, float]]:
+    return {"cache": _schedules.stats(), "plans": _plan_cache.stats(), "stored": _storage.schedule_stats()}
 
 
 @app.post("/fit/schedule/fetch", response_model=ScheduleResponse)
 def fetch_schedule_by_profile(request: ScheduleRequest) -> ScheduleResponse:
-    profile_key = _profile_hash(request)
-    if profile_key not in _schedules:
-        raise HTTPException(status_code=404, detail="Schedule not found for profile")
-    return _schedules[profile_key]
+    return _stored_schedule(_profile_hash(request))
 
 
-@app.post("/fit/coach/recommendation", response_model=CoachRecommendation)
-def generate_coach_recommendation(payload: CoachRecommendationRequest) -> CoachRecommendation:
+def _plan_coach_recommendation(
+    payload: CoachRecommendationRequest,
+    summary: Optional[WellnessSummary],
+    schedule: Optional[ScheduleResponse] = None,
+) -> Tuple[ScheduleResponse, MealPlanResponse, List[str], List[CoachAction]]:
+    """Pure planning half of the coach endpoint; safe to run in a worker process."""
+
     schedule_request = payload.schedule
-    profile_key = _profile_hash(schedule_request)
-    schedule = _build_schedule_plan(schedule_request)
-    _schedules[profile_key] = schedule
+    if schedule is None:
+        schedule = _build_schedule_plan(schedule_request, summary)
 
     meal_request = payload.mealPlan or MealPlanRequest(
         goal=schedule_request.goal,
@@ -1169,9 +1578,61 @@ def generate_coach_recommendation(payload: CoachRecommendationRequest) -> CoachR
     meal_plan = _build_meal_plan(meal_request)
 
     takeaways = _compile_takeaways(schedule, meal_plan, payload.focusAreas)
-    actions = _build_coach_actions(schedule, meal_plan, payload.focusAreas)
+    actions = _build_coach_actions(schedule, meal_plan, payload.focusAreas, summary)
+    return schedule, meal_plan, takeaways, actions
+
+
+def _init_planning_worker(meals: List[Dict[str, object]]) -> None:
+    # spawned workers import the bundled library; plan from the one this process is serving
+    replace_meal_library(meals)
+
+
+def _coach_executor() -> Optional[ProcessPoolExecutor]:
+    global _coach_pool
+    if COACH_WORKERS <= 0:
+        return None
+    with _coach_pool_lock:
+        if _coach_pool is None:
+            _coach_pool = ProcessPoolExecutor(
+                max_workers=COACH_WORKERS,
+                mp_context=_pool_context,
+                initializer=_init_planning_worker,
+                initargs=(list(MEAL_LIBRARY),),
+            )
+        return _coach_pool
+
+
+def shutdown_coach_pool() -> None:
+    global _coach_pool
+    with _coach_pool_lock:
+        pool, _coach_pool = _coach_pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
 
-    _persist_state()
+
+@app.post("/fit/coach/recommendation", response_model=CoachRecommendation)
+async def generate_coach_recommendation(payload: CoachRecommendationRequest) -> CoachRecommendation:
+    profile_key = _profile_hash(payload.schedule)
+    # a cold partition loads from storage, which must stay off the event loop
+    summary = await run_in_threadpool(_wellness_summary, profile_key)
+    plan_key = _plan_key(payload.schedule, summary)
+    cached = _plan_cache.get(plan_key)
+
+    pool = _coach_executor()
+    if pool is None:
+        planned = await run_in_threadpool(_plan_coach_recommendation, payload, summary, cached)
+    else:
+        loop = asyncio.get_running_loop()
+        planned = await loop.run_in_executor(pool, _plan_coach_recommendation, payload, summary, cached)
+    schedule, meal_plan, takeaways, actions = planned
+
+    if cached is None:
+        _plan_cache.put(plan_key, schedule)
+    elif pool is not None:
+        # the worker hands back a copy; keep the cached instance so the persistence check below holds
+        schedule = cached
+    if _schedules.peek(profile_key) is not schedule:
+        await run_in_threadpool(_persist_schedule, profile_key, schedule)
 
     return CoachRecommendation(
         profileHash=profile_key,
@@ -1184,44 +1645,263 @@ def generate_coach_recommendation(payload: CoachRecommendationRequest) -> CoachR
 
 @app.post("/fit/wellness-sync", response_model=Dict[str, str])
 def record_wellness_metric(metric: WellnessMetric) -> Dict[str, str]:
-    _wellness_log.append(metric)
-    if len(_wellness_log) > 200:
-        del _wellness_log[0]
-    _persist_state()
+    if not _add_wellness([metric]):
+        return {"status": "duplicate"}
+    _persist_wellness([metric])
     return {"status": "recorded"}
 
 
+def _time_window(start: Optional[str], end: Optional[str]) -> Tuple[Optional[float], Optional[float]]:
+    try:
+        return (parse_timestamp(start) if start else None, parse_timestamp(end) if end else None)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail="start and end must be ISO 8601 timestamps") from exc
+
+
 @app.get("/fit/wellness-sync", response_model=List[WellnessMetric])
-def list_wellness_metrics(limit: int = 20) -> List[WellnessMetric]:
-    if limit <= 0:
-        return []
-    return _wellness_log[-limit:]
+def list_wellness_metrics(
+    response: Response,
+    limit: int = 20,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    source: Optional[str] = None,
+    profileHash: Optional[str] = None,
+    since: Optional[int] = None,
+    until: Optional[int] = None,
+) -> List[WellnessMetric]:
+    """Latest entries as stored, or with ``start``/``end``/``source`` the newest stored ones in that window by timestamp.
+
+    ``since``/``until`` instead page through stored entries by sequence number, oldest first, returning
+    at most ``limit`` with ``since < seq <= until``. Stored-order reads set ``X-Next-Cursor`` to the
+    ``since`` value for the next poll. ``profileHash`` narrows any form to one profile; windows without
+    it cover metrics tied to no profile.
+    """
+
+    if since is not None or until is not None:
+        if start is not None or end is not None or source is not None:
+            raise HTTPException(status_code=422, detail="since/until cannot be combined with start, end or source")
+        cursor = max(since or 0, 0)
+        entries = _storage.wellness_since(cursor, limit, profileHash, until)
+        response.headers["X-Next-Cursor"] = str(wellness_seq(entries[-1]) if entries else cursor)
+        return _parse_wellness(entries)
+    if start is None and end is None and source is None:
+        entries = _storage.recent_wellness(limit, profileHash)
+        response.headers["X-Next-Cursor"] = str(max(map(wellness_seq, entries), default=0))
+        return _parse_wellness(entries)
+    entries = _storage.wellness_between(profileHash or "", *_time_window(start, end), limit, source)
+    return _parse_wellness(entries)
+
+
+@app.get("/fit/wellness-sync/summary", response_model=WellnessSummary)
+def wellness_summary(profileHash: Optional[str] = None) -> WellnessSummary:
+    """Rolling readiness, sleep and step figures, as the schedule builder sees them for ``profileHash``."""
+
+    return _wellness_summary(profileHash)
+
+
+class WellnessArchiveBucket(BaseModel):
+    start: str
+    count: int
+    steps: int
+    sleepHours: Optional[float] = None
+    readiness: Optional[float] = None
+
+
+@app.get("/fit/wellness-sync/archive", response_model=List[WellnessMetric])
+def list_archived_wellness(
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    source: Optional[str] = None,
+    profileHash: Optional[str] = None,
+    limit: int = 1000,
+) -> List[WellnessMetric]:
+    """Metrics that aged out of storage, oldest first; only steps, sleep and readiness are archived."""
+
+    rows = wellness_archive().metrics(profileHash or "", *_time_window(start, end), source, max(limit, 0))
+    return [WellnessMetric(**row) for row in rows]
+
+
+@app.get("/fit/wellness-sync/archive/rollups", response_model=List[WellnessArchiveBucket])
+def list_archived_rollups(
+    resolution: str = "day",
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    source: Optional[str] = None,
+    profileHash: Optional[str] = None,
+) -> List[WellnessArchiveBucket]:
+    """Daily or weekly downsampled archive buckets; averages cover the readings that had a value."""
+
+    try:
+        buckets = wellness_archive().rollups(profileHash or "", resolution, *_time_window(start, end), source)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    return [WellnessArchiveBucket(**bucket) for bucket in buckets]
 
 
 class WellnessImportPayload(BaseModel):
     source: str
-    entries: List[WellnessMetric]
+    # validated per entry by the endpoint so one bad row does not reject the batch
+    entries: List[Any]
+    profileHash: Optional[str] = None
+
+
+class WellnessImportRejection(BaseModel):
+    index: int
+    detail: str
+
+
+class WellnessImportResult(BaseModel):
+    status: str
+    count: int
+    accepted: int
+    duplicates: int
+    rejected: int
+    errors: List[WellnessImportRejection] = Field(default_factory=list)
+
+
+# rejected rows beyond this are counted but not described
+IMPORT_ERROR_DETAILS = 20
+
+
+@app.post("/fit/wellness-sync/import", response_model=WellnessImportResult)
+def import_wellness_metrics(payload: WellnessImportPayload) -> WellnessImportResult:
+    """Validate every entry in one pass and store the new ones; re-importing the same rows is a no-op."""
+
+    metrics: List[WellnessMetric] = []
+    errors: List[WellnessImportRejection] = []
+    rejected = 0
+    for index, entry in enumerate(payload.entries):
+        try:
+            if not isinstance(entry, dict):
+                raise ValueError("entry must be an object")
+            overrides: Dict[str, object] = {"source": payload.source}
+            if payload.profileHash:
+                overrides["profileHash"] = payload.profileHash
+            metrics.append(WellnessMetric.model_validate({**entry, **overrides}))
+        except (ValidationError, ValueError) as exc:
+            rejected += 1
+            if len(errors) < IMPORT_ERROR_DETAILS:
+                errors.append(WellnessImportRejection(index=index, detail=str(exc)))
+
+    accepted = _add_wellness(metrics)
+    if accepted:
+        _persist_wellness(accepted)
+    return WellnessImportResult(
+        status="imported",
+        count=len(accepted),
+        accepted=len(accepted),
+        duplicates=len(metrics) - len(accepted),
+        rejected=rejected,
+        errors=errors,
+    )
+
 
+class ProviderSyncResult(BaseModel):
+    provider: str
+    status: str
+    fetched: int = 0
+    imported: int = 0
+    rejected: int = 0
+    latencyMs: float
+    detail: Optional[str] = None
+    errors: List[WellnessImportRejection] = Field(default_factory=list)
 
-@app.post("/fit/wellness-sync/import", response_model=Dict[str, str])
-def import_wellness_metrics(payload: WellnessImportPayload) -> Dict[str, str]:
-    for entry in payload.entries:
-        entry.source = payload.source
-        _wellness_log.append(entry)
-    if len(_wellness_log) > 200:
-        del _wellness_log[:-200]
-    _persist_state()
-    return {"status": "imported", "count": str(len(payload.entries))}
+
+class WellnessSyncAllResponse(BaseModel):
+    providers: List[ProviderSyncResult]
+    imported: int
+    duplicates: int
+    rejected: int = 0
+
+
+def _import_synced_wellness(fresh: Sequence[WellnessMetric]) -> List[WellnessMetric]:
+    accepted = _add_wellness(fresh)
+    if accepted:
+        _persist_wellness(accepted)
+    return accepted
+
+
+# a provider imports its new entries every this many, so a long export never sits in memory whole
+SYNC_IMPORT_BATCH = max(1, int(os.getenv("DAWAR_POWER_SYNC_IMPORT_BATCH", "1000")))
+
+
+async def _sync_provider(
+    provider: str, profile_key: Optional[str], partition: WellnessStore[WellnessMetric]
+) -> Tuple[ProviderSyncResult, List[WellnessMetric], int]:
+    """Stream one provider's entries through validation, importing those whose (source, timestamp) is new.
+
+    Full batches are imported as they fill; the last partial one is returned with the count
+    already accepted, so a small sync still lands in a single write. Entries that fail
+    validation are counted and skipped, as ``/import`` does.
+    """
+
+    started = time.perf_counter()
+    fetched = imported = accepted = rejected = 0
+    errors: List[WellnessImportRejection] = []
+    batch: List[WellnessMetric] = []
+    seen: Set[str] = set()
+    try:
+        async for entry in _provider_client.stream(provider, PROVIDER_SAMPLES[provider]):
+            fetched += 1
+            try:
+                if not isinstance(entry, dict):
+                    raise ValueError("entry must be an object")
+                metric = WellnessMetric.model_validate({**entry, "source": provider, "profileHash": profile_key})
+            except (ValidationError, ValueError) as exc:
+                rejected += 1
+                if len(errors) < IMPORT_ERROR_DETAILS:
+                    errors.append(WellnessImportRejection(index=fetched - 1, detail=str(exc)))
+                continue
+            if metric.timestamp not in seen and metric not in partition:
+                seen.add(metric.timestamp)
+                batch.append(metric)
+            if len(batch) >= SYNC_IMPORT_BATCH:
+                imported += len(batch)
+                accepted += len(await run_in_threadpool(_import_synced_wellness, batch))
+                batch, seen = [], set()
+    except ProviderFetchError as exc:
+        # batches imported before the failure stay, so the entries validated since are kept too
+        status, detail = "error", str(exc)
+    else:
+        status, detail = "ok", None
+    latency = round((time.perf_counter() - started) * 1000, 1)
+    result = ProviderSyncResult(
+        provider=provider,
+        status=status,
+        fetched=fetched,
+        imported=imported + len(batch),
+        rejected=rejected,
+        latencyMs=latency,
+        detail=detail,
+        errors=errors,
+    )
+    return result, batch, accepted
+
+
+@app.post("/fit/wellness-sync/sync-all", response_model=WellnessSyncAllResponse)
+async def sync_all_providers(profileHash: Optional[str] = None) -> WellnessSyncAllResponse:
+    """Fetch every provider concurrently and import the new entries in batches of ``SYNC_IMPORT_BATCH``."""
+
+    partition = await run_in_threadpool(_wellness_partition, profileHash)
+    synced = await asyncio.gather(*(_sync_provider(provider, profileHash, partition) for provider in PROVIDER_SAMPLES))
+    rest = [metric for _, metrics, _ in synced for metric in metrics]
+    # the store's own index has the final say, in case another import landed meanwhile
+    accepted = sum(count for _, _, count in synced) + len(await run_in_threadpool(_import_synced_wellness, rest))
+
+    results = [result for result, _, _ in synced]
+    fetched = sum(result.fetched for result in results)
+    rejected = sum(result.rejected for result in results)
+    return WellnessSyncAllResponse(
+        providers=results, imported=accepted, duplicates=fetched - rejected - accepted, rejected=rejected
+    )
 
 
 @app.get("/fit/wellness-sync/provider/{provider}", response_model=List[WellnessMetric])
-def fetch_provider_sample(provider: str) -> List[WellnessMetric]:
+async def fetch_provider_sample(provider: str) -> List[WellnessMetric]:
     provider_key = provider.lower()
     if provider_key not in PROVIDER_SAMPLES:
         raise HTTPException(status_code=404, detail="Provider not supported")
     try:
-        payload = fetch_provider_payload(provider_key, PROVIDER_SAMPLES[provider_key])
+        return await _provider_cache.get(provider_key, PROVIDER_SAMPLES[provider_key])
     except ProviderFetchError as exc:
         raise HTTPException(status_code=502, detail=str(exc)) from exc
-
-    return [WellnessMetric(source=provider_key, **entry) for entry in payload]
@@ -0,0 +1,142 @@
+import re
+from bisect import bisect_left
+from heapq import merge
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .cache import LRUCache
+
+Meal = Dict[str, object]
+
+
+def _bitmap(positions: Iterable[int], size: int) -> int:
+    bits = bytearray((size + 7) // 8)
+    for position in positions:
+        bits[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(bits, "little")
+
+
+def _popcount(mask: int) -> int:
+    return bin(mask).count("1")
+
+
+def _searchable_text(meal: Meal) -> str:
+    return " ".join(
+        [str(meal["name"]), str(meal.get("description", "")), " ".join(meal.get("tags", []))]  # type: ignore[arg-type]
+    ).lower()
+
+
+class MealGroup:
+    """Meals of one type that suit one diet, bucketed by calorie value."""
+
+    def __init__(self, meals: Sequence[Tuple[int, Meal]], library_size: int) -> None:
+        buckets: Dict[int, List[Tuple[int, Meal]]] = {}
+        for position, meal in meals:
+            buckets.setdefault(int(meal["calories"]), []).append((position, meal))
+        self.calories = sorted(buckets)
+        self.buckets = [buckets[calories] for calories in self.calories]
+        self.meals = [meal for _, meal in meals]
+        self.mask = _bitmap((position for position, _ in meals), library_size)
+
+    def __len__(self) -> int:
+        return len(self.meals)
+
+    def allowed_count(self, excluded: int) -> int:
+        return _popcount(self.mask & ~excluded)
+
+    def nearest(self, target: int) -> Iterator[Meal]:
+        """Yield meals by calorie distance from ``target``; ties keep library order."""
+
+        for _, meal in self._ranked(target):
+            yield meal
+
+    def _ranked(self, target: int) -> Iterator[Tuple[int, Meal]]:
+        right = bisect_left(self.calories, target)
+        left = right - 1
+        while left >= 0 or right < len(self.calories):
+            below = target - self.calories[left] if left >= 0 else None
+            above = self.calories[right] - target if right < len(self.calories) else None
+            if above is None or (below is not None and below < above):
+                entries = self.buckets[left]
+                left -= 1
+            elif below is None or above < below:
+                entries = self.buckets[right]
+                right += 1
+            else:
+                entries = list(merge(self.buckets[left], self.buckets[right], key=lambda entry: entry[0]))
+                left -= 1
+                right += 1
+            yield from entries
+
+    def candidates(self, target: int, limit: int, excluded: int = 0) -> List[Meal]:
+        """Up to ``limit`` meals in :meth:`nearest` order, skipping ``excluded`` positions."""
+
+        picked: List[Meal] = []
+        for position, meal in self._ranked(target):
+            if len(picked) == limit:
+                break
+            if not excluded >> position & 1:
+                picked.append(meal)
+        return picked
+
+    def nth_nearest(self, target: int, rank: int, excluded: int = 0) -> Meal:
+        """The ``rank``-th meal (0-based) in :meth:`nearest` order, skipping ``excluded`` positions."""
+
+        for position, meal in self._ranked(target):
+            if excluded >> position & 1:
+                continue
+            if rank == 0:
+                return meal
+            rank -= 1
+        raise IndexError(rank)
+
+
+class MealIndex:
+    """Meal library grouped by (meal type, diet), built once per library version.
+
+    A diet with no tagged meals for a meal type falls back to every meal of
+    that type, and ``default_diet`` always uses every meal of the type.
+    """
+
+    def __init__(
+        self,
+        library: Sequence[Meal],
+        diets: Sequence[str],
+        default_diet: str = "standard",
+        exclusion_cache_size: int = 256,
+    ) -> None:
+        # searchable text is built once here so restriction filtering never rebuilds it
+        self.haystacks = [_searchable_text(meal) for meal in library]
+        self._exclusions: LRUCache[Tuple[str, ...], int] = LRUCache(exclusion_cache_size)
+
+        by_type: Dict[str, List[Tuple[int, Meal]]] = {}
+        for position, meal in enumerate(library):
+            by_type.setdefault(str(meal["mealType"]), []).append((position, meal))
+
+        self._groups: Dict[Tuple[str, str], MealGroup] = {}
+        for meal_type, meals in by_type.items():
+            for diet in diets:
+                matching = meals
+                if diet != default_diet:
+                    matching = [entry for entry in meals if diet in entry[1].get("diets", [])] or meals  # type: ignore[operator]
+                self._groups[(meal_type, diet)] = MealGroup(matching, len(library))
+
+    def group(self, meal_type: str, diet: str) -> Optional[MealGroup]:
+        return self._groups.get((meal_type, diet))
+
+    def exclusion_mask(self, keywords: Iterable[str]) -> int:
+        """Bitmap of library positions whose text contains any of ``keywords``.
+
+        Each distinct keyword set is compiled into one alternation pattern and
+        its bitmap is cached, so repeat restriction lists cost a dict lookup.
+        """
+
+        key = tuple(sorted(set(keywords)))
+        if not key:
+            return 0
+        mask = self._exclusions.get(key)
+        if mask is None:
+            pattern = re.compile("|".join(re.escape(keyword) for keyword in key))
+            matches = (position for position, text in enumerate(self.haystacks) if pattern.search(text))
+            mask = _bitmap(matches, len(self.haystacks))
+            self._exclusions.put(key, mask)
+        return mask
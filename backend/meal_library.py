@@ -0,0 +1,43 @@
+import json
+from pathlib import Path
+from typing import Dict, List
+
+REQUIRED_FIELDS = ("name", "mealType", "calories", "protein", "carbs", "fat", "prepTime", "description")
+NUMERIC_FIELDS = ("calories", "protein", "carbs", "fat", "prepTime")
+
+
+class MealLibraryError(Exception):
+    """Raised when a meal library file cannot be parsed."""
+
+
+def load_meal_library(path: Path) -> List[Dict[str, object]]:
+    """Read a meal catalogue from a JSON Lines file, one meal object per line.
+
+    Lines follow the ``MEAL_LIBRARY`` shape; ``tags`` defaults to empty and
+    ``diets`` to ``["standard"]``.
+    """
+
+    meals: List[Dict[str, object]] = []
+    with path.open(encoding="utf-8") as handle:
+        for line_number, line in enumerate(handle, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                meal = json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise MealLibraryError(f"{path}:{line_number}: invalid JSON") from exc
+            if not isinstance(meal, dict):
+                raise MealLibraryError(f"{path}:{line_number}: expected an object")
+            missing = [field for field in REQUIRED_FIELDS if field not in meal]
+            if missing:
+                raise MealLibraryError(f"{path}:{line_number}: missing {', '.join(missing)}")
+            try:
+                for field in NUMERIC_FIELDS:
+                    meal[field] = int(meal[field])
+            except (TypeError, ValueError) as exc:
+                raise MealLibraryError(f"{path}:{line_number}: {field} must be a number") from exc
+            meal.setdefault("tags", [])
+            meal.setdefault("diets", ["standard"])
+            meals.append(meal)
+    return meals
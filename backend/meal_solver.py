@@ -0,0 +1,121 @@
+import time
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+Meal = Dict[str, object]
+
+MACRO_KEYS = ("calories", "protein", "carbs", "fat")
+
+# protein is weighted up because nearest-calorie picks tend to undershoot it
+DEFAULT_WEIGHTS: Dict[str, float] = {"calories": 1.0, "protein": 1.5, "carbs": 1.0, "fat": 1.0}
+
+
+class _SearchTimeout(Exception):
+    pass
+
+
+def _scales(targets: Mapping[str, float], weights: Mapping[str, float]) -> List[float]:
+    total_weight = sum(weights[key] for key in MACRO_KEYS)
+    return [weights[key] / max(float(targets[key]), 1.0) / total_weight for key in MACRO_KEYS]
+
+
+def day_cost(
+    meals: Sequence[Meal], targets: Mapping[str, float], weights: Mapping[str, float] = DEFAULT_WEIGHTS
+) -> float:
+    """Weighted mean relative distance of the meals' totals from ``targets`` (0 is a perfect fit)."""
+
+    scales = _scales(targets, weights)
+    return sum(
+        scale * abs(sum(int(meal[key]) for meal in meals) - float(targets[key]))  # type: ignore[call-overload]
+        for scale, key in zip(scales, MACRO_KEYS)
+    )
+
+
+def solve_day(
+    slots: Sequence[Sequence[Meal]],
+    targets: Mapping[str, float],
+    deadline: float,
+    weights: Mapping[str, float] = DEFAULT_WEIGHTS,
+    usage: Optional[Mapping[str, int]] = None,
+    reuse_penalty: float = 0.005,
+) -> List[Meal]:
+    """Pick one meal per slot minimising :func:`day_cost` with branch and bound.
+
+    Each slot's candidates should be ordered best-guess first; the first
+    combination tried is every slot's first candidate. The search stops at
+    ``deadline`` (a ``time.perf_counter()`` value) and returns the best
+    combination found so far. ``usage`` counts meals already on the plan so
+    repeats cost ``reuse_penalty`` each.
+    """
+
+    slots = [list(slot) for slot in slots if slot]
+    if not slots:
+        return []
+    usage = usage or {}
+    scales = _scales(targets, weights)
+    goal = [float(targets[key]) for key in MACRO_KEYS]
+    options: List[List[Tuple[Meal, Tuple[int, ...], float]]] = [
+        [
+            (meal, tuple(int(meal[key]) for key in MACRO_KEYS), reuse_penalty * usage.get(str(meal["name"]), 0))  # type: ignore[call-overload]
+            for meal in slot
+        ]
+        for slot in slots
+    ]
+
+    # the smallest and largest totals the remaining slots can still add
+    width = len(MACRO_KEYS)
+    floor = [[0] * width for _ in range(len(options) + 1)]
+    ceiling = [[0] * width for _ in range(len(options) + 1)]
+    for depth in range(len(options) - 1, -1, -1):
+        for column in range(width):
+            values = [macros[column] for _, macros, _ in options[depth]]
+            floor[depth][column] = floor[depth + 1][column] + min(values)
+            ceiling[depth][column] = ceiling[depth + 1][column] + max(values)
+
+    def lower_bound(depth: int, totals: List[int]) -> float:
+        bound = 0.0
+        for column in range(width):
+            low = totals[column] + floor[depth][column]
+            high = totals[column] + ceiling[depth][column]
+            if goal[column] < low:
+                bound += scales[column] * (low - goal[column])
+            elif goal[column] > high:
+                bound += scales[column] * (goal[column] - high)
+        return bound
+
+    best = [slot[0][0] for slot in options]
+    best_cost = day_cost(best, targets, weights) + sum(slot[0][2] for slot in options)
+    chosen: List[Meal] = []
+    visited = 0
+
+    def search(depth: int, totals: List[int], penalty: float) -> None:
+        nonlocal best, best_cost, visited
+        if depth == len(options):
+            cost = penalty + sum(scales[column] * abs(totals[column] - goal[column]) for column in range(width))
+            if cost < best_cost:
+                best, best_cost = list(chosen), cost
+            return
+        for meal, macros, meal_penalty in options[depth]:
+            visited += 1
+            if visited % 256 == 0 and time.perf_counter() > deadline:
+                raise _SearchTimeout
+            next_totals = [total + value for total, value in zip(totals, macros)]
+            next_penalty = penalty + meal_penalty
+            if next_penalty + lower_bound(depth + 1, next_totals) >= best_cost:
+                continue
+            chosen.append(meal)
+            search(depth + 1, next_totals, next_penalty)
+            chosen.pop()
+
+    try:
+        search(0, [0] * width, 0.0)
+    except _SearchTimeout:
+        pass
+    return best
+
+
+def fit_score(costs: Sequence[float]) -> float:
+    """Turn per-day costs into a 0-100 score, 100 meaning every day hit its targets."""
+
+    if not costs:
+        return 0.0
+    return round(max(0.0, 1.0 - sum(costs) / len(costs)) * 100, 1)
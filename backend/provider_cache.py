@@ -0,0 +1,100 @@
+import asyncio
+import logging
+import time
+from typing import Callable, Dict, Generic, List, Optional, Set, TypeVar
+
+from .provider_clients import ProviderClient, ProviderFetchError, provider_url
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+
+class _Entry(Generic[T]):
+    def __init__(self, url: Optional[str], value: T, etag: Optional[str], last_modified: Optional[str], now: float):
+        self.url = url
+        self.value = value
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = now
+
+
+class ProviderCache(Generic[T]):
+    """Per-provider stale-while-revalidate cache in front of :class:`ProviderClient`.
+
+    ``parse(provider, entries)`` turns a fresh payload into the cached value,
+    so validation runs once per payload rather than once per request. After
+    ``ttl`` seconds a read still returns the cached value immediately and
+    starts one background revalidation with the payload's ETag and
+    Last-Modified. A failed refresh keeps serving the last good value.
+    """
+
+    def __init__(
+        self,
+        client: ProviderClient,
+        parse: Callable[[str, List[dict]], T],
+        ttl: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.client = client
+        self.parse = parse
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: Dict[str, _Entry[T]] = {}
+        self._refreshing: Dict[str, "asyncio.Task[None]"] = {}
+        self._background: Set["asyncio.Task[None]"] = set()
+
+    async def get(self, provider: str, fallback: List[dict]) -> T:
+        """Cached value for ``provider``; only the first fetch (or a URL change) blocks.
+
+        Raises :class:`ProviderFetchError` when there is no earlier payload to fall back to.
+        """
+
+        entry = self._entries.get(provider)
+        if entry is None or entry.url != provider_url(provider):
+            return (await self._fetch(provider, fallback, None)).value
+
+        if self._clock() - entry.fetched_at >= self.ttl and not self._is_refreshing(provider):
+            task = asyncio.get_running_loop().create_task(self._refresh(provider, fallback, entry))
+            self._refreshing[provider] = task
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+        return entry.value
+
+    def _is_refreshing(self, provider: str) -> bool:
+        # a task left behind by a finished event loop never completes, so it does not count
+        task = self._refreshing.get(provider)
+        return task is not None and not task.done() and task.get_loop() is asyncio.get_running_loop()
+
+    async def _fetch(self, provider: str, fallback: List[dict], previous: Optional[_Entry[T]]) -> _Entry[T]:
+        url = provider_url(provider)
+        response = await self.client.fetch_conditional(
+            provider,
+            fallback,
+            etag=previous.etag if previous else None,
+            last_modified=previous.last_modified if previous else None,
+        )
+        if response.not_modified and previous is not None:
+            previous.fetched_at = self._clock()
+            return previous
+        entry = _Entry(url, self.parse(provider, response.entries), response.etag, response.last_modified, self._clock())
+        self._entries[provider] = entry
+        return entry
+
+    async def _refresh(self, provider: str, fallback: List[dict], previous: _Entry[T]) -> None:
+        try:
+            await self._fetch(provider, fallback, previous)
+        except ProviderFetchError as exc:
+            logger.warning("Serving last good %s payload; refresh failed: %s", provider, exc)
+        except Exception:
+            # a payload that cannot be parsed is a failed refresh too, not an error for whoever awaits the task
+            logger.exception("Serving last good %s payload; parsing the refresh failed", provider)
+        finally:
+            if self._refreshing.get(provider) is asyncio.current_task():
+                del self._refreshing[provider]
+
+    async def drain(self) -> None:
+        """Wait for in-flight background refreshes."""
+
+        if self._background:
+            await asyncio.gather(*list(self._background), return_exceptions=True)
@@ -1,41 +1,273 @@
-import json
+import asyncio
 import os
-from typing import Any, List
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional
 from urllib.error import URLError
 from urllib.request import urlopen
 
+import httpx
+
+from .entry_stream import EntryStreamError, EntryStreamParser, iter_entries
+
+DEFAULT_TIMEOUT = float(os.getenv("DAWAR_POWER_PROVIDER_TIMEOUT", "5"))
+DEFAULT_RETRIES = int(os.getenv("DAWAR_POWER_PROVIDER_RETRIES", "2"))
+DEFAULT_CONCURRENCY = int(os.getenv("DAWAR_POWER_PROVIDER_CONCURRENCY", "4"))
+
+# payload bodies are parsed in pieces this size rather than read whole
+CHUNK_SIZE = 1 << 16
+
+# 429 and 5xx are worth another attempt; other error statuses are not
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+
 
 class ProviderFetchError(Exception):
     """Raised when a provider endpoint cannot be reached."""
 
 
-def fetch_provider_payload(provider: str, fallback: List[dict]) -> List[dict]:
-    """Fetch provider data from a remote API or return the fallback sample."""
+def provider_url(provider: str) -> Optional[str]:
+    return os.getenv(f"DAWAR_POWER_{provider.upper()}_URL")
 
-    provider_key = provider.lower()
-    env_key = f"DAWAR_POWER_{provider_key.upper()}_URL"
-    url = os.getenv(env_key)
 
-    if not url:
-        return fallback
+def provider_timeout(provider: str) -> float:
+    """Per-provider timeout from ``DAWAR_POWER_<PROVIDER>_TIMEOUT``, else the shared default."""
+
+    value = os.getenv(f"DAWAR_POWER_{provider.upper()}_TIMEOUT")
+    return float(value) if value else DEFAULT_TIMEOUT
+
+
+def _stream_entries(chunks: Iterable[bytes]) -> Iterator[dict]:
+    try:
+        yield from iter_entries(chunks)
+    except EntryStreamError as exc:
+        raise ProviderFetchError(str(exc)) from exc
 
+
+def _read_chunks(response: Any) -> Iterator[bytes]:
+    while True:
+        try:
+            chunk = response.read(CHUNK_SIZE)
+        except OSError as exc:
+            raise ProviderFetchError(str(exc)) from exc
+        if not chunk:
+            return
+        yield chunk
+
+
+def _open_url(url: str, timeout: float) -> Any:
     try:
-        with urlopen(url) as response:  # nosec - trusted local usage
-            body = response.read().decode("utf-8")
-    except URLError as exc:  # pragma: no cover
+        return urlopen(url, timeout=timeout)  # nosec - trusted local usage
+    except (URLError, OSError) as exc:
         raise ProviderFetchError(str(exc)) from exc
 
+
+def iter_provider_payload(provider: str, fallback: List[dict]) -> Iterator[dict]:
+    """Like :func:`fetch_provider_payload`, yielding entries while the body is still being read."""
+
+    provider_key = provider.lower()
+    url = provider_url(provider_key)
+
+    if not url:
+        yield from fallback
+        return
+
+    with _open_url(url, provider_timeout(provider_key)) as response:
+        yield from _stream_entries(_read_chunks(response))
+
+
+def fetch_provider_payload(provider: str, fallback: List[dict]) -> List[dict]:
+    """Fetch provider data from a remote API or return the fallback sample."""
+
+    return list(iter_provider_payload(provider, fallback))
+
+
+class ProviderResponse:
+    """Entries from one provider fetch plus the validators to revalidate them with."""
+
+    def __init__(
+        self,
+        entries: List[dict],
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        not_modified: bool = False,
+    ) -> None:
+        self.entries = entries
+        self.etag = etag
+        self.last_modified = last_modified
+        self.not_modified = not_modified
+
+
+class ProviderClient:
+    """Async provider fetcher sharing one pooled HTTP client across requests.
+
+    Each provider gets its own timeout (see :func:`provider_timeout`) and at
+    most ``max_concurrency`` requests in flight. Connection errors, timeouts
+    and 429/5xx responses are retried ``retries`` times with exponential
+    backoff starting at ``backoff`` seconds.
+    """
+
+    def __init__(
+        self,
+        retries: int = DEFAULT_RETRIES,
+        backoff: float = 0.2,
+        max_concurrency: int = DEFAULT_CONCURRENCY,
+        max_connections: int = 20,
+    ) -> None:
+        self.retries = max(0, retries)
+        self.backoff = backoff
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_connections = max_connections
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._limits: Dict[str, asyncio.Semaphore] = {}
+
+    def _session(self) -> httpx.AsyncClient:
+        # the pool and semaphores belong to one event loop; rebuild them if the loop changes
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections)
+            )
+            self._loop = loop
+            self._limits = {}
+        return self._client
+
+    def _limit(self, provider: str) -> asyncio.Semaphore:
+        if provider not in self._limits:
+            self._limits[provider] = asyncio.Semaphore(self.max_concurrency)
+        return self._limits[provider]
+
+    async def fetch(self, provider: str, fallback: List[dict]) -> List[dict]:
+        """Async :func:`fetch_provider_payload`; raises :class:`ProviderFetchError` once retries run out."""
+
+        return (await self.fetch_conditional(provider, fallback)).entries
+
+    async def stream(self, provider: str, fallback: List[dict]) -> AsyncIterator[dict]:
+        """Yield the provider's entries while the body streams in, keeping memory flat for large payloads."""
+
+        provider_key = provider.lower()
+        url = provider_url(provider_key)
+        if not url:
+            for entry in fallback:
+                yield entry
+            return
+
+        timeout = provider_timeout(provider_key)
+        if not url.startswith(("http://", "https://")):
+            response = await asyncio.to_thread(_open_url, url, timeout)
+            try:
+                async for entry in _entries_from(_threaded_chunks(response)):
+                    yield entry
+            finally:
+                response.close()
+            return
+
+        session = self._session()
+        async with self._limit(provider_key):
+            response = await self._open(session, url, timeout, {})
+            try:
+                async for entry in _entries_from(_http_chunks(response, timeout)):
+                    yield entry
+            finally:
+                await response.aclose()
+
+    async def fetch_conditional(
+        self,
+        provider: str,
+        fallback: List[dict],
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> ProviderResponse:
+        """Like :meth:`fetch`, sending ``etag``/``last_modified`` as conditional request headers.
+
+        A 304 reply comes back with ``not_modified`` set and no entries.
+        """
+
+        provider_key = provider.lower()
+        url = provider_url(provider_key)
+        if not url:
+            return ProviderResponse(fallback)
+        if not url.startswith(("http://", "https://")):
+            return ProviderResponse(await asyncio.to_thread(fetch_provider_payload, provider_key, fallback))
+
+        headers: Dict[str, str] = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        session = self._session()
+        timeout = provider_timeout(provider_key)
+        async with self._limit(provider_key):
+            response = await self._open(session, url, timeout, headers)
+            try:
+                etag = response.headers.get("ETag", etag)
+                last_modified = response.headers.get("Last-Modified", last_modified)
+                if response.status_code == 304:
+                    return ProviderResponse([], etag, last_modified, not_modified=True)
+                entries = [entry async for entry in _entries_from(_http_chunks(response, timeout))]
+            finally:
+                await response.aclose()
+        return ProviderResponse(entries, etag, last_modified)
+
+    async def _open(
+        self, session: httpx.AsyncClient, url: str, timeout: float, headers: Dict[str, str]
+    ) -> httpx.Response:
+        """Send the request and return once headers arrive; the caller reads and closes the body."""
+
+        attempt = 0
+        while True:
+            try:
+                request = session.build_request("GET", url, headers=headers, timeout=timeout)
+                response = await session.send(request, stream=True)
+                if response.status_code not in _RETRY_STATUSES:
+                    if response.is_error:
+                        await response.aclose()
+                        raise ProviderFetchError(f"Provider returned HTTP {response.status_code}")
+                    return response
+                await response.aclose()
+                error: Exception = ProviderFetchError(f"Provider returned HTTP {response.status_code}")
+            except httpx.TimeoutException as exc:
+                error = ProviderFetchError(f"Provider timed out after {timeout:g}s")
+                error.__cause__ = exc
+            except httpx.TransportError as exc:
+                error = ProviderFetchError(str(exc) or type(exc).__name__)
+                error.__cause__ = exc
+
+            if attempt >= self.retries:
+                raise error
+            await asyncio.sleep(self.backoff * 2**attempt)
+            attempt += 1
+
+    async def aclose(self) -> None:
+        client, self._client = self._client, None
+        if client is not None and self._loop is asyncio.get_running_loop():
+            await client.aclose()
+
+
+async def _http_chunks(response: httpx.Response, timeout: float) -> AsyncIterator[bytes]:
     try:
-        payload: Any = json.loads(body)
-    except json.JSONDecodeError as exc:
-        raise ProviderFetchError("Invalid JSON from provider") from exc
+        async for chunk in response.aiter_bytes(CHUNK_SIZE):
+            yield chunk
+    except httpx.TimeoutException as exc:
+        raise ProviderFetchError(f"Provider timed out after {timeout:g}s") from exc
+    except httpx.TransportError as exc:
+        raise ProviderFetchError(str(exc) or type(exc).__name__) from exc
 
-    if isinstance(payload, list):
-        return [entry for entry in payload if isinstance(entry, dict)]
 
-    if isinstance(payload, dict):
-        entries = payload.get("entries")
-        if isinstance(entries, list):
-            return [entry for entry in entries if isinstance(entry, dict)]
+async def _threaded_chunks(response: Any) -> AsyncIterator[bytes]:
+    chunks = _read_chunks(response)
+    while True:
+        chunk = await asyncio.to_thread(next, chunks, b"")
+        if not chunk:
+            return
+        yield chunk
 
-    raise ProviderFetchError("Provider response is not a list of entries")
+
+async def _entries_from(chunks: AsyncIterator[bytes]) -> AsyncIterator[dict]:
+    parser = EntryStreamParser()
+    try:
+        async for chunk in chunks:
+            for entry in parser.feed(chunk):
+                yield entry
+        for entry in parser.close():
+            yield entry
+    except EntryStreamError as exc:
+        raise ProviderFetchError(str(exc)) from exc
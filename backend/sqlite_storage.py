@@ -0,0 +1,291 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from . import storage
+from .storage import StorageBackend
+from .wellness_store import parse_timestamp
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS schedules (
+    profile_hash TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    updated_at REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS wellness (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    source TEXT,
+    payload TEXT NOT NULL,
+    profile_hash TEXT NOT NULL DEFAULT '',
+    epoch REAL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+# the retention limits are enforced every this many schedule writes
+_PRUNE_EVERY = 64
+
+
+def _default_db_path() -> Path:
+    configured = os.getenv("DAWAR_POWER_SQLITE_PATH")
+    if configured:
+        return Path(configured)
+    return storage._STORAGE_PATH.with_suffix(".sqlite3")
+
+
+# the row id doubles as the entry's sequence number; a NULL id takes the next one
+_INSERT_WELLNESS = (
+    "INSERT INTO wellness (id, timestamp, source, payload, profile_hash, epoch) VALUES (?, ?, ?, ?, ?, ?)"
+)
+
+
+def _epoch(timestamp: Any) -> Optional[float]:
+    # the raw text mixes offsets and formats, so ranges compare parsed epoch seconds instead
+    try:
+        return parse_timestamp(str(timestamp))
+    except ValueError:
+        return None
+
+
+def _wellness_row(
+    entry: Dict[str, Any], keep_seq: bool = True
+) -> Tuple[Optional[int], str, Optional[str], str, str, Optional[float]]:
+    return (
+        (storage.wellness_seq(entry) or None) if keep_seq else None,
+        str(entry.get("timestamp", "")),
+        entry.get("source"),
+        json.dumps(entry, separators=(",", ":")),
+        storage.wellness_profile(entry),
+        _epoch(entry.get("timestamp")),
+    )
+
+
+def _wellness_entry(row: Tuple[int, str]) -> Dict[str, Any]:
+    entry = json.loads(row[1])
+    entry["seq"] = row[0]
+    return entry
+
+
+class SqliteStorageBackend(StorageBackend):
+    """SQLite (WAL mode) engine with one connection per worker thread."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self.evictions = 0
+        self._writes_since_prune = 0
+        connection = self._connection()
+        connection.executescript(_SCHEMA)
+        columns = {row[1] for row in connection.execute("PRAGMA table_info(schedules)")}
+        if "updated_at" not in columns:
+            connection.execute("ALTER TABLE schedules ADD COLUMN updated_at REAL NOT NULL DEFAULT 0")
+        connection.execute("CREATE INDEX IF NOT EXISTS schedules_updated_at ON schedules (updated_at)")
+        columns = {row[1] for row in connection.execute("PRAGMA table_info(wellness)")}
+        if "profile_hash" not in columns:
+            connection.execute("ALTER TABLE wellness ADD COLUMN profile_hash TEXT NOT NULL DEFAULT ''")
+        connection.execute("CREATE INDEX IF NOT EXISTS wellness_profile ON wellness (profile_hash, id)")
+        if "epoch" not in columns:
+            with connection:
+                connection.execute("ALTER TABLE wellness ADD COLUMN epoch REAL")
+                rows = connection.execute("SELECT id, timestamp FROM wellness").fetchall()
+                connection.executemany(
+                    "UPDATE wellness SET epoch = ? WHERE id = ?", [(_epoch(stamp), row_id) for row_id, stamp in rows]
+                )
+        # the old (timestamp, source) text index served no query
+        connection.execute("DROP INDEX IF EXISTS wellness_timestamp_source")
+        connection.execute("CREATE INDEX IF NOT EXISTS wellness_profile_epoch ON wellness (profile_hash, epoch)")
+        with connection:
+            self._prune(connection)
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            with self._connections_lock:
+                self._connections.append(connection)
+        return connection
+
+    def get_schedule(self, key: str) -> Optional[Dict[str, Any]]:
+        row = self._connection().execute(
+            "SELECT payload FROM schedules WHERE profile_hash = ?", (key,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put_schedule(self, key: str, payload: Dict[str, Any]) -> None:
+        self.write_batch({key: payload}, [])
+
+    def append_wellness(self, entries: Iterable[Dict[str, Any]]) -> None:
+        rows = [_wellness_row(entry) for entry in entries]
+        if not rows:
+            return
+        with self._connection() as connection:
+            connection.executemany(_INSERT_WELLNESS, rows)
+
+    def recent_wellness(self, limit: int, profile: Optional[str] = None) -> List[Dict[str, Any]]:
+        if limit <= 0:
+            return []
+        if profile is None:
+            rows = self._connection().execute(
+                "SELECT id, payload FROM wellness ORDER BY id DESC LIMIT ?", (limit,)
+            ).fetchall()
+        else:
+            rows = self._connection().execute(
+                "SELECT id, payload FROM wellness WHERE profile_hash = ? ORDER BY id DESC LIMIT ?", (profile, limit)
+            ).fetchall()
+        return [_wellness_entry(row) for row in reversed(rows)]
+
+    def wellness_since(
+        self, since: int, limit: int, profile: Optional[str] = None, until: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        if limit <= 0:
+            return []
+        clauses, params = ["id > ?"], [since]
+        if until is not None:
+            clauses.append("id <= ?")
+            params.append(until)
+        if profile is not None:
+            clauses.append("profile_hash = ?")
+            params.append(profile)
+        rows = self._connection().execute(
+            f"SELECT id, payload FROM wellness WHERE {' AND '.join(clauses)} ORDER BY id LIMIT ?", (*params, limit)
+        ).fetchall()
+        return [_wellness_entry(row) for row in rows]
+
+    def wellness_between(
+        self,
+        profile: str,
+        start: Optional[float],
+        end: Optional[float],
+        limit: Optional[int],
+        source: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        if limit is not None and limit <= 0:
+            return []
+        clauses, params = ["profile_hash = ?", "epoch IS NOT NULL"], [profile]
+        if start is not None:
+            clauses.append("epoch >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("epoch <= ?")
+            params.append(end)
+        if source is not None:
+            clauses.append("COALESCE(source, '') = ?")
+            params.append(source)
+        rows = self._connection().execute(
+            f"SELECT id, payload FROM wellness WHERE {' AND '.join(clauses)} ORDER BY epoch DESC, id DESC LIMIT ?",
+            (*params, -1 if limit is None else limit),
+        ).fetchall()
+        return [_wellness_entry(row) for row in reversed(rows)]
+
+    def wellness_keys(self, profile: str) -> List[Tuple[str, float]]:
+        rows = self._connection().execute(
+            "SELECT source, epoch FROM wellness WHERE profile_hash = ? AND epoch IS NOT NULL", (profile,)
+        ).fetchall()
+        return [(source or "", epoch) for source, epoch in rows]
+
+    def last_wellness_seq(self) -> int:
+        (seq,) = self._connection().execute("SELECT MAX(id) FROM wellness").fetchone()
+        return seq or 0
+
+    def write_batch(self, schedules: Dict[str, Dict[str, Any]], wellness: List[Dict[str, Any]]) -> None:
+        now = time.time()
+        with self._connection() as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO schedules (profile_hash, payload, updated_at) VALUES (?, ?, ?)",
+                [(key, json.dumps(payload, separators=(",", ":")), now) for key, payload in schedules.items()],
+            )
+            connection.executemany(_INSERT_WELLNESS, [_wellness_row(entry) for entry in wellness])
+            self._writes_since_prune += len(schedules)
+            if self._writes_since_prune >= _PRUNE_EVERY:
+                self._prune(connection)
+
+    def _prune(self, connection: sqlite3.Connection) -> None:
+        self._writes_since_prune = 0
+        removed = 0
+        if storage.SCHEDULE_MAX_AGE_DAYS > 0:
+            cutoff = time.time() - storage.SCHEDULE_MAX_AGE_DAYS * 86400
+            removed += connection.execute("DELETE FROM schedules WHERE updated_at < ?", (cutoff,)).rowcount
+        if storage.SCHEDULE_MAX_STORED > 0:
+            removed += connection.execute(
+                "DELETE FROM schedules WHERE profile_hash IN "
+                "(SELECT profile_hash FROM schedules ORDER BY updated_at DESC LIMIT -1 OFFSET ?)",
+                (storage.SCHEDULE_MAX_STORED,),
+            ).rowcount
+        self.evictions += removed
+
+    def schedule_stats(self) -> Dict[str, int]:
+        (size,) = self._connection().execute("SELECT COUNT(*) FROM schedules").fetchone()
+        return {"size": size, "evictions": self.evictions}
+
+    def is_migrated(self) -> bool:
+        row = self._connection().execute("SELECT value FROM meta WHERE key = 'migrated_from'").fetchone()
+        return row is not None
+
+    def close(self) -> None:
+        with self._connections_lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+
+def migrate_json_to_sqlite(backend: SqliteStorageBackend) -> Tuple[int, int]:
+    """Copy ``storage.json`` (plus its journal) into ``backend`` exactly once.
+
+    Returns the number of schedules and wellness entries copied; a database
+    that was already migrated is left untouched and reports ``(0, 0)``.
+    """
+
+    if backend.is_migrated():
+        return 0, 0
+    schedules, wellness = storage.load_storage()
+    now = time.time()
+    schedule_rows = [
+        (key, json.dumps(payload, separators=(",", ":")), now)
+        for key, payload in schedules.items()
+        if isinstance(payload, dict)
+    ]
+    entries = [entry for entry in wellness if isinstance(entry, dict)]
+    with backend._connection() as connection:
+        connection.executemany(
+            "INSERT OR REPLACE INTO schedules (profile_hash, payload, updated_at) VALUES (?, ?, ?)",
+            schedule_rows,
+        )
+        # renumbered in file order: entries written before sequencing have no seq to keep
+        connection.executemany(_INSERT_WELLNESS, [_wellness_row(entry, keep_seq=False) for entry in entries])
+        connection.execute(
+            "INSERT INTO meta (key, value) VALUES ('migrated_from', ?)", (str(storage._STORAGE_PATH),)
+        )
+    return len(schedule_rows), len(entries)
+
+
+def open_sqlite_backend(path: Optional[Path] = None) -> SqliteStorageBackend:
+    backend = SqliteStorageBackend(path or _default_db_path())
+    migrate_json_to_sqlite(backend)
+    return backend
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Migrate storage.json into the SQLite store")
+    parser.add_argument("--db", type=Path, default=None, help="Database path (defaults to DAWAR_POWER_SQLITE_PATH)")
+    args = parser.parse_args()
+
+    target = SqliteStorageBackend(args.db or _default_db_path())
+    copied = migrate_json_to_sqlite(target)
+    print(f"Migrated {copied[0]} schedules and {copied[1]} wellness entries into {target.path}")
@@ -1,29 +1,772 @@
 import json
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
 
-_STORAGE_PATH = Path(__file__).with_name("storage.json")
+from .wellness_archive import WellnessArchive
+from .wellness_store import parse_timestamp
 
+_STORAGE_PATH = Path(os.getenv("DAWAR_POWER_STORAGE_PATH") or Path(__file__).with_name("storage.json"))
 
-def load_storage() -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
-    if not _STORAGE_PATH.exists():
-        return {}, []
+WELLNESS_CAP = 200
+JOURNAL_COMPACT_BYTES = int(os.getenv("DAWAR_POWER_JOURNAL_MAX_BYTES", str(1024 * 1024)))
+# stored schedules past either limit are evicted oldest-write first; 0 disables a limit
+SCHEDULE_MAX_STORED = int(os.getenv("DAWAR_POWER_SCHEDULE_MAX_STORED", "50000"))
+SCHEDULE_MAX_AGE_DAYS = float(os.getenv("DAWAR_POWER_SCHEDULE_MAX_AGE_DAYS", "0"))
+
+logger = logging.getLogger(__name__)
+
+_journal_lock = threading.Lock()
+_compaction_lock = threading.Lock()
+_compactor: Optional[threading.Thread] = None
+
+
+def _journal_path() -> Path:
+    return _STORAGE_PATH.with_suffix(".journal")
+
+
+def _pending_journal_path() -> Path:
+    return _STORAGE_PATH.with_name(f"{_STORAGE_PATH.stem}.journal.compacting")
+
+
+def _backup_path() -> Path:
+    return _STORAGE_PATH.with_name(f"{_STORAGE_PATH.name}.bak")
+
+
+def _archive_path() -> Path:
+    configured = os.getenv("DAWAR_POWER_WELLNESS_ARCHIVE_PATH")
+    return Path(configured) if configured else _STORAGE_PATH.with_name(f"{_STORAGE_PATH.stem}.archive")
+
+
+_archives: Dict[Path, WellnessArchive] = {}
+_archives_lock = threading.Lock()
+
+
+def wellness_archive() -> WellnessArchive:
+    """Columnar archive that wellness entries trimmed from the snapshot move into."""
+
+    path = _archive_path()
+    with _archives_lock:
+        archive = _archives.get(path)
+        if archive is None:
+            archive = _archives[path] = WellnessArchive(path)
+        return archive
+
+
+_State = Tuple[Dict[str, Any], List[Dict[str, Any]], Dict[str, float]]
+
+
+def wellness_profile(entry: Dict[str, Any]) -> str:
+    """Partition key of a stored wellness entry; entries without a profile share the "" partition."""
+
+    return str(entry.get("profileHash") or "")
+
+
+def wellness_seq(entry: Any) -> int:
+    """Sequence number a stored wellness entry was given; entries from before sequencing count as 0."""
+
+    seq = entry.get("seq") if isinstance(entry, dict) else None
+    return seq if isinstance(seq, int) else 0
+
+
+def _bisect_seq(entries: List[Dict[str, Any]], seq: int, lo: int = 0) -> int:
+    """Index of the first entry after ``seq`` in a list sorted by sequence number.
+
+    ``bisect_right`` only takes ``key=`` from Python 3.10.
+    """
+
+    hi = len(entries)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if wellness_seq(entries[mid]) <= seq:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def _wellness_window(
+    entries: Iterable[Dict[str, Any]],
+    start: Optional[float],
+    end: Optional[float],
+    limit: Optional[int],
+    source: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    seen: Set[Tuple[str, float]] = set()
+    matched: List[Tuple[float, int, Dict[str, Any]]] = []
+    for entry in entries:
+        key = wellness_key(entry)
+        if key is None or key in seen or (source is not None and key[0] != source):
+            continue
+        if (start is None or key[1] >= start) and (end is None or key[1] <= end):
+            seen.add(key)
+            matched.append((key[1], wellness_seq(entry), entry))
+    matched.sort(key=lambda item: item[:2])
+    if limit is None:
+        return [entry for _, _, entry in matched]
+    return [entry for _, _, entry in matched[-limit:]] if limit > 0 else []
+
+
+def _trim_wellness(
+    wellness: List[Dict[str, Any]], dropped: Optional[List[Dict[str, Any]]] = None
+) -> List[Dict[str, Any]]:
+    """Keep the newest ``WELLNESS_CAP`` entries of each profile, in their original order.
+
+    The rest are added to ``dropped`` when it is given.
+    """
+
+    counts: Dict[str, int] = {}
+    kept: List[Dict[str, Any]] = []
+    for entry in reversed(wellness):
+        profile = wellness_profile(entry) if isinstance(entry, dict) else ""
+        count = counts.get(profile, 0)
+        if count < WELLNESS_CAP:
+            counts[profile] = count + 1
+            kept.append(entry)
+        elif dropped is not None:
+            dropped.append(entry)
+    kept.reverse()
+    return kept
+
+
+def _trim_and_archive(wellness: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """:func:`_trim_wellness`, moving what it drops into the archive; archiving twice is harmless."""
+
+    dropped: List[Dict[str, Any]] = []
+    kept = _trim_wellness(wellness, dropped)
+    if dropped:
+        wellness_archive().append(dropped)
+    return kept
+
+
+def wellness_key(entry: Any) -> Optional[Tuple[str, float]]:
+    """(source, epoch timestamp) identifying a stored wellness entry, or None if it has no valid timestamp."""
+
+    if not isinstance(entry, dict):
+        return None
+    try:
+        return str(entry.get("source") or ""), parse_timestamp(str(entry.get("timestamp")))
+    except ValueError:
+        return None
+
+
+def _parse_snapshot(path: Path) -> Optional[_State]:
     try:
-        payload = json.loads(_STORAGE_PATH.read_text(encoding="utf-8"))
-        schedules = payload.get("schedules", {})
-        wellness = payload.get("wellness", [])
-        if not isinstance(schedules, dict):
-            schedules = {}
-        if not isinstance(wellness, list):
-            wellness = []
-        return schedules, wellness
-    except json.JSONDecodeError:
-        return {}, []
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not isinstance(payload, dict):
+        return None
+    schedules = payload.get("schedules", {})
+    wellness = payload.get("wellness", [])
+    if not isinstance(schedules, dict):
+        schedules = {}
+    if not isinstance(wellness, list):
+        wellness = []
+    stamps = payload.get("scheduleUpdatedAt", {})
+    if not isinstance(stamps, dict):
+        stamps = {}
+    now = time.time()
+    updated_at = {key: float(stamps.get(key, now)) for key in schedules}
+    return schedules, wellness, updated_at
+
+
+def _read_snapshot() -> _State:
+    if not _STORAGE_PATH.exists() and not _backup_path().exists():
+        return {}, [], {}
+    snapshot = _parse_snapshot(_STORAGE_PATH)
+    if snapshot is None:
+        logger.warning("%s is unreadable, falling back to %s", _STORAGE_PATH, _backup_path())
+        snapshot = _parse_snapshot(_backup_path())
+    return snapshot or ({}, [], {})
+
+
+def _write_snapshot(body: str) -> None:
+    """Atomically replace the snapshot, keeping the previous one as a backup.
+
+    Callers hold ``_journal_lock`` so two writers never race on the temp file.
+    """
+
+    temp_path = _STORAGE_PATH.with_name(f"{_STORAGE_PATH.name}.tmp")
+    with temp_path.open("w", encoding="utf-8") as handle:
+        handle.write(body)
+        handle.flush()
+        os.fsync(handle.fileno())
+    if _STORAGE_PATH.exists():
+        os.replace(_STORAGE_PATH, _backup_path())
+    os.replace(temp_path, _STORAGE_PATH)
+    if hasattr(os, "O_DIRECTORY"):
+        directory = os.open(_STORAGE_PATH.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
+
+
+def _replay_journal(path: Path, state: _State) -> None:
+    schedules, wellness, updated_at = state
+    if not path.exists():
+        return
+    with path.open(encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # a torn tail write from a crash; everything before it is intact
+                continue
+            if not isinstance(record, dict):
+                continue
+            kind = record.get("type")
+            key = record.get("key")
+            if kind == "schedule_delete" and isinstance(key, str):
+                schedules.pop(key, None)
+                updated_at.pop(key, None)
+                continue
+            if not isinstance(record.get("payload"), dict):
+                continue
+            if kind == "schedule" and isinstance(key, str):
+                # re-inserting keeps the dict ordered oldest write first
+                schedules.pop(key, None)
+                schedules[key] = record["payload"]
+                updated_at[key] = float(record.get("at", time.time()))
+            elif kind == "wellness":
+                wellness.append(record["payload"])
+
+
+def _encode_snapshot(
+    schedules: Dict[str, Any], wellness: List[Dict[str, Any]], updated_at: Optional[Dict[str, float]] = None
+) -> str:
+    # entries past the per-profile cap are archived before the snapshot that drops them is written
+    payload: Dict[str, Any] = {"schedules": schedules, "wellness": _trim_and_archive(wellness)}
+    if updated_at:
+        payload["scheduleUpdatedAt"] = updated_at
+    return json.dumps(payload, indent=2)
+
+
+def _load_state() -> _State:
+    with _journal_lock:
+        state = _read_snapshot()
+        _replay_journal(_pending_journal_path(), state)
+        _replay_journal(_journal_path(), state)
+    state[1][:] = _trim_and_archive(state[1])
+    return state
+
+
+def load_storage() -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Return the snapshot with any journaled records replayed on top."""
+
+    schedules, wellness, _ = _load_state()
+    return schedules, wellness
 
 
 def save_storage(schedules: Dict[str, Any], wellness: List[Dict[str, Any]]) -> None:
-    payload = {
-        "schedules": schedules,
-        "wellness": wellness[-200:],  # keep cap
-    }
-    _STORAGE_PATH.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    """Write a full snapshot, superseding anything in the journal."""
+
+    body = _encode_snapshot(schedules, wellness)
+    with _journal_lock:
+        _write_snapshot(body)
+        for path in (_journal_path(), _pending_journal_path()):
+            if path.exists():
+                path.unlink()
+
+
+def append_records(records: Iterable[Dict[str, Any]]) -> None:
+    lines = "".join(json.dumps(record, separators=(",", ":")) + "\n" for record in records)
+    if not lines:
+        return
+    with _journal_lock:
+        journal = _journal_path()
+        with journal.open("a", encoding="utf-8") as handle:
+            handle.write(lines)
+        size = journal.stat().st_size
+    if size >= JOURNAL_COMPACT_BYTES:
+        _start_compaction()
+
+
+def append_schedule(key: str, payload: Dict[str, Any]) -> None:
+    append_records([{"type": "schedule", "key": key, "payload": payload, "at": time.time()}])
+
+
+def append_wellness(entries: Iterable[Dict[str, Any]]) -> None:
+    append_records({"type": "wellness", "payload": entry} for entry in entries)
+
+
+def compact_storage() -> None:
+    """Fold the journal into the snapshot file.
+
+    The live journal is rotated aside first so appends keep flowing while the
+    snapshot is rebuilt; only the final write and cleanup hold the journal lock.
+    """
+
+    with _compaction_lock:
+        pending = _pending_journal_path()
+        with _journal_lock:
+            journal = _journal_path()
+            if not pending.exists():
+                if not journal.exists():
+                    return
+                journal.replace(pending)
+
+        state = _read_snapshot()
+        _replay_journal(pending, state)
+        body = _encode_snapshot(*state)
+
+        with _journal_lock:
+            _write_snapshot(body)
+            pending.unlink()
+
+
+def _start_compaction() -> None:
+    global _compactor
+    if _compactor is not None and _compactor.is_alive():
+        return
+    _compactor = threading.Thread(target=compact_storage, name="storage-compactor", daemon=True)
+    _compactor.start()
+
+
+class StorageBackend(ABC):
+    """Persistence engine behind the schedule and wellness endpoints."""
+
+    @abstractmethod
+    def get_schedule(self, key: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def put_schedule(self, key: str, payload: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def append_wellness(self, entries: Iterable[Dict[str, Any]]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def recent_wellness(self, limit: int, profile: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Newest ``limit`` entries oldest first, from one profile's partition when ``profile`` is given."""
+
+        raise NotImplementedError
+
+    @abstractmethod
+    def wellness_since(
+        self, since: int, limit: int, profile: Optional[str] = None, until: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Up to ``limit`` entries with ``since < seq <= until``, lowest sequence first."""
+
+        raise NotImplementedError
+
+    @abstractmethod
+    def wellness_between(
+        self,
+        profile: str,
+        start: Optional[float],
+        end: Optional[float],
+        limit: Optional[int],
+        source: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Newest ``limit`` of ``profile``'s entries with ``start <= timestamp <= end`` (epoch seconds), oldest first.
+
+        Archived entries count too; ``limit=None`` returns every one in range.
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    def last_wellness_seq(self) -> int:
+        """Highest sequence number stored so far, 0 for none."""
+
+        raise NotImplementedError
+
+    @abstractmethod
+    def wellness_keys(self, profile: str) -> List[Tuple[str, float]]:
+        """(source, epoch timestamp) of every entry stored for ``profile``, archived ones included."""
+
+        raise NotImplementedError
+
+    def write_batch(self, schedules: Dict[str, Dict[str, Any]], wellness: List[Dict[str, Any]]) -> None:
+        for key, payload in schedules.items():
+            self.put_schedule(key, payload)
+        self.append_wellness(wellness)
+
+    @abstractmethod
+    def schedule_stats(self) -> Dict[str, int]:
+        """Stored schedule count and how many the retention limits have evicted."""
+
+        raise NotImplementedError
+
+    def flush(self) -> None:
+        return None
+
+    def close(self) -> None:
+        return None
+
+
+class JsonStorageBackend(StorageBackend):
+    """The journaled ``storage.json`` file, kept in memory as raw dicts."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.evictions = 0
+        # _schedules is ordered oldest write first, which is the eviction order
+        self._schedules, self._wellness, self._updated_at = _load_state()
+        # every entry of the flat list by profile, in sequence order; archived ones are in neither
+        self._wellness_by_profile: Dict[str, List[Dict[str, Any]]] = {}
+        # (source, epoch timestamp) of each of those entries, parsed once as they arrive
+        self._wellness_keys: Dict[str, List[Optional[Tuple[str, float]]]] = {}
+        for entry in self._wellness:
+            self._add_to_profile(entry)
+        # entries past their profile's cap, archived at the next trim
+        self._wellness_stale = 0
+        with self._lock:
+            evicted = self._evict_schedules(time.time())
+        append_records({"type": "schedule_delete", "key": key} for key in evicted)
+
+    def _add_to_profile(self, entry: Dict[str, Any]) -> int:
+        profile = wellness_profile(entry)
+        partition = self._wellness_by_profile.setdefault(profile, [])
+        partition.append(entry)
+        self._wellness_keys.setdefault(profile, []).append(wellness_key(entry))
+        return len(partition)
+
+    def _evict_schedules(self, now: float) -> List[str]:
+        max_age = SCHEDULE_MAX_AGE_DAYS * 86400
+        evicted: List[str] = []
+        while self._schedules:
+            oldest = next(iter(self._schedules))
+            too_many = 0 < SCHEDULE_MAX_STORED < len(self._schedules)
+            too_old = max_age > 0 and now - self._updated_at.get(oldest, now) > max_age
+            if not (too_many or too_old):
+                break
+            del self._schedules[oldest]
+            self._updated_at.pop(oldest, None)
+            evicted.append(oldest)
+        self.evictions += len(evicted)
+        return evicted
+
+    def get_schedule(self, key: str) -> Optional[Dict[str, Any]]:
+        return self._schedules.get(key)
+
+    def put_schedule(self, key: str, payload: Dict[str, Any]) -> None:
+        self.write_batch({key: payload}, [])
+
+    def append_wellness(self, entries: Iterable[Dict[str, Any]]) -> None:
+        self.write_batch({}, list(entries))
+
+    def recent_wellness(self, limit: int, profile: Optional[str] = None) -> List[Dict[str, Any]]:
+        if limit <= 0:
+            return []
+        with self._lock:
+            if profile is None:
+                return self._wellness[-limit:]
+            return self._wellness_by_profile.get(profile, [])[-limit:]
+
+    def wellness_since(
+        self, since: int, limit: int, profile: Optional[str] = None, until: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        if limit <= 0:
+            return []
+        with self._lock:
+            # entries are appended in sequence order, so both lists stay sorted by seq
+            entries = self._wellness if profile is None else self._wellness_by_profile.get(profile, [])
+            lo = _bisect_seq(entries, since)
+            hi = len(entries) if until is None else _bisect_seq(entries, until, lo)
+            return entries[lo : min(hi, lo + limit)]
+
+    def wellness_between(
+        self,
+        profile: str,
+        start: Optional[float],
+        end: Optional[float],
+        limit: Optional[int],
+        source: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        with self._lock:
+            entries = list(self._wellness_by_profile.get(profile, []))
+        archived = wellness_archive().metrics(profile, start, end, source, limit, newest=True)
+        # a trim archives entries just before they leave the lists, so the live copy wins
+        return _wellness_window(entries + archived, start, end, limit, source)
+
+    def last_wellness_seq(self) -> int:
+        with self._lock:
+            return wellness_seq(self._wellness[-1]) if self._wellness else 0
+
+    def wellness_keys(self, profile: str) -> List[Tuple[str, float]]:
+        with self._lock:
+            keys = [key for key in self._wellness_keys.get(profile, []) if key is not None]
+        keys.extend(wellness_archive().keys(profile))
+        return keys
+
+    def write_batch(self, schedules: Dict[str, Dict[str, Any]], wellness: List[Dict[str, Any]]) -> None:
+        now = time.time()
+        with self._lock:
+            for key, payload in schedules.items():
+                self._schedules.pop(key, None)
+                self._schedules[key] = payload
+                self._updated_at[key] = now
+            evicted = self._evict_schedules(now) if schedules else []
+            self._wellness.extend(wellness)
+            for entry in wellness:
+                if self._add_to_profile(entry) > WELLNESS_CAP:
+                    self._wellness_stale += 1
+            if self._wellness_stale > len(self._wellness) // 2:
+                dropped: List[Dict[str, Any]] = []
+                kept = _trim_wellness(self._wellness, dropped)
+                # archived before they leave memory, so their keys and readings stay visible
+                wellness_archive().append(dropped)
+                self._wellness = kept
+                for profile, partition in self._wellness_by_profile.items():
+                    excess = max(0, len(partition) - WELLNESS_CAP)
+                    del partition[:excess]
+                    del self._wellness_keys[profile][:excess]
+                self._wellness_stale = 0
+            # journaled under the same lock, so replay applies writes in the order memory saw them
+            records: List[Dict[str, Any]] = [
+                {"type": "schedule", "key": key, "payload": payload, "at": now} for key, payload in schedules.items()
+            ]
+            records.extend({"type": "schedule_delete", "key": key} for key in evicted)
+            records.extend({"type": "wellness", "payload": entry} for entry in wellness)
+            append_records(records)
+
+    def schedule_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"size": len(self._schedules), "evictions": self.evictions}
+
+
+class WriteBehindStorage(StorageBackend):
+    """Buffers writes in memory and hands them to ``inner`` in coalesced batches.
+
+    A background thread flushes every ``interval`` seconds, or sooner once
+    ``max_dirty`` records are waiting. Reads see buffered writes immediately.
+    """
+
+    def __init__(self, inner: StorageBackend, interval: float = 1.0, max_dirty: int = 100) -> None:
+        self.inner = inner
+        self.interval = interval
+        self.max_dirty = max_dirty
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._pending_schedules: Dict[str, Dict[str, Any]] = {}
+        self._pending_wellness: List[Dict[str, Any]] = []
+        self._flushing_schedules: Dict[str, Dict[str, Any]] = {}
+        self._flusher = threading.Thread(target=self._run, name="storage-flusher", daemon=True)
+        self._flusher.start()
+
+    def _mark_dirty(self) -> None:
+        if len(self._pending_schedules) + len(self._pending_wellness) >= self.max_dirty:
+            self._wake.set()
+
+    def get_schedule(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            for pending in (self._pending_schedules, self._flushing_schedules):
+                if key in pending:
+                    return pending[key]
+        return self.inner.get_schedule(key)
+
+    def put_schedule(self, key: str, payload: Dict[str, Any]) -> None:
+        with self._lock:
+            self._pending_schedules[key] = payload
+            self._mark_dirty()
+
+    def append_wellness(self, entries: Iterable[Dict[str, Any]]) -> None:
+        with self._lock:
+            self._pending_wellness.extend(entries)
+            self._mark_dirty()
+
+    def recent_wellness(self, limit: int, profile: Optional[str] = None) -> List[Dict[str, Any]]:
+        if limit <= 0:
+            return []
+        # waiting out an in-flight flush keeps its entries from showing up twice
+        with self._flush_lock:
+            stored = self.inner.recent_wellness(limit, profile)
+            with self._lock:
+                pending = [
+                    entry
+                    for entry in self._pending_wellness
+                    if profile is None or wellness_profile(entry) == profile
+                ]
+        return (stored + pending)[-limit:]
+
+    def wellness_since(
+        self, since: int, limit: int, profile: Optional[str] = None, until: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        if limit <= 0:
+            return []
+        with self._flush_lock:
+            stored = self.inner.wellness_since(since, limit, profile, until)
+            with self._lock:
+                pending = [
+                    entry
+                    for entry in self._pending_wellness
+                    if wellness_seq(entry) > since
+                    and (until is None or wellness_seq(entry) <= until)
+                    and (profile is None or wellness_profile(entry) == profile)
+                ]
+        return (stored + pending)[:limit]
+
+    def wellness_between(
+        self,
+        profile: str,
+        start: Optional[float],
+        end: Optional[float],
+        limit: Optional[int],
+        source: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        with self._flush_lock:
+            stored = self.inner.wellness_between(profile, start, end, limit, source)
+            with self._lock:
+                pending = [entry for entry in self._pending_wellness if wellness_profile(entry) == profile]
+        return _wellness_window(stored + pending, start, end, limit, source)
+
+    def last_wellness_seq(self) -> int:
+        with self._lock:
+            if self._pending_wellness:
+                return wellness_seq(self._pending_wellness[-1])
+        return self.inner.last_wellness_seq()
+
+    def wellness_keys(self, profile: str) -> List[Tuple[str, float]]:
+        with self._flush_lock:
+            keys = self.inner.wellness_keys(profile)
+            with self._lock:
+                pending = [entry for entry in self._pending_wellness if wellness_profile(entry) == profile]
+        keys.extend(key for key in map(wellness_key, pending) if key is not None)
+        return keys
+
+    def schedule_stats(self) -> Dict[str, int]:
+        return self.inner.schedule_stats()
+
+    def flush(self) -> None:
+        """Synchronously write everything buffered so far."""
+
+        with self._flush_lock:
+            with self._lock:
+                self._flushing_schedules, self._pending_schedules = self._pending_schedules, {}
+                wellness, self._pending_wellness = self._pending_wellness, []
+            try:
+                if self._flushing_schedules or wellness:
+                    self.inner.write_batch(self._flushing_schedules, wellness)
+            except Exception:
+                with self._lock:
+                    self._pending_schedules = {**self._flushing_schedules, **self._pending_schedules}
+                    self._pending_wellness = wellness + self._pending_wellness
+                raise
+            finally:
+                with self._lock:
+                    self._flushing_schedules = {}
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:  # pragma: no cover - retried on the next tick
+                logger.exception("Write-behind flush failed")
+
+    def close(self) -> None:
+        self._closed = True
+        self._wake.set()
+        self._flusher.join()
+        self.flush()
+        self.inner.close()
+
+
+class LazyStorage(StorageBackend):
+    """Opens the backend from ``factory`` on first use.
+
+    Importing the app then touches no files and starts no threads, which
+    keeps worker processes that only import it for planning away from the store.
+    """
+
+    def __init__(self, factory: Callable[[], StorageBackend]) -> None:
+        self._factory = factory
+        self._backend: Optional[StorageBackend] = None
+        self._lock = threading.Lock()
+
+    @property
+    def backend(self) -> StorageBackend:
+        if self._backend is None:
+            with self._lock:
+                if self._backend is None:
+                    self._backend = self._factory()
+        return self._backend
+
+    def get_schedule(self, key: str) -> Optional[Dict[str, Any]]:
+        return self.backend.get_schedule(key)
+
+    def put_schedule(self, key: str, payload: Dict[str, Any]) -> None:
+        self.backend.put_schedule(key, payload)
+
+    def append_wellness(self, entries: Iterable[Dict[str, Any]]) -> None:
+        self.backend.append_wellness(entries)
+
+    def recent_wellness(self, limit: int, profile: Optional[str] = None) -> List[Dict[str, Any]]:
+        return self.backend.recent_wellness(limit, profile)
+
+    def wellness_since(
+        self, since: int, limit: int, profile: Optional[str] = None, until: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        return self.backend.wellness_since(since, limit, profile, until)
+
+    def wellness_between(
+        self,
+        profile: str,
+        start: Optional[float],
+        end: Optional[float],
+        limit: Optional[int],
+        source: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        return self.backend.wellness_between(profile, start, end, limit, source)
+
+    def last_wellness_seq(self) -> int:
+        return self.backend.last_wellness_seq()
+
+    def wellness_keys(self, profile: str) -> List[Tuple[str, float]]:
+        return self.backend.wellness_keys(profile)
+
+    def write_batch(self, schedules: Dict[str, Dict[str, Any]], wellness: List[Dict[str, Any]]) -> None:
+        self.backend.write_batch(schedules, wellness)
+
+    def schedule_stats(self) -> Dict[str, int]:
+        return self.backend.schedule_stats()
+
+    def flush(self) -> None:
+        if self._backend is not None:
+            self._backend.flush()
+
+    def close(self) -> None:
+        if self._backend is not None:
+            self._backend.close()
+
+
+def get_storage_backend() -> StorageBackend:
+    """Pick the engine named by ``DAWAR_POWER_STORAGE`` (``json`` or ``sqlite``).
+
+    ``DAWAR_POWER_WRITE_BEHIND=1`` wraps it in a :class:`WriteBehindStorage`
+    tuned by ``DAWAR_POWER_FLUSH_INTERVAL`` and ``DAWAR_POWER_FLUSH_MAX_DIRTY``.
+    """
+
+    engine = os.getenv("DAWAR_POWER_STORAGE", "json").lower()
+    backend: StorageBackend
+    if engine == "sqlite":
+        from .sqlite_storage import open_sqlite_backend
+
+        backend = open_sqlite_backend()
+    elif engine == "json":
+        backend = JsonStorageBackend()
+    else:
+        raise ValueError(f"Unknown storage engine: {engine}")
+
+    if os.getenv("DAWAR_POWER_WRITE_BEHIND", "").lower() in {"1", "true", "yes"}:
+        backend = WriteBehindStorage(
+            backend,
+            interval=float(os.getenv("DAWAR_POWER_FLUSH_INTERVAL", "1.0")),
+            max_dirty=int(os.getenv("DAWAR_POWER_FLUSH_MAX_DIRTY", "100")),
+        )
+    return backend
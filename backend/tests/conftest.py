@@ -0,0 +1,52 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import pytest
+
+# (status, headers, body) for one request, given the request headers
+Reply = Tuple[int, Dict[str, str], bytes]
+
+
+class StubProvider:
+    """Local HTTP server standing in for a wearable provider API."""
+
+    def __init__(self) -> None:
+        self.requests: List[Dict[str, str]] = []
+        self.replies: List[Callable[[Dict[str, str]], Reply]] = []
+        self.default: Optional[Callable[[Dict[str, str]], Reply]] = None
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802
+                headers = dict(self.headers.items())
+                stub.requests.append(headers)
+                reply = stub.replies.pop(0) if stub.replies else stub.default
+                status, extra, body = reply(headers) if reply else (404, {}, b"")
+                self.send_response(status)
+                for name, value in extra.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: object) -> None:
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/"
+
+    def serve(self, entries: object, status: int = 200, headers: Optional[Dict[str, str]] = None) -> None:
+        body = json.dumps(entries).encode("utf-8")
+        self.default = lambda _: (status, headers or {}, body)
+
+
+@pytest.fixture()
+def provider_server() -> Iterator[StubProvider]:
+    stub = StubProvider()
+    thread = threading.Thread(target=stub.server.serve_forever, daemon=True)
+    thread.start()
+    yield stub
+    stub.server.shutdown()
+    stub.server.server_close()
@@ -0,0 +1,20 @@
+from backend.cache import LRUCache
+
+
+def test_lru_cache_evicts_and_expires() -> None:
+    now = [0.0]
+    cache: LRUCache[str, int] = LRUCache(2, ttl=10, clock=lambda: now[0])
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)  # evicts "b", the least recently used
+
+    assert cache.get("b") is None
+    now[0] = 11
+    assert cache.get("a") is None
+
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["expirations"] == 1
+    assert stats["hits"] == 1
+    assert stats["hitRate"] == round(1 / 3, 4)
@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+from backend.entry_stream import EntryStreamError, iter_entries
+
+ENTRIES = [
+    {"timestamp": "2024-10-01T07:00:00Z", "steps": 12345, "sleepHours": 7.25, "comment": "café [brackets] {braces}"},
+    {"timestamp": "2024-10-02T07:00:00Z", "readiness": 81, "nested": {"a": [1, 2, {"b": None}]}},
+]
+
+
+def chunked(text: str, size: int):
+    data = text.encode("utf-8")
+    return [data[index : index + size] for index in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 7, 64, 10_000])
+@pytest.mark.parametrize(
+    "payload",
+    [
+        ENTRIES,
+        {"source": "fitbit", "count": 12345, "meta": {"entries": "not these"}, "entries": ENTRIES, "tail": [1]},
+        [1, "skip", ENTRIES[0], None, ENTRIES[1]],
+    ],
+)
+def test_matches_whole_body_parse(payload, size) -> None:
+    text = json.dumps(payload, indent=1)
+    assert list(iter_entries(chunked(text, size))) == ENTRIES
+
+
+@pytest.mark.parametrize(
+    "text, message",
+    [
+        ("", "Invalid JSON"),
+        ('[{"steps": 1}, {"steps"', "Invalid JSON"),
+        ('{"source": "fitbit"}', "not a list of entries"),
+        ('{"entries": {"steps": 1}}', "not a list of entries"),
+        ('"entries"', "not a list of entries"),
+    ],
+)
+def test_rejects_malformed_payloads(text, message) -> None:
+    with pytest.raises(EntryStreamError, match=message):
+        list(iter_entries(chunked(text, 3)))
+
+
+def test_bad_entry_fails_before_buffering_the_rest() -> None:
+    chunks = (b'[{"steps": 1}, {"steps": ' + b"x" * 1024 for _ in iter(int, 1))
+    stream = iter_entries(chunks, max_entry_bytes=4096)
+    assert next(stream) == {"steps": 1}
+    with pytest.raises(EntryStreamError, match="4096 bytes"):
+        next(stream)
@@ -1,12 +1,16 @@
 import importlib
+import json
 
 import pytest
 from fastapi.testclient import TestClient
 
 
 @pytest.fixture()
-def app_module():
+def app_module(tmp_path, monkeypatch):
     import backend.main as backend_main
+    from backend import storage
+
+    monkeypatch.setattr(storage, "_STORAGE_PATH", tmp_path / "storage.json")
 
     return importlib.reload(backend_main)
 
@@ -83,3 +87,498 @@ def test_coach_recommendation_combines_plans(client: TestClient, app_module) ->
     assert payload["takeaways"], "Expected high-level takeaways for the coach summary"
     assert payload["nextActions"], "Coach actions should surface concrete next steps"
     assert payload["mealPlan"]["rotation"], "Meal rotation should be returned with recommendations"
+
+
+def test_coach_recommendation_in_worker_pool_matches_inline(client: TestClient, app_module, monkeypatch) -> None:
+    recommendation_request = {
+        "schedule": {"goal": "fat_loss", "preferredWindows": ["evening"], "equipmentAccess": ["bands"]},
+        "focusAreas": ["Recovery"],
+    }
+    client.post("/fit/wellness-sync", json={"timestamp": "2024-10-02T07:00:00Z", "sleepHours": 5.5})
+    inline = client.post("/fit/coach/recommendation", json=recommendation_request).json()
+
+    app_module._plan_cache.clear()
+    monkeypatch.setattr(app_module, "COACH_WORKERS", 1)
+    try:
+        pooled = client.post("/fit/coach/recommendation", json=recommendation_request).json()
+        cached = client.post("/fit/coach/recommendation", json=recommendation_request).json()
+        assert app_module._coach_pool is not None
+    finally:
+        app_module.shutdown_coach_pool()
+
+    assert pooled == inline == cached
+    assert any(action["headline"] == "Prioritise sleep hygiene tonight" for action in pooled["nextActions"])
+
+
+def test_coach_workers_plan_from_the_replaced_library(client: TestClient, app_module, monkeypatch) -> None:
+    recommendation_request = {"schedule": {"goal": "maintain", "preferredWindows": ["midday"]}}
+    app_module.replace_meal_library([{**meal, "name": f"Custom {meal['name']}"} for meal in app_module.MEAL_LIBRARY])
+
+    monkeypatch.setattr(app_module, "COACH_WORKERS", 1)
+    try:
+        pooled = client.post("/fit/coach/recommendation", json=recommendation_request).json()
+    finally:
+        app_module.shutdown_coach_pool()
+
+    meals = [meal["name"] for day in pooled["mealPlan"]["days"] for meal in day["meals"]]
+    assert meals and all(name.startswith("Custom ") for name in meals)
+
+
+def test_schedule_round_trip_with_sqlite_engine(tmp_path, monkeypatch) -> None:
+    import backend.main as backend_main
+    from backend import storage
+
+    monkeypatch.setattr(storage, "_STORAGE_PATH", tmp_path / "storage.json")
+    monkeypatch.setenv("DAWAR_POWER_STORAGE", "sqlite")
+    module = importlib.reload(backend_main)
+    client = TestClient(module.app)
+
+    schedule_request = {"goal": "muscle_gain", "preferredWindows": ["evening"], "equipmentAccess": ["full_gym"]}
+    created = client.post("/fit/schedule", json=schedule_request)
+    fetched = client.post("/fit/schedule/fetch", json=schedule_request)
+
+    assert fetched.status_code == 200
+    assert fetched.json() == created.json()
+    assert (tmp_path / "storage.sqlite3").exists()
+    module._storage.close()
+
+
+def test_storage_opens_on_first_use_not_on_import(tmp_path, monkeypatch) -> None:
+    import backend.main as backend_main
+    from backend import storage
+
+    opened = []
+
+    def recording_backend():
+        opened.append(True)
+        return storage.JsonStorageBackend()
+
+    monkeypatch.setattr(storage, "_STORAGE_PATH", tmp_path / "storage.json")
+    monkeypatch.setattr(storage, "get_storage_backend", recording_backend)
+    module = importlib.reload(backend_main)
+    assert not opened
+
+    client = TestClient(module.app)
+    client.post("/fit/wellness-sync", json={"timestamp": "2024-10-02T07:00:00Z", "readiness": 70})
+    assert client.get("/fit/wellness-sync").json()[0]["seq"] == 1
+    assert len(opened) == 1
+    module._storage.close()
+
+
+def test_shutdown_closes_storage_when_cleanup_fails(app_module, monkeypatch) -> None:
+    closed = []
+
+    async def failing_aclose():
+        raise RuntimeError("client already gone")
+
+    monkeypatch.setattr(app_module._provider_client, "aclose", failing_aclose)
+    monkeypatch.setattr(app_module._storage, "close", lambda: closed.append(True))
+    with pytest.raises(RuntimeError):
+        with TestClient(app_module.app):
+            pass
+    assert closed == [True]
+
+
+def test_stored_schedules_hydrate_on_first_fetch(tmp_path, monkeypatch) -> None:
+    import backend.main as backend_main
+    from backend import storage
+
+    monkeypatch.setattr(storage, "_STORAGE_PATH", tmp_path / "storage.json")
+    schedule = {
+        "sessions": [],
+        "notes": {"summary": "Stored", "recoveryTip": "Rest", "mealAlignment": "Balanced"},
+    }
+    storage.save_storage({"abc": schedule, "broken": {"sessions": "nope"}}, [])
+    module = importlib.reload(backend_main)
+    client = TestClient(module.app)
+
+    assert len(module._schedules) == 0
+    response = client.get("/fit/schedule", params={"profileHash": "abc"})
+    assert response.status_code == 200
+    assert response.json()["notes"]["summary"] == "Stored"
+    assert "abc" in module._schedules
+    assert client.get("/fit/schedule", params={"profileHash": "broken"}).status_code == 404
+
+    stats = client.get("/fit/schedule/stats").json()
+    assert stats["cache"]["hits"] == 0
+    assert stats["cache"]["size"] == 1
+    assert stats["stored"]["size"] == 2
+
+
+def test_repeat_schedule_requests_reuse_cached_plan(client: TestClient, app_module, monkeypatch) -> None:
+    writes = []
+    original_put = app_module._storage.put_schedule
+
+    def recording_put(key, payload):
+        writes.append(key)
+        original_put(key, payload)
+
+    monkeypatch.setattr(app_module._storage, "put_schedule", recording_put)
+    schedule_request = {"goal": "maintain", "preferredWindows": ["midday"], "equipmentAccess": ["bands"]}
+
+    first = client.post("/fit/schedule", json=schedule_request).json()
+    second = client.post("/fit/schedule", json=schedule_request).json()
+    assert first == second
+    assert len(writes) == 1
+
+    client.post("/fit/wellness-sync", json={"timestamp": "2024-10-02T07:00:00Z", "readiness": 90})
+    boosted = client.post("/fit/schedule", json=schedule_request).json()
+    assert boosted != first
+    assert len(writes) == 2
+    assert app_module._plan_cache.stats()["hits"] == 1
+
+
+def test_equivalent_meal_plan_requests_share_cached_body(client: TestClient, app_module) -> None:
+    first = client.post("/fit/meal-plan", json={"restrictions": ["Salmon", " nuts "], "days": 2})
+    second = client.post("/fit/meal-plan", json={"restrictions": ["nuts"], "allergies": ["salmon"], "days": 2})
+
+    assert first.status_code == 200
+    assert first.content == second.content
+    assert all("Salmon" not in meal["name"] for day in first.json()["days"] for meal in day["meals"])
+
+    stats = client.get("/fit/meal-plan/stats").json()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_macro_solver_improves_plan_fit(client: TestClient, app_module) -> None:
+    request = {"goal": "fat_loss", "diet": "standard", "days": 3}
+    nearest = client.post("/fit/meal-plan", json=request).json()
+    solved = client.post("/fit/meal-plan", json={**request, "solver": "macro", "solverBudgetMs": 200}).json()
+
+    assert solved["summary"]["fitScore"] > nearest["summary"]["fitScore"]
+    assert solved["summary"]["actualMacros"]["protein"] > nearest["summary"]["actualMacros"]["protein"]
+    assert len(solved["days"]) == 3
+
+
+def test_meal_plan_batch_streams_ndjson_and_dedupes(client: TestClient, app_module) -> None:
+    batch = [
+        {"goal": "fat_loss", "days": 2},
+        {"goal": "muscle_gain", "diet": "vegan"},
+        {"goal": "fat_loss", "days": 2, "restrictions": []},
+    ]
+    response = client.post("/fit/meal-plan/batch", json=batch)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(line["index"] for line in lines) == [0, 1, 2]
+    by_index = {line["index"]: line["plan"] for line in lines}
+    assert by_index[0] == by_index[2]
+    assert by_index[1]["summary"]["diet"] == "vegan"
+    assert app_module._meal_plan_cache.stats()["misses"] == 2
+
+
+def test_schedule_batch_persists_once(client: TestClient, app_module, monkeypatch) -> None:
+    batches = []
+    original_write_batch = app_module._storage.write_batch
+
+    def recording_write_batch(schedules, wellness):
+        batches.append(sorted(schedules))
+        original_write_batch(schedules, wellness)
+
+    monkeypatch.setattr(app_module._storage, "write_batch", recording_write_batch)
+    batch = [
+        {"goal": "maintain", "preferredWindows": ["midday"]},
+        {"goal": "muscle_gain", "equipmentAccess": ["dumbbells"]},
+        {"goal": "maintain", "preferredWindows": ["midday"]},
+        {"goal": "not-a-goal"},
+    ]
+
+    body = client.post("/fit/schedule/batch", json=batch).json()
+    statuses = [item["status"] for item in body["items"]]
+    assert statuses == ["created", "created", "created", "invalid"]
+    assert body["items"][0]["profileHash"] == body["items"][2]["profileHash"]
+    assert body["items"][3]["detail"].startswith("goal")
+    assert body["persisted"] == 2
+    assert len(batches) == 1
+
+    fetched = client.get("/fit/schedule", params={"profileHash": body["items"][1]["profileHash"]})
+    assert fetched.status_code == 200
+
+    repeat = client.post("/fit/schedule/batch", json=batch[:2]).json()
+    assert [item["status"] for item in repeat["items"]] == ["unchanged", "unchanged"]
+    assert repeat["persisted"] == 0
+    assert len(batches) == 1
+
+
+def test_provider_sample_reads_live_url(client: TestClient, provider_server, monkeypatch) -> None:
+    monkeypatch.setenv("DAWAR_POWER_FITBIT_URL", provider_server.url)
+    provider_server.serve([{"timestamp": "2024-10-01T07:00:00Z", "steps": 9100}])
+
+    response = client.get("/fit/wellness-sync/provider/fitbit")
+    assert response.status_code == 200
+    assert response.json()[0]["steps"] == 9100
+    assert response.json()[0]["source"] == "fitbit"
+
+    provider_server.serve({}, status=500)
+    assert client.get("/fit/wellness-sync/provider/fitbit").json()[0]["steps"] == 9100
+    monkeypatch.setenv("DAWAR_POWER_FITBIT_URL", provider_server.url + "moved")
+    assert client.get("/fit/wellness-sync/provider/fitbit").status_code == 502
+
+
+def test_provider_sample_skips_invalid_rows(client: TestClient, provider_server, monkeypatch) -> None:
+    monkeypatch.setenv("DAWAR_POWER_FITBIT_URL", provider_server.url)
+    provider_server.serve(
+        [
+            {"timestamp": "yesterday", "steps": 100},
+            {"timestamp": "2024-10-01T07:00:00Z", "steps": 9100, "source": "someone-else"},
+            "not a row",
+        ]
+    )
+
+    response = client.get("/fit/wellness-sync/provider/fitbit")
+    assert response.status_code == 200
+    assert [(row["steps"], row["source"]) for row in response.json()] == [(9100, "fitbit")]
+
+
+def test_sync_all_imports_every_provider_once(client: TestClient, app_module, provider_server, monkeypatch) -> None:
+    writes = []
+    original_append = app_module._storage.append_wellness
+
+    def recording_append(entries):
+        entries = list(entries)
+        writes.append(len(entries))
+        original_append(entries)
+
+    monkeypatch.setattr(app_module._storage, "append_wellness", recording_append)
+    monkeypatch.setenv("DAWAR_POWER_WHOOP_URL", provider_server.url)
+    provider_server.serve({}, status=404)
+
+    body = client.post("/fit/wellness-sync/sync-all").json()
+    results = {result["provider"]: result for result in body["providers"]}
+    assert set(results) == set(app_module.PROVIDER_SAMPLES)
+    assert results["whoop"]["status"] == "error"
+    assert results["fitbit"]["status"] == "ok"
+    assert results["fitbit"]["imported"] == len(app_module.PROVIDER_SAMPLES["fitbit"])
+    assert body["imported"] == sum(writes) and len(writes) == 1
+
+    again = client.post("/fit/wellness-sync/sync-all").json()
+    assert again["imported"] == 0
+    assert again["duplicates"] == body["imported"]
+    assert len(writes) == 1
+
+
+def test_sync_all_imports_long_exports_in_batches(client: TestClient, app_module, provider_server, monkeypatch) -> None:
+    writes = []
+    original_append = app_module._storage.append_wellness
+
+    def recording_append(entries):
+        entries = list(entries)
+        writes.append(len(entries))
+        original_append(entries)
+
+    monkeypatch.setattr(app_module._storage, "append_wellness", recording_append)
+    monkeypatch.setattr(app_module, "SYNC_IMPORT_BATCH", 4)
+    monkeypatch.setenv("DAWAR_POWER_FITBIT_URL", provider_server.url)
+    entries = [{"timestamp": f"2024-09-{day:02d}T07:00:00Z", "steps": 1000 + day} for day in range(1, 11)]
+    provider_server.serve({"entries": entries})
+
+    body = client.post("/fit/wellness-sync/sync-all").json()
+    results = {result["provider"]: result for result in body["providers"]}
+    assert results["fitbit"]["imported"] == 10
+    # two full fitbit batches on their own, then the remainder with every other provider's entries
+    assert writes[:2] == [4, 4] and len(writes) == 3
+    assert body["imported"] == sum(writes)
+
+    again = client.post("/fit/wellness-sync/sync-all").json()
+    assert again["imported"] == 0 and len(writes) == 3
+
+
+def test_sync_all_skips_invalid_provider_rows(client: TestClient, app_module, provider_server, monkeypatch) -> None:
+    monkeypatch.setenv("DAWAR_POWER_FITBIT_URL", provider_server.url)
+    entries = [
+        {"timestamp": "2024-09-01T07:00:00Z", "steps": 1000},
+        {"timestamp": "yesterday", "steps": 1200},
+        {"timestamp": "2024-09-02T07:00:00Z", "steps": 1100},
+    ]
+    provider_server.serve({"entries": entries})
+
+    body = client.post("/fit/wellness-sync/sync-all").json()
+    fitbit = next(result for result in body["providers"] if result["provider"] == "fitbit")
+    assert fitbit["status"] == "ok"
+    assert (fitbit["fetched"], fitbit["imported"], fitbit["rejected"]) == (3, 2, 1)
+    assert fitbit["errors"][0]["index"] == 1
+    assert body["rejected"] == 1 and body["duplicates"] == 0
+    stored = client.get("/fit/wellness-sync", params={"source": "fitbit"}).json()
+    assert [entry["steps"] for entry in stored] == [1000, 1100]
+
+
+def test_wellness_latest_and_windows_use_timestamps(client: TestClient, app_module) -> None:
+    client.post("/fit/wellness-sync", json={"timestamp": "2024-10-03T07:00:00Z", "readiness": 92, "source": "whoop"})
+    client.post("/fit/wellness-sync", json={"timestamp": "2024-10-01T07:00:00Z", "readiness": 40, "source": "fitbit"})
+    assert app_module._latest_wellness_metric().readiness == 92
+
+    window = client.get("/fit/wellness-sync", params={"start": "2024-10-01T00:00:00Z", "end": "2024-10-02T00:00:00Z"})
+    assert [entry["readiness"] for entry in window.json()] == [40]
+    assert client.get("/fit/wellness-sync", params={"source": "whoop"}).json()[0]["readiness"] == 92
+    assert client.post("/fit/wellness-sync", json={"timestamp": "yesterday"}).status_code == 422
+
+
+def test_wellness_is_partitioned_by_profile(client: TestClient, app_module) -> None:
+    tired = {"goal": "fat_loss", "preferredWindows": ["evening"], "stressLevel": "high"}
+    rested = {"goal": "fat_loss", "preferredWindows": ["midday"], "stressLevel": "high"}
+    tired_hash = client.post("/fit/schedule", json=tired).json()
+    tired_key = app_module._profile_hash(app_module.ScheduleRequest(**tired))
+
+    client.post(
+        "/fit/wellness-sync",
+        json={"timestamp": "2024-10-02T07:00:00Z", "readiness": 40, "sleepHours": 5, "profileHash": tired_key},
+    )
+    tired_plan = client.post("/fit/schedule", json=tired).json()
+    rested_plan = client.post("/fit/schedule", json=rested).json()
+
+    assert tired_plan != tired_hash
+    assert any(session["day"] == "Flex Day" for session in tired_plan["sessions"])
+    assert not any("readiness" in insight.lower() for insight in rested_plan["insights"])
+    assert app_module._latest_wellness_metric(tired_key).readiness == 40
+    assert app_module._latest_wellness_metric() is None
+
+    listed = client.get("/fit/wellness-sync", params={"profileHash": tired_key}).json()
+    assert [entry["readiness"] for entry in listed] == [40]
+    assert client.get("/fit/wellness-sync", params={"profileHash": "someone-else"}).json() == []
+
+
+def test_import_is_idempotent_and_reports_per_item(client: TestClient, app_module, monkeypatch) -> None:
+    writes = []
+    monkeypatch.setattr(app_module, "_persist_wellness", lambda metrics: writes.append(len(metrics)))
+    entries = [
+        {"timestamp": "2024-10-01T07:00:00Z", "steps": 8000},
+        {"timestamp": "2024-10-02T07:00:00Z", "readiness": 77},
+        {"timestamp": "2024-10-02T07:00:00+00:00", "readiness": 77},
+        {"timestamp": "not a date"},
+        {"timestamp": "2024-10-03T07:00:00Z", "readiness": 400},
+        "junk",
+    ]
+
+    first = client.post("/fit/wellness-sync/import", json={"source": "fitbit", "entries": entries}).json()
+    assert (first["accepted"], first["duplicates"], first["rejected"]) == (2, 1, 3)
+    assert [error["index"] for error in first["errors"]] == [3, 4, 5]
+
+    again = client.post("/fit/wellness-sync/import", json={"source": "fitbit", "entries": entries}).json()
+    assert (again["accepted"], again["duplicates"], again["rejected"]) == (0, 3, 3)
+    assert writes == [2]
+    assert client.post("/fit/wellness-sync", json={**entries[0], "source": "fitbit"}).json() == {"status": "duplicate"}
+    assert len(app_module._wellness_partition(None)) == 2
+
+
+def test_wellness_cursor_returns_only_newer_entries(client: TestClient) -> None:
+    for day in range(1, 6):
+        client.post("/fit/wellness-sync", json={"timestamp": f"2024-10-0{day}T07:00:00Z", "steps": day * 1000})
+
+    latest = client.get("/fit/wellness-sync", params={"limit": 2})
+    assert [entry["seq"] for entry in latest.json()] == [4, 5]
+    assert latest.headers["X-Next-Cursor"] == "5"
+
+    page = client.get("/fit/wellness-sync", params={"since": 1, "limit": 2})
+    assert [entry["steps"] for entry in page.json()] == [2000, 3000]
+    cursor = page.headers["X-Next-Cursor"]
+    rest = client.get("/fit/wellness-sync", params={"since": cursor, "until": 4})
+    assert [entry["seq"] for entry in rest.json()] == [4]
+
+    idle = client.get("/fit/wellness-sync", params={"since": 5})
+    assert idle.json() == [] and idle.headers["X-Next-Cursor"] == "5"
+    assert client.get("/fit/wellness-sync", params={"since": 1, "source": "fitbit"}).status_code == 422
+
+
+def test_schedule_follows_readiness_trend_not_one_reading(client: TestClient) -> None:
+    profile = {"goal": "fat_loss", "preferredWindows": ["evening"], "stressLevel": "high"}
+    baseline = client.post("/fit/schedule", json=profile).json()
+    for day, readiness in enumerate([75, 78, 74, 45], start=1):
+        client.post("/fit/wellness-sync", json={"timestamp": f"2024-10-0{day}T07:00:00Z", "readiness": readiness, "sleepHours": 7})
+
+    summary = client.get("/fit/wellness-sync/summary").json()
+    assert 60 <= summary["readiness"] < 75 and summary["readinessSamples"] == 4
+    assert summary["sleepHours"] == 7 and summary["windowEnd"] == "2024-10-04"
+    assert client.post("/fit/schedule", json=profile).json() == baseline
+
+    client.post("/fit/wellness-sync", json={"timestamp": "2024-10-05T07:00:00Z", "readiness": 30})
+    client.post("/fit/wellness-sync", json={"timestamp": "2024-10-06T07:00:00Z", "readiness": 30})
+    assert client.get("/fit/wellness-sync/summary").json()["readiness"] < 60
+    assert client.post("/fit/schedule", json=profile).json() != baseline
+
+
+def test_archive_endpoints_serve_aged_out_metrics(client: TestClient) -> None:
+    from backend import storage
+
+    storage.wellness_archive().append(
+        {"timestamp": f"2023-03-{day:02d}T07:00:00Z", "source": "whoop", "readiness": 50 + day, "profileHash": "abc"}
+        for day in range(1, 29)
+    )
+
+    window = client.get(
+        "/fit/wellness-sync/archive",
+        params={"profileHash": "abc", "start": "2023-03-10T00:00:00Z", "end": "2023-03-11T23:59:59Z"},
+    ).json()
+    assert [entry["readiness"] for entry in window] == [60, 61]
+    weeks = client.get("/fit/wellness-sync/archive/rollups", params={"profileHash": "abc", "resolution": "week"}).json()
+    assert weeks[0] == {"start": "2023-02-27", "count": 5, "steps": 0, "sleepHours": None, "readiness": 53.0}
+    assert client.get("/fit/wellness-sync/archive/rollups", params={"resolution": "month"}).status_code == 422
+    assert client.get("/fit/wellness-sync/archive").json() == []
+
+
+def test_reimport_larger_than_retention_is_ignored(client: TestClient, app_module, tmp_path) -> None:
+    from backend import storage
+
+    rows = [
+        {"timestamp": f"2024-{1 + index // 28:02d}-{1 + index % 28:02d}T07:00:00Z", "steps": 100}
+        for index in range(storage.WELLNESS_CAP + 100)
+    ]
+    first = client.post("/fit/wellness-sync/import", json={"source": "fitbit", "entries": rows}).json()
+    again = client.post("/fit/wellness-sync/import", json={"source": "fitbit", "entries": rows}).json()
+
+    assert first["accepted"] == len(rows)
+    assert (again["accepted"], again["duplicates"]) == (0, len(rows))
+    # one reading a day, so the 7-day window counts each stored day once
+    assert client.get("/fit/wellness-sync/summary").json()["steps"] == 700
+    journal = (tmp_path / "storage.journal").read_text(encoding="utf-8").splitlines()
+    assert len(journal) == len(rows)
+
+    # after a restart the keys come back from storage and the archive
+    storage.compact_storage()
+    restarted = TestClient(importlib.reload(app_module).app)
+    later = restarted.post("/fit/wellness-sync/import", json={"source": "fitbit", "entries": rows}).json()
+    assert (later["accepted"], later["duplicates"]) == (0, len(rows))
+
+
+@pytest.mark.parametrize("engine", ["json", "sqlite"])
+def test_rollups_survive_a_restart(tmp_path, monkeypatch, engine) -> None:
+    import backend.main as backend_main
+    from backend import storage
+
+    monkeypatch.setattr(storage, "_STORAGE_PATH", tmp_path / "storage.json")
+    monkeypatch.setenv("DAWAR_POWER_STORAGE", engine)
+    module = importlib.reload(backend_main)
+    # a week of 5-minute readings, with one short night per day until a long one on the last
+    rows = [
+        {
+            "timestamp": f"2024-10-{1 + index // 288:02d}T{index % 288 // 12:02d}:{index % 12 * 5:02d}:00Z",
+            "steps": 10,
+            "sleepHours": (9.0 if index // 288 == 6 else 5.0) if index % 288 == 84 else None,
+        }
+        for index in range(7 * 288)
+    ]
+    TestClient(module.app).post("/fit/wellness-sync/import", json={"source": "fitbit", "entries": rows})
+    before = TestClient(module.app).get("/fit/wellness-sync/summary").json()
+    assert (before["sleepHours"], before["steps"]) == (round((6 * 5 + 9) / 7, 2), 10 * len(rows))
+    module._storage.close()
+
+    restarted = importlib.reload(backend_main)
+    assert TestClient(restarted.app).get("/fit/wellness-sync/summary").json() == before
+    restarted._storage.close()
+
+
+def test_plan_cache_respects_window_order(client: TestClient, app_module) -> None:
+    evening_first = {"goal": "fat_loss", "preferredWindows": ["evening", "early_morning"]}
+    morning_first = {"goal": "fat_loss", "preferredWindows": ["early_morning", "evening"]}
+
+    first = client.post("/fit/schedule", json=evening_first).json()
+    second = client.post("/fit/schedule", json=morning_first).json()
+    assert first["sessions"][0]["window"] == "evening"
+    assert second["sessions"][0]["window"] == "early morning"
+    assert second == app_module._build_schedule_plan(app_module.ScheduleRequest(**morning_first), None).model_dump()
+
+    batch = client.post("/fit/schedule/batch", json=[evening_first, morning_first]).json()
+    assert batch["items"][0]["profileHash"] == batch["items"][1]["profileHash"]
+    stored = client.get("/fit/schedule", params={"profileHash": batch["items"][1]["profileHash"]}).json()
+    assert stored["sessions"][0]["window"] == "early morning"
@@ -0,0 +1,43 @@
+from backend.meal_index import MealIndex
+
+
+def _meal(name, calories, diets=("standard",), meal_type="Lunch"):
+    return {"name": name, "mealType": meal_type, "calories": calories, "diets": list(diets)}
+
+
+def test_nearest_orders_by_distance_with_library_order_ties() -> None:
+    library = [
+        _meal("far", 900),
+        _meal("above", 520),
+        _meal("below", 480),
+        _meal("exact", 500),
+        _meal("below-twin", 480),
+    ]
+    group = MealIndex(library, ["standard"]).group("Lunch", "standard")
+
+    names = [meal["name"] for meal in group.nearest(500)]
+    assert names == ["exact", "above", "below", "below-twin", "far"]
+    assert group.nth_nearest(500, 1, excluded=1 << 1)["name"] == "below"
+
+
+def test_diet_without_matches_falls_back_to_meal_type() -> None:
+    library = [_meal("bowl", 500, diets=("vegan",)), _meal("wrap", 450), _meal("oats", 300, meal_type="Breakfast")]
+    index = MealIndex(library, ["standard", "vegan", "pescatarian"])
+
+    assert index.group("Lunch", "vegan").meals == [library[0]]
+    assert index.group("Lunch", "pescatarian").meals == library[:2]
+    assert index.group("Snack", "vegan") is None
+
+
+def test_exclusion_mask_matches_any_keyword_substring() -> None:
+    library = [
+        {"name": "Almond Oats", "mealType": "Breakfast", "calories": 300, "description": "", "tags": []},
+        {"name": "Tofu Wrap", "mealType": "Lunch", "calories": 450, "description": "With peanut sauce", "tags": []},
+        {"name": "Salmon Bowl", "mealType": "Dinner", "calories": 600, "description": "", "tags": ["omega-3"]},
+    ]
+    index = MealIndex(library, ["standard"])
+
+    assert index.exclusion_mask(["nut", "omega"]) == 0b110
+    assert index.exclusion_mask(["omega", "nut", "nut"]) == 0b110
+    assert index.exclusion_mask([]) == 0
+    assert index.group("Lunch", "standard").allowed_count(0b110) == 0
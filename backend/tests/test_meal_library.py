@@ -0,0 +1,34 @@
+import json
+
+import pytest
+
+from backend.meal_library import MealLibraryError, load_meal_library
+
+
+def test_load_meal_library_reads_json_lines(tmp_path) -> None:
+    meal = {
+        "name": "Egg Bites",
+        "mealType": "Breakfast",
+        "calories": "310",
+        "protein": 24,
+        "carbs": 8,
+        "fat": 18,
+        "prepTime": 10,
+        "description": "Baked eggs with spinach.",
+    }
+    path = tmp_path / "meals.jsonl"
+    path.write_text(json.dumps(meal) + "\n\n", encoding="utf-8")
+
+    (loaded,) = load_meal_library(path)
+
+    assert loaded["calories"] == 310
+    assert loaded["tags"] == []
+    assert loaded["diets"] == ["standard"]
+
+
+def test_load_meal_library_reports_bad_lines(tmp_path) -> None:
+    path = tmp_path / "meals.jsonl"
+    path.write_text('{"name": "Incomplete", "mealType": "Lunch"}\n', encoding="utf-8")
+
+    with pytest.raises(MealLibraryError, match="meals.jsonl:1: missing calories"):
+        load_meal_library(path)
@@ -0,0 +1,32 @@
+import itertools
+import time
+
+from backend.meal_solver import day_cost, fit_score, solve_day
+
+
+def _meal(name, calories, protein, carbs, fat):
+    return {"name": name, "calories": calories, "protein": protein, "carbs": carbs, "fat": fat}
+
+
+SLOTS = [
+    [_meal("oats", 380, 12, 60, 9), _meal("eggs", 360, 30, 10, 20), _meal("shake", 300, 40, 20, 5)],
+    [_meal("pasta", 650, 20, 100, 15), _meal("chicken", 520, 46, 48, 18), _meal("salad", 400, 15, 30, 22)],
+    [_meal("curry", 600, 20, 70, 25), _meal("salmon", 610, 44, 52, 24), _meal("steak", 700, 55, 10, 45)],
+]
+TARGETS = {"calories": 1600, "protein": 140, "carbs": 140, "fat": 55}
+
+
+def test_solve_day_matches_exhaustive_search() -> None:
+    chosen = solve_day(SLOTS, TARGETS, deadline=time.perf_counter() + 5, reuse_penalty=0)
+
+    best = min(itertools.product(*SLOTS), key=lambda combo: day_cost(combo, TARGETS))
+    assert [meal["name"] for meal in chosen] == [meal["name"] for meal in best]
+    assert day_cost(chosen, TARGETS) < day_cost([slot[0] for slot in SLOTS], TARGETS)
+
+
+def test_solve_day_returns_first_candidates_when_out_of_time() -> None:
+    many_slots = [slot * 200 for slot in SLOTS]
+    chosen = solve_day(many_slots, TARGETS, deadline=time.perf_counter() - 1)
+
+    assert len(chosen) == 3
+    assert fit_score([0.1, 0.3]) == 80.0
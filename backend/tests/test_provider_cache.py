@@ -0,0 +1,98 @@
+import asyncio
+
+from backend.provider_cache import ProviderCache
+from backend.provider_clients import ProviderClient
+
+FIRST = [{"timestamp": "2024-10-01T07:00:00Z", "steps": 8000}]
+SECOND = [{"timestamp": "2024-10-02T07:00:00Z", "steps": 9500}]
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _cache(clock: FakeClock, parsed: list) -> ProviderCache:
+    def parse(provider, entries):
+        parsed.append(provider)
+        return [dict(entry, source=provider) for entry in entries]
+
+    return ProviderCache(ProviderClient(retries=0), parse, ttl=60, clock=clock)
+
+
+def test_serves_stale_then_revalidates_with_etag(provider_server, monkeypatch) -> None:
+    monkeypatch.setenv("DAWAR_POWER_FITBIT_URL", provider_server.url)
+    provider_server.serve(FIRST, headers={"ETag": '"v1"'})
+    clock, parsed = FakeClock(), []
+    cache = _cache(clock, parsed)
+
+    async def scenario():
+        first = await cache.get("fitbit", [])
+        assert await cache.get("fitbit", []) is first
+        assert len(provider_server.requests) == 1
+
+        provider_server.default = lambda headers: (
+            (304, {}, b"") if headers.get("If-None-Match") == '"v1"' else (200, {}, b"[]")
+        )
+        clock.now = 61
+        assert await cache.get("fitbit", []) is first
+        await cache.drain()
+        assert len(provider_server.requests) == 2
+
+        provider_server.serve(SECOND, headers={"ETag": '"v2"'})
+        assert await cache.get("fitbit", []) is first
+        clock.now = 122
+        assert await cache.get("fitbit", []) is first
+        await cache.drain()
+        return await cache.get("fitbit", [])
+
+    latest = asyncio.run(scenario())
+    assert latest[0]["steps"] == 9500
+    assert parsed == ["fitbit", "fitbit"]
+
+
+def test_failed_refresh_keeps_last_good_payload(provider_server, monkeypatch) -> None:
+    monkeypatch.setenv("DAWAR_POWER_WHOOP_URL", provider_server.url)
+    provider_server.serve(FIRST, headers={"Last-Modified": "Tue, 01 Oct 2024 07:00:00 GMT"})
+    clock, parsed = FakeClock(), []
+    cache = _cache(clock, parsed)
+
+    async def scenario():
+        first = await cache.get("whoop", [])
+        provider_server.serve({}, status=503)
+        clock.now = 61
+        await cache.get("whoop", [])
+        await cache.drain()
+        return first, await cache.get("whoop", [])
+
+    first, after_failure = asyncio.run(scenario())
+    assert after_failure is first
+    assert provider_server.requests[-1]["If-Modified-Since"] == "Tue, 01 Oct 2024 07:00:00 GMT"
+
+
+def test_unparseable_refresh_keeps_last_good_payload(provider_server, monkeypatch) -> None:
+    monkeypatch.setenv("DAWAR_POWER_FITBIT_URL", provider_server.url)
+    provider_server.serve(FIRST)
+    clock = FakeClock()
+
+    def parse(provider, entries):
+        if entries != FIRST:
+            raise ValueError("bad payload")
+        return list(entries)
+
+    cache = ProviderCache(ProviderClient(retries=0), parse, ttl=60, clock=clock)
+
+    async def scenario():
+        first = await cache.get("fitbit", [])
+        provider_server.serve(SECOND)
+        clock.now = 61
+        await cache.get("fitbit", [])
+        results = await asyncio.gather(*list(cache._background), return_exceptions=True)
+        return first, results, await cache.get("fitbit", [])
+
+    first, results, after_failure = asyncio.run(scenario())
+    assert results == [None]
+    assert after_failure is first
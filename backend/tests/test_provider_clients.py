@@ -0,0 +1,99 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from backend.provider_clients import ProviderClient, ProviderFetchError, iter_provider_payload
+
+ENTRIES = [{"timestamp": "2024-10-01T07:00:00Z", "steps": 8000}]
+
+
+def test_retries_server_errors_then_returns_entries(provider_server, monkeypatch) -> None:
+    monkeypatch.setenv("DAWAR_POWER_FITBIT_URL", provider_server.url)
+    provider_server.replies.append(lambda _: (503, {}, b""))
+    provider_server.serve({"entries": ENTRIES + ["not an entry"]})
+
+    client = ProviderClient(retries=2, backoff=0.01)
+    assert asyncio.run(client.fetch("fitbit", [])) == ENTRIES
+    assert len(provider_server.requests) == 2
+
+
+def test_client_errors_are_not_retried(provider_server, monkeypatch) -> None:
+    monkeypatch.setenv("DAWAR_POWER_FITBIT_URL", provider_server.url)
+    provider_server.serve({}, status=404)
+
+    with pytest.raises(ProviderFetchError, match="HTTP 404"):
+        asyncio.run(ProviderClient(retries=3, backoff=0.01).fetch("fitbit", []))
+    assert len(provider_server.requests) == 1
+
+
+def test_per_provider_timeout(provider_server, monkeypatch) -> None:
+    def slow(_):
+        time.sleep(0.5)
+        return 200, {}, json.dumps(ENTRIES).encode()
+
+    monkeypatch.setenv("DAWAR_POWER_WHOOP_URL", provider_server.url)
+    monkeypatch.setenv("DAWAR_POWER_WHOOP_TIMEOUT", "0.1")
+    provider_server.default = slow
+
+    started = time.perf_counter()
+    with pytest.raises(ProviderFetchError, match="timed out"):
+        asyncio.run(ProviderClient(retries=0).fetch("whoop", []))
+    assert time.perf_counter() - started < 0.45
+
+
+def test_concurrency_is_capped_per_provider(provider_server, monkeypatch) -> None:
+    in_flight = []
+    peak = []
+
+    def tracked(_):
+        in_flight.append(1)
+        peak.append(len(in_flight))
+        time.sleep(0.05)
+        in_flight.pop()
+        return 200, {}, json.dumps(ENTRIES).encode()
+
+    monkeypatch.setenv("DAWAR_POWER_FITBIT_URL", provider_server.url)
+    provider_server.default = tracked
+    client = ProviderClient(max_concurrency=2)
+
+    async def burst():
+        results = await asyncio.gather(*(client.fetch("fitbit", []) for _ in range(6)))
+        await client.aclose()
+        return results
+
+    assert asyncio.run(burst()) == [ENTRIES] * 6
+    assert max(peak) <= 2
+
+
+def test_missing_url_returns_fallback(monkeypatch) -> None:
+    monkeypatch.delenv("DAWAR_POWER_FITBIT_URL", raising=False)
+    assert asyncio.run(ProviderClient().fetch("fitbit", ENTRIES)) == ENTRIES
+
+
+def test_streams_entries_from_file_and_http(provider_server, tmp_path, monkeypatch) -> None:
+    payload = tmp_path / "fitbit.json"
+    payload.write_text(json.dumps({"entries": ENTRIES * 3}), encoding="utf-8")
+    monkeypatch.setenv("DAWAR_POWER_FITBIT_URL", payload.as_uri())
+    assert list(iter_provider_payload("fitbit", [])) == ENTRIES * 3
+
+    monkeypatch.setenv("DAWAR_POWER_WHOOP_URL", provider_server.url)
+    provider_server.serve(ENTRIES * 2)
+    client = ProviderClient()
+
+    async def collect(provider):
+        entries = [entry async for entry in client.stream(provider, [])]
+        await client.aclose()
+        return entries
+
+    assert asyncio.run(collect("fitbit")) == ENTRIES * 3
+    assert asyncio.run(collect("whoop")) == ENTRIES * 2
+
+
+def test_truncated_stream_raises_fetch_error(tmp_path, monkeypatch) -> None:
+    payload = tmp_path / "fitbit.json"
+    payload.write_text(json.dumps(ENTRIES)[:-5], encoding="utf-8")
+    monkeypatch.setenv("DAWAR_POWER_FITBIT_URL", payload.as_uri())
+    with pytest.raises(ProviderFetchError, match="Invalid JSON"):
+        list(iter_provider_payload("fitbit", []))
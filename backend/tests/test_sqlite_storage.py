@@ -0,0 +1,106 @@
+import pytest
+
+from backend import storage
+from backend.sqlite_storage import SqliteStorageBackend, migrate_json_to_sqlite, open_sqlite_backend
+from backend.wellness_store import parse_timestamp
+
+
+@pytest.fixture()
+def storage_path(tmp_path, monkeypatch):
+    path = tmp_path / "storage.json"
+    monkeypatch.setattr(storage, "_STORAGE_PATH", path)
+    return path
+
+
+def test_sqlite_backend_point_and_recent_queries(tmp_path) -> None:
+    backend = SqliteStorageBackend(tmp_path / "store.sqlite3")
+    backend.put_schedule("abc", {"sessions": [], "notes": {}})
+    backend.put_schedule("abc", {"sessions": [{"day": "Monday"}], "notes": {}})
+    backend.append_wellness({"timestamp": f"2024-10-0{day}T07:00:00Z", "readiness": 60 + day} for day in range(1, 6))
+
+    assert backend.get_schedule("abc") == {"sessions": [{"day": "Monday"}], "notes": {}}
+    assert backend.get_schedule("missing") is None
+    assert [entry["readiness"] for entry in backend.recent_wellness(2)] == [64, 65]
+    assert backend._connection().execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    backend.close()
+
+
+def test_sqlite_wellness_partitions_by_profile(tmp_path) -> None:
+    path = tmp_path / "store.sqlite3"
+    legacy = SqliteStorageBackend(path)
+    with legacy._connection() as connection:
+        connection.execute("DROP TABLE wellness")
+        connection.execute(
+            "CREATE TABLE wellness (id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT NOT NULL, source TEXT, payload TEXT NOT NULL)"
+        )
+        connection.execute(
+            "INSERT INTO wellness (timestamp, source, payload) VALUES ('2024-10-01', NULL, '{\"timestamp\": \"2024-10-01\"}')"
+        )
+    legacy.close()
+
+    backend = SqliteStorageBackend(path)
+    backend.append_wellness(
+        [
+            {"timestamp": "2024-10-02T07:00:00Z", "profileHash": "abc", "readiness": 50},
+            {"timestamp": "2024-10-03T07:00:00Z", "profileHash": "def", "readiness": 90},
+        ]
+    )
+    assert [entry["readiness"] for entry in backend.recent_wellness(5, "abc")] == [50]
+    assert [entry["timestamp"] for entry in backend.recent_wellness(5, "")] == ["2024-10-01"]
+    assert len(backend.recent_wellness(5)) == 3
+    # legacy rows get their epoch backfilled, so they show up in range reads
+    assert [entry["timestamp"] for entry in backend.wellness_between("", None, None, 5)] == ["2024-10-01"]
+    backend.close()
+
+
+def test_sqlite_wellness_ranges_compare_parsed_timestamps(tmp_path) -> None:
+    backend = SqliteStorageBackend(tmp_path / "store.sqlite3")
+    backend.append_wellness(
+        [
+            {"timestamp": "2024-10-02T01:00:00+02:00", "source": "oura", "steps": 1},
+            {"timestamp": "2024-10-01T22:00:00Z", "source": "fitbit", "steps": 2},
+            {"timestamp": "2024-10-01T12:00:00", "source": "fitbit", "steps": 3},
+        ]
+    )
+    start, end = parse_timestamp("2024-10-01T20:00:00Z"), parse_timestamp("2024-10-02T00:00:00Z")
+
+    # 01:00+02:00 is 23:00Z: inside the window, though its text sorts after the end bound
+    assert [entry["steps"] for entry in backend.wellness_between("", start, end, 10)] == [2, 1]
+    assert [entry["steps"] for entry in backend.wellness_between("", start, None, 1)] == [1]
+    assert [entry["steps"] for entry in backend.wellness_between("", None, end, 10, "fitbit")] == [3, 2]
+    backend.close()
+
+
+def test_migration_from_json_runs_once(storage_path, tmp_path) -> None:
+    storage.save_storage({"abc": {"sessions": []}}, [{"timestamp": "2024-10-01T07:00:00Z"}])
+    storage.append_wellness([{"timestamp": "2024-10-02T07:00:00Z", "source": "fitbit"}])
+
+    backend = open_sqlite_backend(tmp_path / "store.sqlite3")
+    assert backend.get_schedule("abc") == {"sessions": []}
+    assert len(backend.recent_wellness(10)) == 2
+
+    assert migrate_json_to_sqlite(backend) == (0, 0)
+    assert len(backend.recent_wellness(10)) == 2
+    backend.close()
+
+
+def test_sqlite_backend_prunes_past_retention(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(storage, "SCHEDULE_MAX_STORED", 3)
+    backend = SqliteStorageBackend(tmp_path / "store.sqlite3")
+    backend.write_batch({f"profile-{index}": {"sessions": []} for index in range(70)}, [])
+
+    assert backend.schedule_stats() == {"size": 3, "evictions": 67}
+    backend.close()
+
+
+def test_sqlite_wellness_cursor_uses_row_ids(tmp_path) -> None:
+    backend = SqliteStorageBackend(tmp_path / "store.sqlite3")
+    backend.append_wellness({"timestamp": "2024-10-01T07:00:00Z", "profileHash": str(seq % 2), "seq": seq} for seq in range(1, 7))
+
+    assert [entry["seq"] for entry in backend.wellness_since(2, 2)] == [3, 4]
+    assert [entry["seq"] for entry in backend.wellness_since(0, 10, "0", until=5)] == [2, 4]
+    assert backend.last_wellness_seq() == 6
+    assert sorted(backend.wellness_keys("0")) == [("", parse_timestamp("2024-10-01T07:00:00Z"))] * 3
+    backend.append_wellness([{"timestamp": "2024-10-02T07:00:00Z"}])
+    assert backend.recent_wellness(1)[0]["seq"] == 7
+    backend.close()
@@ -0,0 +1,184 @@
+import json
+import threading
+import time
+
+import pytest
+
+from backend import storage
+
+
+@pytest.fixture()
+def storage_path(tmp_path, monkeypatch):
+    path = tmp_path / "storage.json"
+    monkeypatch.setattr(storage, "_STORAGE_PATH", path)
+    return path
+
+
+def test_journal_replays_on_top_of_snapshot(storage_path) -> None:
+    storage.save_storage({"old": {"sessions": []}}, [{"timestamp": "2024-10-01T07:00:00Z"}])
+    storage.append_schedule("new", {"sessions": [], "notes": {}})
+    storage.append_wellness([{"timestamp": "2024-10-02T07:00:00Z", "readiness": 70}])
+
+    with storage_path.with_suffix(".journal").open("a", encoding="utf-8") as handle:
+        handle.write('{"type": "wellness", "payl')  # torn write
+
+    schedules, wellness = storage.load_storage()
+
+    assert set(schedules) == {"old", "new"}
+    assert [entry["timestamp"] for entry in wellness] == ["2024-10-01T07:00:00Z", "2024-10-02T07:00:00Z"]
+
+
+def test_compaction_folds_journal_into_snapshot(storage_path) -> None:
+    storage.append_schedule("abc", {"sessions": []})
+    storage.append_wellness({"timestamp": f"2024-10-01T07:{minute:02d}:00Z"} for minute in range(5))
+
+    storage.compact_storage()
+
+    assert not storage_path.with_suffix(".journal").exists()
+    snapshot = json.loads(storage_path.read_text(encoding="utf-8"))
+    assert "abc" in snapshot["schedules"]
+    assert len(snapshot["wellness"]) == 5
+    assert storage.load_storage() == (snapshot["schedules"], snapshot["wellness"])
+
+
+def test_write_behind_coalesces_until_flushed(storage_path) -> None:
+    buffered = storage.WriteBehindStorage(storage.JsonStorageBackend(), interval=60, max_dirty=1000)
+    buffered.put_schedule("abc", {"sessions": [], "notes": {"summary": "first"}})
+    buffered.put_schedule("abc", {"sessions": [], "notes": {"summary": "second"}})
+    buffered.append_wellness([{"timestamp": "2024-10-02T07:00:00Z"}])
+
+    journal = storage_path.with_suffix(".journal")
+    assert not journal.exists()
+    assert buffered.get_schedule("abc")["notes"]["summary"] == "second"
+    assert len(buffered.recent_wellness(5)) == 1
+
+    buffered.flush()
+
+    assert len(journal.read_text(encoding="utf-8").splitlines()) == 2
+    assert len(buffered.recent_wellness(5)) == 1
+    buffered.close()
+    assert storage.load_storage()[0]["abc"]["notes"]["summary"] == "second"
+
+
+def test_write_behind_flushes_once_dirty_limit_reached(storage_path) -> None:
+    buffered = storage.WriteBehindStorage(storage.JsonStorageBackend(), interval=60, max_dirty=3)
+    buffered.append_wellness({"timestamp": f"2024-10-0{day}T07:00:00Z"} for day in range(1, 4))
+
+    journal = storage_path.with_suffix(".journal")
+    for _ in range(50):
+        if journal.exists():
+            break
+        time.sleep(0.02)
+
+    assert len(storage.load_storage()[1]) == 3
+    buffered.close()
+
+
+def test_truncated_snapshot_falls_back_to_backup(storage_path) -> None:
+    storage.save_storage({"first": {"sessions": []}}, [])
+    storage.save_storage({"first": {"sessions": []}, "second": {"sessions": []}}, [])
+    assert not storage_path.with_name("storage.json.tmp").exists()
+
+    storage_path.write_text('{"schedules": {"first": {"sess', encoding="utf-8")
+
+    schedules, _ = storage.load_storage()
+    assert set(schedules) == {"first"}
+
+
+def test_stored_schedules_are_capped_oldest_first(storage_path, monkeypatch) -> None:
+    monkeypatch.setattr(storage, "SCHEDULE_MAX_STORED", 2)
+    backend = storage.JsonStorageBackend()
+    for key in ["a", "b", "a", "c"]:
+        backend.put_schedule(key, {"sessions": []})
+
+    assert backend.get_schedule("b") is None
+    assert backend.schedule_stats() == {"size": 2, "evictions": 1}
+    assert set(storage.load_storage()[0]) == {"a", "c"}
+
+
+def test_wellness_is_capped_per_profile(storage_path, monkeypatch) -> None:
+    monkeypatch.setattr(storage, "WELLNESS_CAP", 3)
+    backend = storage.JsonStorageBackend()
+    backend.append_wellness({"timestamp": f"2024-10-0{day}T07:00:00Z", "profileHash": "busy"} for day in range(1, 8))
+    backend.append_wellness([{"timestamp": "2024-09-01T07:00:00Z", "profileHash": "quiet"}, {"timestamp": "2024-09-02T07:00:00Z"}])
+
+    assert [entry["timestamp"][:10] for entry in backend.recent_wellness(10, "busy")] == [
+        "2024-10-05",
+        "2024-10-06",
+        "2024-10-07",
+    ]
+    assert len(backend.recent_wellness(10, "quiet")) == 1
+    assert backend.recent_wellness(10, "")[0]["timestamp"] == "2024-09-02T07:00:00Z"
+
+    storage.compact_storage()
+    reloaded = storage.JsonStorageBackend()
+    assert reloaded.recent_wellness(10, "busy") == backend.recent_wellness(10, "busy")
+    assert len(reloaded.recent_wellness(10)) == 5
+
+
+def test_wellness_cursor_reads_include_buffered_entries(storage_path) -> None:
+    backend = storage.JsonStorageBackend()
+    backend.append_wellness({"timestamp": "2024-10-01T07:00:00Z", "seq": seq} for seq in range(1, 4))
+    buffered = storage.WriteBehindStorage(backend, interval=60, max_dirty=1000)
+    buffered.append_wellness({"timestamp": "2024-10-02T07:00:00Z", "seq": seq, "profileHash": "abc"} for seq in (4, 5))
+
+    assert [entry["seq"] for entry in buffered.wellness_since(2, 10)] == [3, 4, 5]
+    assert [entry["seq"] for entry in buffered.wellness_since(0, 10, "abc", until=4)] == [4]
+    assert [entry["seq"] for entry in buffered.wellness_since(0, 2)] == [1, 2]
+    assert buffered.last_wellness_seq() == 5
+    buffered.close()
+    assert storage.JsonStorageBackend().last_wellness_seq() == 5
+
+
+def test_compaction_archives_trimmed_wellness(storage_path, monkeypatch) -> None:
+    monkeypatch.setattr(storage, "WELLNESS_CAP", 2)
+    backend = storage.JsonStorageBackend()
+    backend.append_wellness({"timestamp": f"2024-10-0{day}T07:00:00Z", "steps": day, "profileHash": "abc"} for day in range(1, 6))
+    storage.compact_storage()
+    storage.compact_storage()
+
+    archived = storage.wellness_archive().metrics("abc")
+    assert [row["steps"] for row in archived] == [1, 2, 3]
+    assert storage_path.with_name("storage.archive").is_dir()
+    assert [entry["steps"] for entry in storage.JsonStorageBackend().recent_wellness(10, "abc")] == [4, 5]
+
+
+def test_wellness_keys_cover_stale_and_archived_rows(storage_path, monkeypatch) -> None:
+    monkeypatch.setattr(storage, "WELLNESS_CAP", 2)
+    backend = storage.JsonStorageBackend()
+    backend.append_wellness({"timestamp": f"2024-10-0{day}T07:00:00Z", "profileHash": "abc"} for day in range(1, 4))
+    backend.append_wellness([{"timestamp": "2024-09-01T07:00:00Z", "profileHash": "other"}])
+    # one row past the cap, not yet trimmed into the archive
+    assert len(backend.wellness_keys("abc")) == 3
+
+    backend.append_wellness({"timestamp": f"2024-10-0{day}T07:00:00Z", "profileHash": "abc"} for day in range(4, 8))
+    assert len(backend.recent_wellness(10, "abc")) == 2
+    keys = backend.wellness_keys("abc")
+    assert sorted(epoch for _, epoch in keys) == [
+        storage.parse_timestamp(f"2024-10-0{day}T07:00:00Z") for day in range(1, 8)
+    ]
+    assert len(backend.wellness_keys("other")) == 1
+
+
+def test_concurrent_writes_journal_in_memory_order(storage_path, monkeypatch) -> None:
+    monkeypatch.setattr(storage, "SCHEDULE_MAX_STORED", 1)
+    backend = storage.JsonStorageBackend()
+    backend.put_schedule("x", {"sessions": []})
+    original_append = storage.append_records
+    racing = []
+
+    def append_with_racer(records):
+        records = list(records)
+        if not racing:
+            # while "y" (which evicts "x") is being journaled, another writer puts "x" back
+            racing.append(threading.Thread(target=backend.put_schedule, args=("x", {"sessions": [1]})))
+            racing[0].start()
+            racing[0].join(0.2)
+        original_append(records)
+
+    monkeypatch.setattr(storage, "append_records", append_with_racer)
+    backend.put_schedule("y", {"sessions": []})
+    racing[0].join()
+
+    assert backend.get_schedule("x") == {"sessions": [1]}
+    assert storage.JsonStorageBackend().get_schedule("x") == {"sessions": [1]}
@@ -0,0 +1,77 @@
+import os
+import threading
+
+from backend import wellness_archive
+from backend.wellness_archive import WellnessArchive
+from backend.wellness_store import parse_timestamp
+
+
+def entry(day: int, source: str = "fitbit", **values) -> dict:
+    return {"timestamp": f"2024-{(day - 1) // 28 + 1:02d}-{(day - 1) % 28 + 1:02d}T07:00:00Z", "source": source, **values}
+
+
+def test_range_queries_span_sources_and_backfills(tmp_path) -> None:
+    archive = WellnessArchive(tmp_path)
+    assert archive.append(entry(day, steps=day, sleepHours=7.5) for day in range(10, 40)) == 30
+    assert archive.append([entry(5, steps=5), entry(12, steps=0), entry(20, "whoop", readiness=60)]) == 2
+    assert archive.append([entry(day, steps=day) for day in range(10, 40)]) == 0
+
+    window = archive.metrics(start=parse_timestamp("2024-01-19T00:00:00Z"), end=parse_timestamp("2024-01-21T00:00:00Z"))
+    assert [(row["timestamp"][:10], row["source"]) for row in window] == [
+        ("2024-01-19", "fitbit"),
+        ("2024-01-20", "fitbit"),
+        ("2024-01-20", "whoop"),
+    ]
+    assert window[2] == {
+        "timestamp": "2024-01-20T07:00:00+00:00",
+        "source": "whoop",
+        "profileHash": None,
+        "steps": None,
+        "sleepHours": None,
+        "readiness": 60,
+    }
+    assert [row["steps"] for row in archive.metrics(source="fitbit", limit=3)] == [5, 10, 11]
+    assert archive.metrics("someone") == []
+
+
+def test_rollups_downsample_by_day_and_week(tmp_path) -> None:
+    archive = WellnessArchive(tmp_path)
+    archive.append(entry(day, steps=1000, sleepHours=6 + day % 2, readiness=70) for day in range(1, 15))
+    archive.append([entry(3, "whoop", readiness=40), {"timestamp": "2024-01-03T19:00:00Z", "source": "fitbit", "steps": 500}])
+
+    days = archive.rollups(resolution="day", start=parse_timestamp("2024-01-03T00:00:00Z"), end=parse_timestamp("2024-01-03T23:00:00Z"))
+    assert days == [{"start": "2024-01-03", "count": 3, "steps": 1500, "sleepHours": 7.0, "readiness": 55.0}]
+    weeks = archive.rollups(resolution="week", source="fitbit")
+    # 2024-01-01 was a Monday
+    assert [(week["start"], week["count"], week["steps"]) for week in weeks] == [
+        ("2024-01-01", 8, 7500),
+        ("2024-01-08", 7, 7000),
+    ]
+    assert weeks[1]["sleepHours"] == round((6 * 4 + 7 * 3) / 7, 2)
+
+
+def test_reads_never_mix_columns_from_a_rewrite(tmp_path, monkeypatch) -> None:
+    archive = WellnessArchive(tmp_path)
+    archive.append(entry(day, steps=day) for day in range(10, 20))
+    seen = []
+    original_replace = os.replace
+
+    def replace_then_read(source, target):
+        original_replace(source, target)
+        if str(target).endswith("timestamp.bin") and not seen:
+            # a reader arriving between two column swaps must wait for the rest of the rewrite
+            reader = threading.Thread(target=lambda: seen.append(archive.metrics(source="fitbit")))
+            reader.start()
+            reader.join(0.2)
+            seen.append(None)
+
+    monkeypatch.setattr(wellness_archive.os, "replace", replace_then_read)
+    archive.append([entry(day, steps=day) for day in range(1, 5)])
+    for _ in range(50):
+        if len(seen) == 2:
+            break
+        threading.Event().wait(0.02)
+
+    rows = next(result for result in seen if result is not None)
+    assert [row["steps"] for row in rows] == [int(row["timestamp"][8:10]) for row in rows]
+    assert len(rows) == 14
@@ -0,0 +1,113 @@
+from types import SimpleNamespace
+
+from backend.wellness_store import WellnessPartitions, WellnessStore, parse_timestamp
+
+
+def metric(timestamp: str, source: str = "fitbit", readiness: int = 70) -> SimpleNamespace:
+    return SimpleNamespace(timestamp=timestamp, source=source, readiness=readiness)
+
+
+def test_latest_follows_timestamp_not_arrival() -> None:
+    store = WellnessStore(10)
+    store.add(metric("2024-10-02T07:00:00Z", readiness=90))
+    store.add(metric("2024-10-01T07:00:00+00:00", source="whoop", readiness=40))
+
+    assert store.latest().readiness == 90
+    assert store.latest("whoop").readiness == 40
+    assert store.latest("garmin") is None
+    assert [item.readiness for item in store] == [40, 90]
+
+
+def test_range_queries_by_time_and_source() -> None:
+    store = WellnessStore(100)
+    store.extend(metric(f"2024-10-{day:02d}T07:00:00Z", source="whoop" if day % 2 else "fitbit") for day in range(30, 0, -1))
+
+    window = store.between(parse_timestamp("2024-10-05T07:00:00Z"), parse_timestamp("2024-10-08T07:00:00Z"))
+    assert [item.timestamp[:10] for item in window] == ["2024-10-05", "2024-10-06", "2024-10-07", "2024-10-08"]
+    odd = store.between(parse_timestamp("2024-10-05T00:00:00Z"), parse_timestamp("2024-10-10T00:00:00Z"), "whoop")
+    assert [item.timestamp[:10] for item in odd] == ["2024-10-05", "2024-10-07", "2024-10-09"]
+    assert [item.timestamp[:10] for item in store.recent(2)] == ["2024-10-29", "2024-10-30"]
+
+
+def test_retention_drops_oldest_timestamps_first() -> None:
+    store = WellnessStore(3)
+    for day in [5, 6, 7]:
+        store.add(metric(f"2024-10-{day:02d}T07:00:00Z"))
+    store.add(metric("2024-10-01T07:00:00Z", source="backfill"))
+    assert [item.timestamp[:10] for item in store] == ["2024-10-05", "2024-10-06", "2024-10-07"]
+    assert store.latest("backfill") is None
+
+    for day in range(8, 200):
+        store.add(metric(f"2024-{1 + day // 28:02d}-{1 + day % 28:02d}T07:00:00Z"))
+    assert len(store) == 3
+
+
+def test_retention_by_age() -> None:
+    now = parse_timestamp("2024-10-10T00:00:00Z")
+    store = WellnessStore(100, max_age=3 * 86400, clock=lambda: now)
+    store.extend(metric(f"2024-10-{day:02d}T07:00:00Z") for day in range(1, 10))
+    assert [item.timestamp[:10] for item in store] == ["2024-10-07", "2024-10-08", "2024-10-09"]
+
+
+def test_partitions_load_lazily_and_drop_least_recent() -> None:
+    loads = []
+
+    def load(profile: str) -> list:
+        loads.append(profile)
+        return [metric("2024-10-01T07:00:00Z", readiness=len(profile))]
+
+    partitions = WellnessPartitions(10, max_partitions=2, load=load)
+    partitions.get("a").add(metric("2024-10-02T07:00:00Z", readiness=95))
+    partitions.get("bb")
+    assert partitions.get("a").latest().readiness == 95
+    partitions.get("ccc")
+
+    assert "a" in partitions and "bb" not in partitions
+    assert partitions.get("bb").latest().readiness == 2
+    assert loads == ["a", "bb", "ccc", "bb"]
+    assert len(partitions) == 2
+
+
+def test_duplicates_are_skipped_after_eviction() -> None:
+    store = WellnessStore(2)
+    batch = [metric("2024-10-01T07:00:00Z"), metric("2024-10-01T07:00:00+00:00"), metric("2024-10-01T07:00:00Z", "whoop")]
+    assert store.extend(batch) == [batch[0], batch[2]]
+    assert not store.add(metric("2024-10-01T07:00:00Z", readiness=10))
+
+    store.extend([metric("2024-10-02T07:00:00Z"), metric("2024-10-03T07:00:00Z")])
+    assert store.latest("whoop") is None
+    assert metric("2024-10-01T07:00:00Z", "whoop") in store
+    assert not store.add(metric("2024-10-01T07:00:00Z", "whoop"))
+
+    store.remember([("garmin", parse_timestamp("2024-09-01T07:00:00Z"))])
+    assert not store.add(metric("2024-09-01T07:00:00Z", "garmin"))
+    assert store.add(metric("2024-10-04T07:00:00Z", "whoop"))
+
+
+def test_rollup_folds_in_timestamp_order() -> None:
+    store = WellnessStore(2, readiness_alpha=0.5)
+    store.extend(
+        [
+            SimpleNamespace(timestamp="2024-10-03T07:00:00Z", source="whoop", readiness=80, sleepHours=6.0, steps=None),
+            SimpleNamespace(timestamp="2024-10-01T07:00:00Z", source="whoop", readiness=40, sleepHours=8.0, steps=1000),
+            SimpleNamespace(timestamp="2024-09-20T07:00:00Z", source="fitbit", readiness=None, sleepHours=3.0, steps=500),
+        ]
+    )
+    summary = store.summary()
+    assert summary.readiness == 60.0 and summary.readiness_samples == 2
+    assert (summary.sleep_hours, summary.sleep_samples) == (7.0, 2)
+    assert summary.steps == 1000
+    assert summary.window_end == "2024-10-03"
+
+    # a late reading is kept out of the average
+    store.add(SimpleNamespace(timestamp="2024-10-02T07:00:00Z", source="whoop", readiness=0, sleepHours=None, steps=200))
+    store.add(SimpleNamespace(timestamp="2024-10-12T07:00:00Z", source="whoop", readiness=100, sleepHours=None, steps=0))
+    summary = store.summary()
+    assert summary.readiness == 80.0 and summary.readiness_samples == 3
+    assert (summary.sleep_hours, summary.steps) == (None, 0)
+
+
+def test_parse_timestamp_accepts_zulu_suffix() -> None:
+    # browsers send Date.toISOString(), which Python < 3.11 only reads once the Z is normalized
+    assert parse_timestamp("2024-10-01T07:00:00.000Z") == parse_timestamp("2024-10-01T07:00:00+00:00")
+    assert parse_timestamp(" 2024-10-01T07:00:00z ") == parse_timestamp("2024-10-01T07:00:00")
@@ -0,0 +1,295 @@
+import heapq
+import math
+import mmap
+import os
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from contextlib import ExitStack
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import quote, unquote
+
+from .wellness_store import parse_timestamp
+
+# column name -> array typecode; missing readings are stored as -1 (ints) or NaN (floats)
+RAW_COLUMNS = (("timestamp", "d"), ("steps", "i"), ("sleepHours", "f"), ("readiness", "b"))
+ROLLUP_COLUMNS = (
+    ("start", "d"),
+    ("count", "i"),
+    ("steps", "q"),
+    ("sleepSum", "d"),
+    ("sleepCount", "i"),
+    ("readinessSum", "d"),
+    ("readinessCount", "i"),
+)
+RESOLUTIONS = ("day", "week")
+
+_DAY = 86400.0
+
+_Row = Tuple[float, int, float, int]
+
+
+def _period_start(stamp: float, resolution: str) -> float:
+    day = math.floor(stamp / _DAY)
+    if resolution == "week":
+        # epoch day 0 was a Thursday; weeks start on Monday
+        day -= (day + 3) % 7
+    return day * _DAY
+
+
+def _iso(stamp: float) -> str:
+    return datetime.fromtimestamp(stamp, timezone.utc).isoformat()
+
+
+def _row(entry: Dict[str, Any]) -> Optional[_Row]:
+    try:
+        stamp = parse_timestamp(str(entry["timestamp"]))
+    except (KeyError, ValueError):
+        return None
+    steps, sleep, readiness = entry.get("steps"), entry.get("sleepHours"), entry.get("readiness")
+    return (
+        stamp,
+        int(steps) if isinstance(steps, (int, float)) and 0 <= steps < 2**31 else -1,
+        float(sleep) if isinstance(sleep, (int, float)) else math.nan,
+        int(readiness) if isinstance(readiness, (int, float)) and 0 <= readiness <= 100 else -1,
+    )
+
+
+class _Mapped:
+    """Read-only views of column files; lengths are clipped to the shortest column."""
+
+    def __init__(self, stack: ExitStack, directory: Path, columns: Sequence[Tuple[str, str]]) -> None:
+        self.views: Dict[str, Sequence[Any]] = {}
+        for name, typecode in columns:
+            path = directory / f"{name}.bin"
+            size = path.stat().st_size if path.exists() else 0
+            if size < array(typecode).itemsize:
+                self.views[name] = array(typecode)
+                continue
+            handle = stack.enter_context(path.open("rb"))
+            mapped = stack.enter_context(mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ))
+            # every view over the map must be released before the map can close
+            view = memoryview(mapped)
+            stack.callback(view.release)
+            usable = view[: size - size % array(typecode).itemsize]
+            stack.callback(usable.release)
+            cast = usable.cast(typecode)
+            stack.callback(cast.release)
+            self.views[name] = cast
+        self.length = min(len(view) for view in self.views.values())
+
+    def column(self, name: str, lo: int, hi: int) -> List[Any]:
+        return self.views[name][lo:hi].tolist()
+
+
+class WellnessArchive:
+    """Columnar long-term store for wellness metrics that aged out of the hot store.
+
+    Each profile and source gets a directory holding one binary file per
+    column (timestamp, steps, sleepHours, readiness), kept sorted by
+    timestamp, plus per-day and per-week rollups in the same layout. Range
+    queries memory-map the columns and bisect the timestamps, so they touch
+    only the pages in range. Files only ever grow in place; anything that has
+    to reorder or shrink them writes a new file and swaps it in, which keeps
+    existing maps valid. A rewrite swaps the columns one at a time, so reads
+    take the same lock as writes to never pair a new column with an old one.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self._lock = threading.Lock()
+
+    def _directory(self, profile: str, source: str) -> Path:
+        return self.root / f"p-{quote(profile, safe='')}" / f"s-{quote(source, safe='')}"
+
+    def sources(self, profile: str = "") -> List[str]:
+        directory = self.root / f"p-{quote(profile, safe='')}"
+        if not directory.is_dir():
+            return []
+        return sorted(unquote(path.name[2:]) for path in directory.iterdir() if path.name.startswith("s-"))
+
+    def keys(self, profile: str = "") -> List[Tuple[str, float]]:
+        """(source, epoch timestamp) of every row archived for ``profile``."""
+
+        keys: List[Tuple[str, float]] = []
+        with self._lock, ExitStack() as stack:
+            for source in self.sources(profile):
+                mapped = _Mapped(stack, self._directory(profile, source), RAW_COLUMNS[:1])
+                keys.extend((source, stamp) for stamp in mapped.column("timestamp", 0, mapped.length))
+        return keys
+
+    def append(self, entries: Iterable[Dict[str, Any]]) -> int:
+        """Archive ``entries``; ones whose source and timestamp are already archived are skipped.
+
+        Returns how many rows were written.
+        """
+
+        groups: Dict[Tuple[str, str], List[_Row]] = {}
+        for entry in entries:
+            if not isinstance(entry, dict):
+                continue
+            row = _row(entry)
+            if row is not None:
+                key = (str(entry.get("profileHash") or ""), str(entry.get("source") or ""))
+                groups.setdefault(key, []).append(row)
+        written = 0
+        with self._lock:
+            for (profile, source), rows in groups.items():
+                written += self._append_rows(self._directory(profile, source), rows)
+        return written
+
+    def _append_rows(self, directory: Path, rows: List[_Row]) -> int:
+        directory.mkdir(parents=True, exist_ok=True)
+        rows.sort()
+        with ExitStack() as stack:
+            mapped = _Mapped(stack, directory, RAW_COLUMNS)
+            existing = mapped.length
+            last = mapped.views["timestamp"][existing - 1] if existing else -math.inf
+            torn = any(len(view) != existing for view in mapped.views.values())
+            if rows[0][0] > last and not torn:
+                fresh = [row for index, row in enumerate(rows) if index == 0 or row[0] != rows[index - 1][0]]
+                merged = None
+            else:
+                # a backfill (or a torn append) means rewriting the columns in order
+                kept = list(zip(*(mapped.column(name, 0, existing) for name, _ in RAW_COLUMNS)))
+                known = {row[0] for row in kept}
+                fresh = []
+                for row in rows:
+                    if row[0] not in known:
+                        known.add(row[0])
+                        fresh.append(row)
+                merged = list(heapq.merge(kept, fresh))
+        if not fresh:
+            return 0
+        if merged is None:
+            for position, (name, typecode) in enumerate(RAW_COLUMNS):
+                with (directory / f"{name}.bin").open("ab") as handle:
+                    array(typecode, (row[position] for row in fresh)).tofile(handle)
+        else:
+            _write_columns(directory, RAW_COLUMNS, merged)
+        self._refresh_rollups(directory, fresh[0][0])
+        return len(fresh)
+
+    def _refresh_rollups(self, directory: Path, since: float) -> None:
+        """Recompute the day and week buckets from the one holding ``since`` onwards."""
+
+        with ExitStack() as stack:
+            raw = _Mapped(stack, directory, RAW_COLUMNS)
+            for resolution in RESOLUTIONS:
+                target = directory / resolution
+                target.mkdir(exist_ok=True)
+                first = _period_start(since, resolution)
+                current = _Mapped(stack, target, ROLLUP_COLUMNS)
+                keep = bisect_left(current.views["start"], first, 0, current.length)
+                buckets = list(zip(*(current.column(name, 0, keep) for name, _ in ROLLUP_COLUMNS)))
+                lo = bisect_left(raw.views["timestamp"], first, 0, raw.length)
+                columns = [raw.column(name, lo, raw.length) for name, _ in RAW_COLUMNS]
+                buckets.extend(_bucket(zip(*columns), resolution))
+                _write_columns(target, ROLLUP_COLUMNS, buckets)
+
+    def metrics(
+        self,
+        profile: str = "",
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        source: Optional[str] = None,
+        limit: Optional[int] = None,
+        newest: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Archived metrics with ``start <= timestamp <= end``, oldest first.
+
+        ``limit`` keeps the oldest rows in range, or the newest ones with ``newest``.
+        """
+
+        runs = []
+        with self._lock, ExitStack() as stack:
+            for name in [source] if source is not None else self.sources(profile):
+                mapped = _Mapped(stack, self._directory(profile, name), RAW_COLUMNS)
+                stamps = mapped.views["timestamp"]
+                lo = 0 if start is None else bisect_left(stamps, start, 0, mapped.length)
+                hi = mapped.length if end is None else bisect_right(stamps, end, lo, mapped.length)
+                if limit is not None and newest:
+                    lo = max(lo, hi - limit)
+                elif limit is not None:
+                    hi = min(hi, lo + limit)
+                columns = [mapped.column(column, lo, hi) for column, _ in RAW_COLUMNS]
+                runs.append([(row[0], name, *row[1:]) for row in zip(*columns)])
+        rows = list(heapq.merge(*runs))
+        if limit is not None:
+            rows = rows[-limit:] if newest and limit > 0 else rows[:limit]
+        return [
+            {
+                "timestamp": _iso(stamp),
+                "source": name or None,
+                "profileHash": profile or None,
+                "steps": steps if steps >= 0 else None,
+                "sleepHours": round(sleep, 2) if not math.isnan(sleep) else None,
+                "readiness": readiness if readiness >= 0 else None,
+            }
+            for stamp, name, steps, sleep, readiness in rows
+        ]
+
+    def rollups(
+        self,
+        profile: str = "",
+        resolution: str = "day",
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        source: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Day or week buckets overlapping ``start``..``end``, summed across sources unless one is given."""
+
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"resolution must be one of {', '.join(RESOLUTIONS)}")
+        totals: Dict[float, List[float]] = {}
+        with self._lock, ExitStack() as stack:
+            for name in [source] if source is not None else self.sources(profile):
+                mapped = _Mapped(stack, self._directory(profile, name) / resolution, ROLLUP_COLUMNS)
+                starts = mapped.views["start"]
+                lo = 0 if start is None else bisect_left(starts, _period_start(start, resolution), 0, mapped.length)
+                hi = mapped.length if end is None else bisect_right(starts, end, lo, mapped.length)
+                columns = [mapped.column(column, lo, hi) for column, _ in ROLLUP_COLUMNS]
+                for bucket in zip(*columns):
+                    total = totals.setdefault(bucket[0], [0] * (len(ROLLUP_COLUMNS) - 1))
+                    for position, value in enumerate(bucket[1:]):
+                        total[position] += value
+        return [
+            {
+                "start": _iso(period)[:10],
+                "count": int(count),
+                "steps": int(steps),
+                "sleepHours": round(sleep / nights, 2) if nights else None,
+                "readiness": round(readiness / readings, 1) if readings else None,
+            }
+            for period, (count, steps, sleep, nights, readiness, readings) in sorted(totals.items())
+        ]
+
+
+def _bucket(rows: Iterable[_Row], resolution: str) -> List[Tuple[Any, ...]]:
+    buckets: List[List[Any]] = []
+    for stamp, steps, sleep, readiness in rows:
+        period = _period_start(stamp, resolution)
+        if not buckets or buckets[-1][0] != period:
+            buckets.append([period, 0, 0, 0.0, 0, 0.0, 0])
+        bucket = buckets[-1]
+        bucket[1] += 1
+        if steps >= 0:
+            bucket[2] += steps
+        if not math.isnan(sleep):
+            bucket[3] += sleep
+            bucket[4] += 1
+        if readiness >= 0:
+            bucket[5] += readiness
+            bucket[6] += 1
+    return [tuple(bucket) for bucket in buckets]
+
+
+def _write_columns(directory: Path, columns: Sequence[Tuple[str, str]], rows: Sequence[Sequence[Any]]) -> None:
+    for position, (name, typecode) in enumerate(columns):
+        path = directory / f"{name}.bin"
+        temp_path = path.with_name(f"{path.name}.tmp")
+        with temp_path.open("wb") as handle:
+            array(typecode, (row[position] for row in rows)).tofile(handle)
+        os.replace(temp_path, path)
@@ -0,0 +1,339 @@
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Callable, Dict, Generic, Iterable, Iterator, List, NamedTuple, Optional, Protocol, Set, Tuple, TypeVar
+
+
+class Metric(Protocol):
+    timestamp: str
+    source: Optional[str]
+
+
+M = TypeVar("M", bound=Metric)
+
+# (epoch seconds, source, insertion number, metric); the insertion number keeps keys unique
+_Key = Tuple[float, str, int, M]
+
+# dead slots at the front of an index are dropped once they outnumber the live ones
+_COMPACT_MIN = 64
+
+# days of sleep and steps a rollup sums, ending with the newest reading's day
+ROLLUP_WINDOW_DAYS = 7
+
+
+def parse_timestamp(value: str) -> float:
+    """Epoch seconds for an ISO 8601 timestamp; naive values are read as UTC."""
+
+    value = value.strip()
+    # fromisoformat only accepts a "Z" suffix from Python 3.11
+    if value[-1:] in ("Z", "z"):
+        value = value[:-1] + "+00:00"
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def rollup_window_start(newest: float, window_days: int = ROLLUP_WINDOW_DAYS) -> float:
+    """Epoch seconds where the rollup window ending with a reading at ``newest`` begins."""
+
+    return (int(newest // 86400) - max(1, window_days) + 1) * 86400.0
+
+
+class _Index(Generic[M]):
+    """Keys sorted by time; evicting the oldest bumps ``head`` instead of shifting the list."""
+
+    def __init__(self) -> None:
+        self.keys: List[_Key] = []
+        self.head = 0
+
+    def __len__(self) -> int:
+        return len(self.keys) - self.head
+
+    def add(self, key: _Key) -> None:
+        insort(self.keys, key, lo=self.head)
+
+    def pop_oldest(self) -> _Key:
+        key = self.keys[self.head]
+        self.head += 1
+        if self.head >= _COMPACT_MIN and self.head * 2 >= len(self.keys):
+            del self.keys[: self.head]
+            self.head = 0
+        return key
+
+    def between(self, start: Optional[float], end: Optional[float]) -> List[_Key]:
+        lo = self.head if start is None else bisect_left(self.keys, (start,), lo=self.head)
+        hi = len(self.keys) if end is None else bisect_right(self.keys, (end, "\uffff"), lo=lo)
+        return self.keys[lo:hi]
+
+
+class RollupSnapshot(NamedTuple):
+    readiness: Optional[float]
+    readiness_samples: int
+    sleep_hours: Optional[float]
+    sleep_samples: int
+    steps: int
+    window_end: Optional[str]
+
+
+class WellnessRollup:
+    """Running aggregates over every metric folded in; each :meth:`add` is O(1).
+
+    Readiness is an exponentially weighted average taken in timestamp order;
+    a reading older than the last one folded is left out of it. Sleep and
+    steps go into per-day buckets covering the ``window_days`` days up to the
+    newest reading, so the windowed figures sum at most that many buckets.
+    """
+
+    def __init__(self, alpha: float = 0.3, window_days: int = ROLLUP_WINDOW_DAYS) -> None:
+        self.alpha = alpha
+        self.window_days = max(1, window_days)
+        self.clear()
+
+    def clear(self) -> None:
+        self.readiness: Optional[float] = None
+        self.readiness_samples = 0
+        self._readiness_at = float("-inf")
+        self._newest_day: Optional[int] = None
+        # day number -> [sleep hours, sleep readings, steps]
+        self._days: Dict[int, List[float]] = {}
+
+    def add(self, stamp: float, metric: object) -> None:
+        readiness = getattr(metric, "readiness", None)
+        if readiness is not None and stamp >= self._readiness_at:
+            self._readiness_at = stamp
+            self.readiness_samples += 1
+            if self.readiness is None:
+                self.readiness = float(readiness)
+            else:
+                self.readiness += self.alpha * (readiness - self.readiness)
+
+        steps = getattr(metric, "steps", None) or 0
+        sleep = getattr(metric, "sleepHours", None)
+        day = int(stamp // 86400)
+        if self._newest_day is None or day > self._newest_day:
+            self._newest_day = day
+            for stale in [known for known in self._days if known <= day - self.window_days]:
+                del self._days[stale]
+        if day <= self._newest_day - self.window_days or (not steps and sleep is None):
+            return
+        bucket = self._days.setdefault(day, [0.0, 0, 0])
+        bucket[2] += steps
+        if sleep is not None:
+            bucket[0] += sleep
+            bucket[1] += 1
+
+    def snapshot(self) -> RollupSnapshot:
+        sleep = sum(bucket[0] for bucket in self._days.values())
+        nights = int(sum(bucket[1] for bucket in self._days.values()))
+        window_end = None
+        if self._newest_day is not None:
+            window_end = datetime.fromtimestamp(self._newest_day * 86400, timezone.utc).date().isoformat()
+        return RollupSnapshot(
+            readiness=round(self.readiness, 1) if self.readiness is not None else None,
+            readiness_samples=self.readiness_samples,
+            sleep_hours=round(sleep / nights, 2) if nights else None,
+            sleep_samples=nights,
+            steps=int(sum(bucket[2] for bucket in self._days.values())),
+            window_end=window_end,
+        )
+
+
+class WellnessStore(Generic[M]):
+    """Wellness metrics ordered by their own timestamp rather than by arrival.
+
+    Lookups by time range, with or without a source, bisect a sorted index.
+    Past ``max_entries`` (or ``max_age`` seconds behind ``clock``) the oldest
+    metrics by timestamp are dropped, so a backfilled import can never push
+    out fresher data. A set of (source, timestamp) keys makes re-adding a
+    known metric a constant-time no-op; keys outlive eviction, and
+    :meth:`remember` seeds those of metrics only held in storage. A
+    :class:`WellnessRollup` sees every accepted metric, including ones later
+    evicted.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_age: Optional[float] = None,
+        clock: Callable[[], float] = time.time,
+        readiness_alpha: float = 0.3,
+    ) -> None:
+        self.max_entries = max(0, max_entries)
+        self.max_age = max_age
+        self._clock = clock
+        self._rollup = WellnessRollup(readiness_alpha)
+        self._index: _Index[M] = _Index()
+        self._by_source: Dict[str, _Index[M]] = {}
+        self._seen: Set[Tuple[str, float]] = set()
+        self._added = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._index)
+
+    def __iter__(self) -> Iterator[M]:
+        """Metrics oldest first."""
+
+        return iter(self.between())
+
+    def __contains__(self, metric: object) -> bool:
+        source = getattr(metric, "source", None) or ""
+        with self._lock:
+            return (source, parse_timestamp(getattr(metric, "timestamp"))) in self._seen
+
+    def remember(self, keys: Iterable[Tuple[str, float]]) -> None:
+        """Mark (source, epoch timestamp) pairs as already stored without holding their metrics."""
+
+        with self._lock:
+            self._seen.update(keys)
+
+    def add(self, metric: M) -> bool:
+        """Store ``metric``; False if one with the same source and timestamp was seen before."""
+
+        return bool(self.extend([metric]))
+
+    def extend(self, metrics: Iterable[M]) -> List[M]:
+        """Store ``metrics`` and return the ones that were not duplicates."""
+
+        accepted: List[_Key] = []
+        with self._lock:
+            for metric in metrics:
+                source = metric.source or ""
+                stamp = parse_timestamp(metric.timestamp)
+                if (source, stamp) in self._seen:
+                    continue
+                self._seen.add((source, stamp))
+                key = (stamp, source, self._added, metric)
+                self._added += 1
+                self._index.add(key)
+                self._by_source.setdefault(source, _Index()).add(key)
+                accepted.append(key)
+            # a batch may arrive in any order; fold it oldest first so it counts toward the average
+            for key in sorted(accepted):
+                self._rollup.add(key[0], key[3])
+            self._evict()
+        return [key[3] for key in accepted]
+
+    def _evict(self) -> None:
+        cutoff = self._clock() - self.max_age if self.max_age else None
+        while len(self._index) > self.max_entries or (
+            cutoff is not None and len(self._index) and self._index.keys[self._index.head][0] < cutoff
+        ):
+            key = self._index.pop_oldest()
+            partition = self._by_source[key[1]]
+            partition.pop_oldest()
+            if not partition:
+                del self._by_source[key[1]]
+
+    def evict_expired(self) -> None:
+        with self._lock:
+            self._evict()
+
+    def latest(self, source: Optional[str] = None) -> Optional[M]:
+        """The metric with the newest timestamp, optionally from one source."""
+
+        with self._lock:
+            index = self._index if source is None else self._by_source.get(source)
+            if not index:
+                return None
+            return index.keys[-1][3]
+
+    def between(
+        self, start: Optional[float] = None, end: Optional[float] = None, source: Optional[str] = None
+    ) -> List[M]:
+        """Metrics with ``start <= timestamp <= end`` (epoch seconds), oldest first."""
+
+        with self._lock:
+            index = self._index if source is None else self._by_source.get(source)
+            if index is None:
+                return []
+            return [key[3] for key in index.between(start, end)]
+
+    def summary(self) -> RollupSnapshot:
+        with self._lock:
+            return self._rollup.snapshot()
+
+    def recent(self, limit: int) -> List[M]:
+        """The ``limit`` newest metrics, oldest first."""
+
+        with self._lock:
+            if limit <= 0:
+                return []
+            start = max(self._index.head, len(self._index.keys) - limit)
+            return [key[3] for key in self._index.keys[start:]]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._index = _Index()
+            self._by_source = {}
+            self._seen = set()
+            self._rollup.clear()
+
+
+class WellnessPartitions(Generic[M]):
+    """One bounded :class:`WellnessStore` per profile, created on first use.
+
+    ``load(profile)`` supplies a partition's stored metrics the first time it
+    is touched, and ``known(profile)`` the (source, epoch timestamp) keys of
+    everything stored for it, so duplicates are caught beyond the retained
+    window. Past ``max_partitions`` the least recently used partition is
+    dropped from memory; its metrics stay in storage and load again on the
+    next use. Each partition has its own lock, so writers for different
+    profiles never wait on each other.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_age: Optional[float] = None,
+        max_partitions: int = 10000,
+        load: Optional[Callable[[str], Iterable[M]]] = None,
+        clock: Callable[[], float] = time.time,
+        readiness_alpha: float = 0.3,
+        known: Optional[Callable[[str], Iterable[Tuple[str, float]]]] = None,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.readiness_alpha = readiness_alpha
+        self.max_partitions = max(1, max_partitions)
+        self._load = load
+        self._known = known
+        self._clock = clock
+        self._partitions: "OrderedDict[str, WellnessStore[M]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._partitions)
+
+    def __contains__(self, profile: object) -> bool:
+        with self._lock:
+            return profile in self._partitions
+
+    def get(self, profile: str) -> WellnessStore[M]:
+        with self._lock:
+            partition = self._partitions.get(profile)
+            if partition is not None:
+                self._partitions.move_to_end(profile)
+                return partition
+
+        # storage is read outside the lock so other profiles are not held up
+        partition = WellnessStore(self.max_entries, self.max_age, self._clock, self.readiness_alpha)
+        if self._load is not None:
+            partition.extend(self._load(profile))
+        if self._known is not None:
+            partition.remember(self._known(profile))
+        with self._lock:
+            partition = self._partitions.setdefault(profile, partition)
+            self._partitions.move_to_end(profile)
+            while len(self._partitions) > self.max_partitions:
+                self._partitions.popitem(last=False)
+            return partition
+
+    def clear(self) -> None:
+        with self._lock:
+            self._partitions.clear()
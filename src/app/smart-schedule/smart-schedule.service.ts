@@ -42,6 +42,15 @@ export interface WellnessMetricPayload {
   comment?: string | null;
 }
 
+export interface WellnessImportResult {
+  status: string;
+  count: number;
+  accepted: number;
+  duplicates: number;
+  rejected: number;
+  errors: { index: number; detail: string }[];
+}
+
 export interface CoachAction {
   headline: string;
   description: string;
@@ -77,8 +86,8 @@ export class SmartScheduleService {
     return this.http.get<WellnessMetricPayload[]>(`${WELLNESS_ENDPOINT}?limit=${limit}`);
   }
 
-  importWellnessMetrics(source: string, entries: WellnessMetricPayload[]): Observable<{ status: string; count: string }> {
-    return this.http.post<{ status: string; count: string }>(WELLNESS_IMPORT_ENDPOINT, {
+  importWellnessMetrics(source: string, entries: WellnessMetricPayload[]): Observable<WellnessImportResult> {
+    return this.http.post<WellnessImportResult>(WELLNESS_IMPORT_ENDPOINT, {
       source,
       entries,
     });
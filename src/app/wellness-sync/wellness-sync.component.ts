@@ -106,8 +106,10 @@ export class WellnessSyncComponent {
       .importWellnessMetrics(option.source, option.entries)
       .pipe(finalize(() => (this.submitting = false)))
       .subscribe({
-        next: () => {
-          this.feedback = `${option.label} synced`;
+        next: (result) => {
+          this.feedback = result.duplicates
+            ? `${option.label} synced (${result.accepted} new, ${result.duplicates} already stored)`
+            : `${option.label} synced`;
           this.refreshHistory();
         },
         error: () => (this.feedback = 'Could not import sample data.'),
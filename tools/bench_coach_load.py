@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""Measure coach recommendation throughput against the coach worker count.
+
+Usage:
+  python tools/bench_coach_load.py [--workers 0 1 2 4] [--clients 16] [--seconds 10]
+
+For each worker count a uvicorn server is started with
+``DAWAR_POWER_COACH_WORKERS`` set, then ``--clients`` threads post distinct
+profiles to ``/fit/coach/recommendation`` for ``--seconds``. Every request
+uses a new profile so the plan cache never short-circuits the work, and a
+large meal library (``--meals``) keeps each request CPU-bound. Worker count
+0 is the threadpool baseline.
+"""
+
+import argparse
+import http.client
+import itertools
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def write_library(path: Path, size: int) -> None:
+    sys.path.insert(0, str(ROOT))
+    os.environ.setdefault("DAWAR_POWER_STORAGE_PATH", str(path.with_name("import_storage.json")))
+    from backend import main
+
+    rng = random.Random(size)
+    base = main.MEAL_LIBRARY
+    with path.open("w", encoding="utf-8") as handle:
+        for index in range(size):
+            meal = dict(base[index % len(base)])
+            if index >= len(base):
+                meal["name"] = f"{meal['name']} #{index}"
+                meal["calories"] = max(120, int(meal["calories"]) + rng.randint(-150, 150))
+            handle.write(json.dumps(meal) + "\n")
+
+
+def wait_until_ready(port: int, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"server on port {port} did not start")
+
+
+def load(port: int, clients: int, seconds: float) -> float:
+    counter = itertools.count()
+    completed = []
+    stop_at = time.monotonic() + seconds
+
+    def client() -> None:
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        done = 0
+        while time.monotonic() < stop_at:
+            body = json.dumps(
+                {
+                    "schedule": {
+                        "goal": "maintain",
+                        "preferredWindows": ["midday", "evening"],
+                        "equipmentAccess": ["dumbbells"],
+                        "weightGoalLong": f"profile {next(counter)}",
+                    },
+                    "mealPlan": {"days": 5, "solver": "macro", "restrictions": ["nuts"]},
+                    "focusAreas": ["Recovery"],
+                }
+            )
+            connection.request("POST", "/fit/coach/recommendation", body, {"Content-Type": "application/json"})
+            response = connection.getresponse()
+            response.read()
+            if response.status != 200:
+                raise RuntimeError(f"unexpected status {response.status}")
+            done += 1
+        connection.close()
+        completed.append(done)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sum(completed) / (time.monotonic() - start)
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark coach recommendation throughput by worker count")
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 1, 2, 4])
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--meals", type=int, default=5000)
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} CPUs, {args.clients} clients, {args.meals} meals")
+    print(f"{'workers':>7}  {'req/s':>8}")
+    with tempfile.TemporaryDirectory() as workdir:
+        library = Path(workdir) / "meals.jsonl"
+        write_library(library, args.meals)
+        for workers in args.workers:
+            port = free_port()
+            env = dict(
+                os.environ,
+                DAWAR_POWER_COACH_WORKERS=str(workers),
+                DAWAR_POWER_MEAL_LIBRARY=str(library),
+                DAWAR_POWER_STORAGE_PATH=str(Path(workdir) / f"storage-{workers}.json"),
+            )
+            server = subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(port), "--log-level", "warning"],
+                cwd=ROOT,
+                env=env,
+            )
+            try:
+                wait_until_ready(port)
+                rate = load(port, args.clients, args.seconds)
+            finally:
+                server.terminate()
+                server.wait()
+            print(f"{workers:>7}  {rate:>8.1f}")
+
+
+if __name__ == "__main__":
+    main_cli()
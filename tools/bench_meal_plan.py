@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Compare meal plan latency across meal library sizes.
+
+Usage:
+  python tools/bench_meal_plan.py [--sizes 12 1000 50000] [--repeat 20]
+
+Each library is written to a JSON Lines file, loaded through
+``DAWAR_POWER_MEAL_LIBRARY``'s loader and indexed. Plans are built with
+``_build_meal_plan`` directly so the response cache does not hide the work.
+The ``linear scan`` column re-runs the per-slot filter-and-sort selection
+the builder used before the meal index, for reference.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("DAWAR_POWER_STORAGE_PATH", str(Path(tempfile.gettempdir()) / "bench_storage.json"))
+
+from backend import main  # noqa: E402
+from backend.meal_library import load_meal_library  # noqa: E402
+
+BASE_LIBRARY = [dict(meal) for meal in main.MEAL_LIBRARY]
+
+
+def synthetic_library(size: int) -> list:
+    rng = random.Random(size)
+    meals = []
+    for index in range(size):
+        meal = dict(BASE_LIBRARY[index % len(BASE_LIBRARY)])
+        if index >= len(BASE_LIBRARY):
+            meal["name"] = f"{meal['name']} #{index}"
+            meal["calories"] = max(120, int(meal["calories"]) + rng.randint(-150, 150))
+        meals.append(meal)
+    return meals
+
+
+def linear_scan_plan(request) -> None:
+    target_calories = main._normalise_target_calories(request)
+    restrictions = [item.strip().lower() for item in request.restrictions + request.allergies if item.strip()]
+    for index in range(request.days):
+        for meal_type, ratio in main.MEAL_SPLITS.items():
+            target = max(180 if meal_type == "Snack" else 260, int(target_calories * ratio))
+            candidates = [meal for meal in main.MEAL_LIBRARY if meal["mealType"] == meal_type]
+            if request.diet != main.DietPreference.standard:
+                candidates = [meal for meal in candidates if request.diet.value in meal["diets"]] or candidates
+            ranked = sorted(candidates, key=lambda meal: abs(meal["calories"] - target))
+            allowed = [
+                meal
+                for meal in ranked
+                if not any(
+                    keyword in " ".join([meal["name"], meal["description"], " ".join(meal["tags"])]).lower()
+                    for keyword in restrictions
+                )
+            ]
+            pool = allowed or ranked
+            pool[index % len(pool)]
+
+
+def timed(function, request, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function(request)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark meal plan generation by library size")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[12, 1000, 50000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    requests = {
+        "default": main.MealPlanRequest(),
+        "vegan 5d": main.MealPlanRequest(diet="vegan", days=5, calories=2600),
+        "restricted": main.MealPlanRequest(days=5, restrictions=["salmon", "nuts"], allergies=["dairy"]),
+    }
+
+    print(f"{'meals':>7}  {'load+index':>10}  {'request':<11} {'indexed':>10} {'linear scan':>12}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in args.sizes:
+            path = Path(workdir) / f"meals-{size}.jsonl"
+            path.write_text("".join(json.dumps(meal) + "\n" for meal in synthetic_library(size)), encoding="utf-8")
+            start = time.perf_counter()
+            main.replace_meal_library(load_meal_library(path))
+            load_ms = (time.perf_counter() - start) * 1000
+            for label, request in requests.items():
+                indexed = timed(main._build_meal_plan, request, args.repeat)
+                linear = timed(linear_scan_plan, request, max(1, args.repeat // 10))
+                print(f"{size:>7}  {load_ms:>8.1f}ms  {label:<11} {indexed:>8.3f}ms {linear:>10.3f}ms")
+                load_ms = 0.0
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Compare whole-body and streaming parses of a large provider payload, and the full sync-all import.
+
+Usage:
+  python tools/bench_provider_stream.py [--megabytes 300]
+
+Writes a synthetic minute-level ``{"entries": [...]}`` payload to a temp
+file and serves it through ``DAWAR_POWER_FITBIT_URL`` as a file:// URL.
+Each mode runs in its own process and validates every entry into a
+``WellnessMetric``. The ``whole body`` mode reads the body, decodes it and
+calls ``json.loads``, which is what ``fetch_provider_payload`` did before.
+The ``streaming`` mode uses ``iter_provider_payload``. The ``sync-all`` mode
+posts to ``/fit/wellness-sync/sync-all``, which streams, validates and imports
+the entries into a fresh store in batches of ``DAWAR_POWER_SYNC_IMPORT_BATCH``.
+Every mode reports wall time and peak RSS.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+RUN_SNIPPET = """
+import json, resource, time
+from urllib.request import urlopen
+from backend.main import WellnessMetric
+from backend.provider_clients import iter_provider_payload, provider_url
+
+start = time.perf_counter()
+if {mode!r} == "sync-all":
+    from fastapi.testclient import TestClient
+    from backend.main import app
+    with TestClient(app) as client:
+        body = client.post("/fit/wellness-sync/sync-all").json()
+    count = next(result["fetched"] for result in body["providers"] if result["provider"] == "fitbit")
+elif {mode!r} == "streaming":
+    entries = iter_provider_payload("fitbit", [])
+else:
+    with urlopen(provider_url("fitbit")) as response:
+        payload = json.loads(response.read().decode("utf-8"))
+    entries = [entry for entry in payload["entries"] if isinstance(entry, dict)]
+if {mode!r} != "sync-all":
+    count = sum(1 for entry in entries if WellnessMetric(source="fitbit", **entry))
+elapsed = time.perf_counter() - start
+print(count, f"{{elapsed:.2f}}", resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // 1024)
+"""
+
+
+def write_payload(path: Path, megabytes: int) -> int:
+    start = datetime(2024, 1, 1)
+    target = megabytes * 1024 * 1024
+    written = count = 0
+    with path.open("w", encoding="utf-8") as handle:
+        handle.write('{"source": "fitbit", "entries": [')
+        while written < target:
+            entry = {
+                "timestamp": (start + timedelta(minutes=count)).isoformat() + "Z",
+                "steps": count % 180,
+                "sleepHours": None,
+                "readiness": 50 + count % 50,
+                "energyLevel": "steady",
+            }
+            line = ("," if count else "") + json.dumps(entry)
+            handle.write(line)
+            written += len(line)
+            count += 1
+        handle.write("]}")
+    return count
+
+
+def run(payload: Path, mode: str) -> str:
+    env = dict(
+        os.environ,
+        DAWAR_POWER_FITBIT_URL=payload.as_uri(),
+        DAWAR_POWER_STORAGE_PATH=str(payload.with_name("storage.json")),
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", RUN_SNIPPET.format(mode=mode)],
+        cwd=ROOT,
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    count, seconds, megabytes = result.stdout.split()
+    return f"{int(count):>9} entries  {float(seconds):7.2f}s  {int(megabytes):6d} MB peak RSS"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark streaming provider payload parsing")
+    parser.add_argument("--megabytes", type=int, default=300)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        payload = Path(workdir) / "fitbit.json"
+        entries = write_payload(payload, args.megabytes)
+        print(f"{payload.stat().st_size / 1024 / 1024:.0f} MB payload, {entries} entries")
+        for mode in ("whole body", "streaming", "sync-all"):
+            print(f"  {mode + ':':<12} {run(payload, mode)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Compare building a batch of schedule plans inline and in a warm process pool.
+
+Usage:
+  python tools/bench_schedule_batch.py [--plans 2000 20000] [--workers 2]
+
+Each batch is built once inline, as ``POST /fit/schedule/batch`` does, and
+once through an already started ``spawn`` pool seeded like the coach pool, so
+worker start-up is left out. The pool side still pays for pickling every
+request and plan across the process boundary.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("DAWAR_POWER_STORAGE_PATH", str(Path(tempfile.gettempdir()) / "bench_storage.json"))
+
+from backend import main  # noqa: E402
+
+GOALS = ["fat_loss", "maintain", "muscle_gain"]
+WINDOWS = [["evening", "early_morning"], ["midday"], ["pre_work", "weekend"]]
+
+
+def requests(count: int) -> list:
+    return [
+        main.ScheduleRequest(goal=GOALS[index % 3], preferredWindows=WINDOWS[index % 3], commuteMinutes=index % 90)
+        for index in range(count)
+    ]
+
+
+def main_cli() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark batch schedule planning")
+    parser.add_argument("--plans", type=int, nargs="+", default=[2000, 20000])
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+
+    with ProcessPoolExecutor(
+        args.workers,
+        mp_context=main._pool_context,
+        initializer=main._init_planning_worker,
+        initargs=(list(main.MEAL_LIBRARY),),
+    ) as pool:
+        # start every worker before timing anything
+        list(pool.map(main._build_schedule_plan, requests(args.workers * 4), [None] * args.workers * 4))
+        print(f"{os.cpu_count()} CPUs, {args.workers} workers")
+        for count in args.plans:
+            batch = requests(count)
+            summaries = [None] * count
+            started = time.perf_counter()
+            [main._build_schedule_plan(request, summary) for request, summary in zip(batch, summaries)]
+            inline = time.perf_counter() - started
+            started = time.perf_counter()
+            list(pool.map(main._build_schedule_plan, batch, summaries, chunksize=64))
+            pooled = time.perf_counter() - started
+            print(f"  {count:>7} plans  inline {inline:6.2f}s  warm pool {pooled:6.2f}s")
+
+
+if __name__ == "__main__":
+    main_cli()
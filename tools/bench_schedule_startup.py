@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Measure backend start-up against a synthetic schedule store.
+
+Usage:
+  python tools/bench_schedule_startup.py [--profiles 100000]
+
+Builds a storage.json with the requested number of profiles in a temp
+directory, then reports the time and peak memory of importing
+``backend.main`` against it next to eagerly hydrating every schedule.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+SAMPLE_SCHEDULE = {
+    "sessions": [
+        {
+            "day": day,
+            "window": "midday",
+            "focus": "Strength balance",
+            "durationMinutes": 35,
+            "equipment": "dumbbells",
+            "intensity": "moderate",
+        }
+        for day in ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+    ],
+    "notes": {
+        "summary": "Plan built around dumbbells sessions in your midday window.",
+        "recoveryTip": "Moderate stress. Mix in a short walk after lunch to reset energy.",
+        "mealAlignment": "Meals lean toward standard options with matching protein targets.",
+    },
+    "insights": [],
+}
+
+IMPORT_SNIPPET = """
+import resource, time
+start = time.perf_counter()
+import backend.main as main
+elapsed = time.perf_counter() - start
+{extra}
+print(f"{{elapsed:.3f}} {{resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // 1024}}")
+"""
+
+EAGER_EXTRA = """
+start = time.perf_counter()
+from backend.storage import load_storage
+hydrated = {key: main.ScheduleResponse(**payload) for key, payload in load_storage()[0].items()}
+elapsed += time.perf_counter() - start
+"""
+
+
+def write_store(path: Path, profiles: int) -> None:
+    schedules = {f"{index:040x}": SAMPLE_SCHEDULE for index in range(profiles)}
+    path.write_text(json.dumps({"schedules": schedules, "wellness": []}), encoding="utf-8")
+
+
+def run(storage_path: Path, extra: str) -> str:
+    env = dict(os.environ, DAWAR_POWER_STORAGE_PATH=str(storage_path))
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET.format(extra=extra)],
+        cwd=ROOT,
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    seconds, megabytes = result.stdout.split()
+    return f"{float(seconds):8.3f}s  {int(megabytes):6d} MB peak RSS"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark backend start-up with many stored profiles")
+    parser.add_argument("--profiles", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        storage_path = Path(workdir) / "storage.json"
+        write_store(storage_path, args.profiles)
+        print(f"{args.profiles} profiles")
+        print(f"  lazy import:       {run(storage_path, '')}")
+        print(f"  eager hydration:   {run(storage_path, EAGER_EXTRA)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Compare a one-week range query over a year of wellness data: JSON versus the columnar archive.
+
+Usage:
+  python tools/bench_wellness_archive.py [--interval-minutes 5]
+
+Writes a year of synthetic readings, once as a JSON list and once into a
+``WellnessArchive``. The JSON side loads and filters the whole file per
+query. The archive side memory-maps the columns and bisects the
+timestamps. Both then read the matching weekly rollups.
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backend.wellness_archive import WellnessArchive  # noqa: E402
+from backend.wellness_store import parse_timestamp  # noqa: E402
+
+
+def synthetic_year(interval: int):
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    for index in range(365 * 24 * 60 // interval):
+        stamp = start + timedelta(minutes=index * interval)
+        yield {
+            "timestamp": stamp.isoformat().replace("+00:00", "Z"),
+            "source": "fitbit",
+            "steps": index % 180,
+            "sleepHours": 7.5 if stamp.hour == 7 and stamp.minute == 0 else None,
+            "readiness": 50 + index % 50,
+        }
+
+
+def timed(label: str, action, repeat: int = 5) -> None:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = action()
+    elapsed = (time.perf_counter() - started) / repeat * 1000
+    print(f"  {label:<28} {elapsed:9.1f} ms  ({len(result)} rows)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark archive range queries")
+    parser.add_argument("--interval-minutes", type=int, default=5)
+    args = parser.parse_args()
+
+    entries = list(synthetic_year(args.interval_minutes))
+    lo, hi = parse_timestamp("2024-06-03T00:00:00Z"), parse_timestamp("2024-06-09T23:59:59Z")
+    with tempfile.TemporaryDirectory() as workdir:
+        json_path = Path(workdir) / "wellness.json"
+        json_path.write_text(json.dumps(entries), encoding="utf-8")
+        archive = WellnessArchive(Path(workdir) / "archive")
+        started = time.perf_counter()
+        archive.append(entries)
+        print(f"{len(entries)} readings, {json_path.stat().st_size / 1e6:.1f} MB JSON, archived in {time.perf_counter() - started:.1f}s")
+
+        def from_json():
+            rows = json.loads(json_path.read_text(encoding="utf-8"))
+            return [row for row in rows if lo <= parse_timestamp(row["timestamp"]) <= hi]
+
+        timed("JSON load + filter", from_json, repeat=1)
+        timed("archive mmap range", lambda: archive.metrics(start=lo, end=hi))
+        timed("archive weekly rollups", lambda: archive.rollups(resolution="week"))
+
+
+if __name__ == "__main__":
+    main()
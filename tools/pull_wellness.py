@@ -4,6 +4,7 @@
 Usage:
   python tools/pull_wellness.py provider_name [--base-url http://localhost:8080]
   python tools/pull_wellness.py import provider_name
+  python tools/pull_wellness.py all sync
 """
 
 import argparse
@@ -50,14 +51,36 @@ def import_metrics(provider: str, base_url: str) -> None:
     print(json.dumps(data, indent=2))
 
 
+def sync_all(base_url: str) -> None:
+    request = Request(f"{base_url}/fit/wellness-sync/sync-all", data=b"", method="POST")
+    try:
+        with urlopen(request) as resp:  # nosec - local dev usage
+            data = json.loads(resp.read().decode("utf-8"))
+    except HTTPError as exc:
+        print(f"Sync failed: {exc.code} {exc.reason}", file=sys.stderr)
+        sys.exit(1)
+    except URLError as exc:
+        print(f"Could not reach backend: {exc.reason}", file=sys.stderr)
+        sys.exit(2)
+    print(json.dumps(data, indent=2))
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Interact with Dawar Power wellness sync API")
-    parser.add_argument("provider", help="Provider to fetch, e.g. apple_health, fitbit, whoop")
-    parser.add_argument("action", nargs="?", default="fetch", choices=["fetch", "import"], help="Fetch sample or import it")
+    parser.add_argument("provider", help="Provider to fetch, e.g. apple_health, fitbit, whoop (or all with sync)")
+    parser.add_argument(
+        "action",
+        nargs="?",
+        default="fetch",
+        choices=["fetch", "import", "sync"],
+        help="Fetch sample, import it, or sync every provider in one request",
+    )
     parser.add_argument("--base-url", dest="base_url", default=DEFAULT_BASE_URL)
     args = parser.parse_args()
 
-    if args.action == "fetch":
+    if args.action == "sync":
+        sync_all(args.base_url)
+    elif args.action == "fetch":
         fetch_metrics(args.provider, args.base_url)
     else:
         import_metrics(args.provider, args.base_url)